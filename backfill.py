@@ -0,0 +1,170 @@
+"""
+과거 공지사항 백필(backfill).
+
+    python backfill.py --pages 300 --workers 8
+    python backfill.py --board 1 --pages 50
+
+게시판별로 목록 페이지 1..pages를 최대 workers개씩 동시에 처리한다. 끝난 글은 articleNo로 로컬 SQLite에 기록해
+중단 후 다시 실행하면 남은 글만 이어서 처리한다. (새 글이 올라오면 목록 페이지의 offset이 밀리므로 페이지 번호로는 기록하지 않는다)
+LLM 호출은 GPTClient의 비동기 API로 동시성/RPM/TPM 제한 안에서 실행한다. 백필된 공지는 Discord로 전송하지 않는다.
+"""
+import argparse
+import asyncio
+import os
+import sqlite3
+import threading
+
+import crawler
+from board import Board
+from metrics import metrics
+from seen_index import article_no_from_url
+
+BACKFILL_PATH = os.getenv("BACKFILL_PATH", ".cache/backfill.sqlite3")
+
+
+class BackfillProgress:
+    """(category, articleNo) 단위로 백필이 끝난 글을 기록하는 진행 상황 저장소"""
+
+    def __init__(self, path: str = BACKFILL_PATH):
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS backfill_articles (
+                category INTEGER NOT NULL,
+                article_no INTEGER NOT NULL,
+                notice_id INTEGER,
+                PRIMARY KEY (category, article_no)
+            )
+        """)
+        self.conn.commit()
+
+    def done_articles(self, category: int) -> set:
+        with self._lock:
+            rows = self.conn.execute("SELECT article_no FROM backfill_articles WHERE category = ?", (category,))
+            return {row[0] for row in rows}
+
+    def mark_done(self, category: int, article_no: int | None, notice_id: int | None = None):
+        if article_no is None:
+            return
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO backfill_articles (category, article_no, notice_id) VALUES (?, ?, ?)",
+                (category, article_no, notice_id),
+            )
+            self.conn.commit()
+
+
+async def backfill_item(url: str, category: int, item: dict, limiter: crawler.HostLimiter,
+                        progress: BackfillProgress) -> dict:
+    """글 하나를 상세 페이지 수집 → 분석(동시성/RPM/TPM 제한) → 저장하고 진행 상황에 기록"""
+    detail_html = await crawler.fetch_text_async(url + item['url'], limiter)
+    with metrics.span("parse_detail"):
+        context = Board(boardHtml=detail_html, baseUrl=url)
+
+    ai_response, ai_schedules = await crawler.gpt.aanalyze_notice(title=context.title, content=context.detail_text)
+    metrics.incr("summarized")
+    entry = crawler.make_save_entry(item, url, category, context, ai_response, ai_schedules)
+
+    with metrics.span("db_save", kind="insert"):
+        notice = await asyncio.to_thread(crawler.db_manager.save_notice, **entry)
+    metrics.incr("saved")
+    crawler.mark_seen(notice, item, category)
+    progress.mark_done(category, article_no_from_url(item['url']), notice.get('id'))
+    return notice
+
+
+async def backfill_page(url: str, category: int, page: int, limiter: crawler.HostLimiter,
+                        progress: BackfillProgress) -> int:
+    """목록 페이지 하나의 새 공지들을 저장하고 저장한 개수를 반환. 빈 페이지면 -1"""
+    items = await asyncio.to_thread(crawler.fetch_list_items, url, page)
+    if not items:
+        return -1
+
+    done = progress.done_articles(category)
+    new_items = await asyncio.to_thread(lambda: [
+        item for item in crawler.iter_new_items(url, category, start_page=page, first_page_items=items, max_pages=1)
+        if article_no_from_url(item['url']) not in done
+    ])
+
+    results = await asyncio.gather(
+        *(backfill_item(url, category, item, limiter, progress) for item in new_items),
+        return_exceptions=True,
+    )
+    errors = [result for result in results if isinstance(result, BaseException)]
+    for item, result in zip(new_items, results):
+        if isinstance(result, BaseException):
+            print(f"🔴 '{item['title']}' 백필 실패: {result}", flush=True)
+    if errors:
+        # 저장된 글은 기록되어 있으므로 다시 실행하면 실패한 글만 처리한다.
+        raise RuntimeError(f"{len(new_items)}건 중 {len(errors)}건 실패")
+    return len(new_items)
+
+
+async def backfill_async(boards: list, pages: int, workers: int = 4, progress: BackfillProgress | None = None) -> dict:
+    """
+    boards: (category, url) 목록. 목록 페이지는 최대 workers개만 동시에 처리해 메모리를 제한한다.
+    게시판에서 빈 페이지를 만나면 그 뒤 페이지는 건너뛴다.
+    """
+    progress = progress or BackfillProgress()
+    await asyncio.to_thread(crawler.prepare_seen_index)
+
+    limiter = crawler.HostLimiter()
+    tasks = ((category, url, page) for category, url in boards for page in range(1, pages + 1))
+
+    exhausted: dict = {}  # category -> 빈 페이지 번호
+    stats = {"pages": 0, "saved": 0, "failed": 0}
+
+    async def worker():
+        # 제너레이터의 next()는 await 없이 실행되므로 worker들이 나누어 가져가도 안전하다.
+        for category, url, page in tasks:
+            if page > exhausted.get(category, pages + 1):
+                continue
+            try:
+                saved = await backfill_page(url, category, page, limiter, progress)
+            except Exception as e:
+                stats["failed"] += 1
+                print(f"🔴 [{category}] {page} 페이지 백필 실패: {e}", flush=True)
+                continue
+
+            if saved < 0:
+                exhausted[category] = min(page, exhausted.get(category, page))
+                saved = 0
+            stats["pages"] += 1
+            stats["saved"] += saved
+            print(f"📚 [{category}] {page} 페이지 완료 ({saved}건 저장)", flush=True)
+
+    await asyncio.gather(*(worker() for _ in range(max(1, workers))))
+
+    print(f"✅ 백필 완료: {stats['pages']}페이지, {stats['saved']}건 저장, {stats['failed']}페이지 실패", flush=True)
+    return stats
+
+
+def backfill(boards: list, pages: int, workers: int = 4, progress: BackfillProgress | None = None) -> dict:
+    return asyncio.run(backfill_async(boards, pages, workers=workers, progress=progress))
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--pages", type=int, default=100, help="게시판별 처리할 목록 페이지 수")
+    parser.add_argument("--workers", type=int, default=4, help="동시에 처리할 목록 페이지 수 (LLM 동시성은 LLM_CONCURRENCY)")
+    parser.add_argument("--board", type=int, action="append", help="처리할 게시판 category (여러 번 지정 가능)")
+
+
+def run(args: argparse.Namespace) -> dict:
+    boards = [
+        (category, url) for category, url in enumerate(crawler.CRAWLING_URL_LIST)
+        if args.board is None or category in args.board
+    ]
+    return backfill(boards, pages=args.pages, workers=args.workers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="과거 공지사항 백필")
+    add_arguments(parser)
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
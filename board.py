@@ -1,9 +1,209 @@
-from typing import cast
+import os
+import re
+from typing import NamedTuple, cast
 from bs4 import BeautifulSoup, Tag
 
+try:
+    import lxml.html
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+# 파서 백엔드: "bs4"(html.parser), "lxml", "auto"(lxml이 있으면 lxml)
+# 실제 저장된 페이지로 두 백엔드의 parity를 확인하기 전까지는 html.parser가 기본값이다.
+BOARD_PARSER = os.getenv("BOARD_PARSER", "bs4")
+
+# lxml은 인코딩 선언이 있는 str 입력을 거부하므로(ValueError) 파싱 전에 선언을 떼어 낸다.
+_XML_DECLARATION_RE = re.compile(r'^\s*<\?xml[^>]*\?>', re.IGNORECASE)
+
+# BeautifulSoup의 get_text()가 무시하는 태그 (내부 문자열은 텍스트로 취급하지 않음)
+_SKIP_TEXT_TAGS = {'script', 'style', 'template', 'rt', 'rp'}
+
+
+# 첨부파일 옆에 표시되는 크기 문자열 (예: "(25.5KB)", "1.2 MB")
+_FILE_SIZE_RE = re.compile(r'(\d+(?:[.,]\d+)?\s*(?:[KMGT]i?B|bytes?|B))\b', re.IGNORECASE)
+
+
+class Attachment(NamedTuple):
+    """게시글 첨부파일 (file-down-btn 링크 하나)"""
+    file_name: str
+    download_link: str
+    file_type: str
+    size: str | None = None
+
+
+def _make_attachment(classes: list, file_name: str, href: str, li_text: str, anchor_text: str, baseUrl: str) -> Attachment:
+    """a.file-down-btn의 클래스/텍스트와 li 텍스트로 Attachment를 만든다. 두 백엔드 공용"""
+    # 종류는 file-down-btn 외의 클래스(pdf, hwp, xlsx ...)에서, 없으면 파일 확장자에서 가져온다.
+    file_type = next((c for c in classes if c != 'file-down-btn'), '')
+    if not file_type and '.' in file_name:
+        file_type = file_name.rsplit('.', 1)[1]
+
+    size_match = _FILE_SIZE_RE.search(li_text.replace(anchor_text, '', 1))
+
+    return Attachment(
+        file_name=file_name,
+        download_link=baseUrl + href,
+        file_type=file_type.lower(),
+        size=size_match.group(1) if size_match else None,
+    )
+
+
+def resolve_backend(backend: str | None = None) -> str:
+    backend = backend or BOARD_PARSER
+    if backend == 'auto':
+        return 'lxml' if HAS_LXML else 'bs4'
+    if backend == 'lxml' and not HAS_LXML:
+        raise ValueError("lxml 백엔드를 사용하려면 lxml 패키지가 필요합니다.")
+    if backend not in ('lxml', 'bs4'):
+        raise ValueError(f"알 수 없는 파서 백엔드입니다: {backend}")
+    return backend
+
+
+def _lxml_fromstring(html: str):
+    return lxml.html.fromstring(_XML_DECLARATION_RE.sub('', html, count=1))
+
+
+def _classes(el) -> set:
+    return set((el.get('class') or '').split())
+
+
+def _iter_strings(el):
+    """lxml 요소의 문자열들을 BeautifulSoup의 get_text()와 같은 순서/규칙으로 순회"""
+    if not isinstance(el.tag, str) or el.tag in _SKIP_TEXT_TAGS:
+        return
+    if el.text:
+        yield el.text
+    for child in el:
+        yield from _iter_strings(child)
+        if child.tail:
+            yield child.tail
+
+
+def _get_text(el, separator: str = '', strip: bool = False) -> str:
+    strings = _iter_strings(el)
+    if strip:
+        return separator.join(text for text in (s.strip() for s in strings) if text)
+    return separator.join(strings)
+
+
+# CSS 선택자와 마찬가지로 조상 조건은 select를 호출한 요소 바깥의 조상까지 포함해서 확인한다.
+def _nth_tr_ancestors(el) -> set:
+    """el의 조상 tr들이 각각 형제 중 몇 번째 tr인지(nth-of-type) 집합으로 반환"""
+    return {
+        sum(1 for _ in ancestor.itersiblings('tr', preceding=True)) + 1
+        for ancestor in el.iterancestors('tr')
+    }
+
+
+def _has_ancestor(el, tag: str | None = None, class_name: str | None = None) -> bool:
+    for ancestor in el.iterancestors(tag) if tag else el.iterancestors():
+        if class_name is None or class_name in _classes(ancestor):
+            return True
+    return False
+
+
+def b_title_box_parser (item) :
+    notice_data = {}
+
+    link = item.select_one("a")
+    if link:
+        notice_data['title'] = link.get_text().strip()
+        notice_data['url'] = link.get('href', '')
+
+    # 새 글 여부 확인
+    new_mark = item.select_one(".b-new span")
+    notice_data['is_new'] = new_mark is not None
+
+    # 세부 정보 추출
+    m_con = item.select_one(".b-m-con")
+    if m_con:
+        # 공지 여부
+        notice_mark = m_con.select_one(".b-notice")
+        notice_data['is_notice'] = notice_mark is not None
+
+        # 작성자
+        writer = m_con.select_one(".b-writer")
+        notice_data['writer'] = writer.get_text().strip() if writer else ""
+
+        # 날짜
+        date = m_con.select_one(".b-date")
+        notice_data['date'] = date.get_text().strip() if date else ""
+
+        # 조회수
+        hit = m_con.select_one(".hit")
+        notice_data['views'] = hit.get_text().strip().replace('조회수 ', '') if hit else "0"
+
+    return notice_data
+
+
+def _b_title_box_parser_lxml(item) -> dict:
+    """b_title_box_parser의 lxml 버전. 행마다 하위 트리를 한 번씩만 순회한다."""
+    notice_data = {}
+
+    link = None
+    m_con = None
+    is_new = False
+    for el in item.iterdescendants():
+        if not isinstance(el.tag, str):
+            continue
+        if link is None and el.tag == 'a':
+            link = el
+        if not is_new and el.tag == 'span' and _has_ancestor(el, class_name='b-new'):
+            is_new = True
+        if m_con is None and 'b-m-con' in _classes(el):
+            m_con = el
+
+    if link is not None:
+        notice_data['title'] = _get_text(link).strip()
+        notice_data['url'] = link.get('href', '')
+
+    notice_data['is_new'] = is_new
+
+    if m_con is not None:
+        notice_mark = writer = date = hit = None
+        for el in m_con.iterdescendants():
+            if not isinstance(el.tag, str):
+                continue
+            classes = _classes(el)
+            if notice_mark is None and 'b-notice' in classes:
+                notice_mark = el
+            if writer is None and 'b-writer' in classes:
+                writer = el
+            if date is None and 'b-date' in classes:
+                date = el
+            if hit is None and 'hit' in classes:
+                hit = el
+
+        notice_data['is_notice'] = notice_mark is not None
+        notice_data['writer'] = _get_text(writer).strip() if writer is not None else ""
+        notice_data['date'] = _get_text(date).strip() if date is not None else ""
+        notice_data['views'] = _get_text(hit).strip().replace('조회수 ', '') if hit is not None else "0"
+
+    return notice_data
+
+
+def parse_list_page(html: str, backend: str | None = None) -> list:
+    """목록 페이지 html에서 b-title-box 행들을 파싱하여 리스트로 반환"""
+    if resolve_backend(backend) == 'lxml':
+        root = _lxml_fromstring(html)
+        return [
+            _b_title_box_parser_lxml(el) for el in root.iter('div')
+            if 'b-title-box' in _classes(el)
+        ]
+
+    soup = BeautifulSoup(html, "html.parser")
+    return list(map(b_title_box_parser, soup.select("div.b-title-box")))
+
 
 class Board:
-    def __init__ (self, boardHtml : str, baseUrl : str) :
+    def __init__ (self, boardHtml : str, baseUrl : str, backend : str | None = None) :
+        if resolve_backend(backend) == 'lxml':
+            self._parse_lxml(boardHtml, baseUrl)
+        else:
+            self._parse_bs4(boardHtml, baseUrl)
+
+    def _parse_bs4 (self, boardHtml : str, baseUrl : str) :
         soup = BeautifulSoup(boardHtml, 'html.parser')
 
         tbody = soup.select_one('tbody')
@@ -60,31 +260,114 @@ class Board:
                 else:
                     self.images.append(CNU_URL + url)
 
-        self.file_box = []
+        self.file_box: list[Attachment] = []
         file_box = soup.select_one('div.b-file-box')
 
         if file_box:
             for li in file_box.select('ul li'):
-                # 다운로드 링크와 파일명 추출
-                download_a = li.select_one('a.file-down-btn.pdf')
-                download_a2 = li.select_one('a.file-down-btn.hwp')
-                download_a3 = li.select_one('a.file-down-btn.zip')
-
-                if download_a:
-                    self.file_box.append({
-                        'file_name': download_a.get_text(strip=True),
-                        'download_link': baseUrl + cast(str, download_a.get('href'))
-                    })
-
-                if download_a2:
-                    self.file_box.append({
-                        'file_name': download_a2.get_text(strip=True),
-                        'download_link': baseUrl + cast(str, download_a2.get('href'))
-                    })
-
-                if download_a3:
-                    self.file_box.append({
-                        'file_name': download_a3.get_text(strip=True),
-                        'download_link': baseUrl + cast(str, download_a3.get('href'))
-                    })
+                li_text = li.get_text(' ', strip=True)
+
+                # 다운로드 링크와 파일명 추출 (확장자와 관계없이 모든 file-down-btn)
+                for download_a in li.find_all('a', class_='file-down-btn'):
+                    self.file_box.append(_make_attachment(
+                        classes=cast(list, download_a.get('class')),
+                        file_name=download_a.get_text(strip=True),
+                        href=cast(str, download_a.get('href')),
+                        li_text=li_text,
+                        anchor_text=download_a.get_text(' ', strip=True),
+                        baseUrl=baseUrl,
+                    ))
+
+    def _parse_lxml (self, boardHtml : str, baseUrl : str) :
+        """_parse_bs4와 같은 필드를 tbody 한 번 순회로 추출"""
+        root = _lxml_fromstring(boardHtml)
+
+        tbody = next(root.iter('tbody'), None)
+        assert tbody is not None
+
+        title_tag = writer_tag = views_tag = date_tag = email_tag = detail_div = None
+
+        for el in tbody.iterdescendants():
+            if not isinstance(el.tag, str):
+                continue
+
+            if el.tag == 'td':
+                classes = _classes(el)
+                if title_tag is None and 'b-title-box' in classes:
+                    title_tag = el
+
+                if writer_tag is None or views_tag is None or date_tag is None or email_tag is None:
+                    rows = _nth_tr_ancestors(el)
+                    no_right = 'b-no-right' in classes
+
+                    if writer_tag is None and no_right and 2 in rows:
+                        writer_tag = el
+                    if views_tag is None and 3 in rows:
+                        views_tag = el
+                    if date_tag is None and no_right and 3 in rows:
+                        date_tag = el
+                    if email_tag is None and no_right and 4 in rows:
+                        email_tag = el
+
+            elif el.tag == 'div' and detail_div is None and 'fr-view' in _classes(el):
+                detail_div = el
+
+        # 게시글 제목 (첫 번째 행)
+        assert title_tag is not None, "title Tag가 없습니다."
+        self.title = _get_text(title_tag, strip=True)
+
+        # 작성자 (두 번째 행)
+        assert writer_tag is not None, "writer Tag가 없습니다."
+        self.writer = _get_text(writer_tag, strip=True)
+
+        # 조회수 (세 번째 행, 첫 번째 td)
+        assert views_tag is not None, "views Tag가 없습니다."
+        self.views = _get_text(views_tag, strip=True)
+
+        # 등록일 (세 번째 행, 마지막 td)
+        assert date_tag is not None, "date Tag가 없습니다."
+        self.date = _get_text(date_tag, strip=True)
+
+        # 이메일 (네 번째 행)
+        assert email_tag is not None, "email Tag가 없습니다."
+        self.email = _get_text(email_tag, strip=True)
+
+        # 상세 내용 (div.fr-view 내부)
+        assert detail_div is not None
+
+        self.detail_text = _get_text(detail_div, separator='\n', strip=True)
+
+        self.images = []
+        CNU_URL = 'https://computer.cnu.ac.kr'
+
+        for img in detail_div.iterdescendants('img'):
+            url: str = cast(str, img.get('src'))
+
+            if url.startswith('http'):
+                self.images.append(url)
+            else:
+                self.images.append(CNU_URL + url)
+
+        self.file_box: list[Attachment] = []
+        file_box = next((el for el in root.iter('div') if 'b-file-box' in _classes(el)), None)
+
+        if file_box is not None:
+            for li in file_box.iterdescendants('li'):
+                if not _has_ancestor(li, tag='ul'):
+                    continue
+
+                li_text = _get_text(li, ' ', strip=True)
+
+                for download_a in li.iterdescendants('a'):
+                    classes = (download_a.get('class') or '').split()
+                    if 'file-down-btn' not in classes:
+                        continue
 
+                    self.file_box.append(_make_attachment(
+                        classes=classes,
+                        file_name=_get_text(download_a, strip=True),
+                        href=cast(str, download_a.get('href')),
+                        li_text=li_text,
+                        anchor_text=_get_text(download_a, ' ', strip=True),
+                        baseUrl=baseUrl,
+                    ))
@@ -0,0 +1,130 @@
+"""
+크롤러 실행 진입점.
+
+    python cli.py crawl                       # 모드는 --mode 또는 CRAWLER_MODE (sync | async | pipeline)
+    python cli.py backfill --pages 300 --workers 8
+    python cli.py notify --digest             # 크롤링 없이 전송되지 못한 공지만 전송
+    python cli.py re-extract --board 0 --limit 200
+    python cli.py daemon --health-port 8080   # 게시판별 적응형 주기로 계속 확인
+
+하위 명령에 필요한 모듈만 import하고, LLM/DB 클라이언트는 crawler 모듈에서 처음 사용할 때 만든다.
+import 시간과 명령 시작 전까지의 프로세스 CPU 시간은 출력하고 실행 요약(startup)에도 남긴다.
+모듈별 import 비용은 `python -X importtime cli.py crawl`로 확인한다.
+"""
+import time
+
+_STARTED = time.perf_counter()
+
+import argparse
+import asyncio
+import importlib
+import os
+
+CRAWL_MODES = ("sync", "async", "pipeline")
+
+
+def _import(name: str) -> tuple:
+    """모듈을 import하고 (모듈, 걸린 시간)을 반환"""
+    started = time.perf_counter()
+    module = importlib.import_module(name)
+    return module, time.perf_counter() - started
+
+
+def cmd_crawl(args: argparse.Namespace):
+    if args.mode == "pipeline":
+        pipeline, import_s = _import("pipeline")
+        report_startup(import_s)
+        asyncio.run(pipeline.main_pipeline())
+        return
+
+    crawler, import_s = _import("crawler")
+    report_startup(import_s)
+    if args.mode == "async":
+        asyncio.run(crawler.main_async())
+    else:
+        crawler.main()
+
+
+def cmd_backfill(args: argparse.Namespace):
+    report_startup(args.import_s)
+    args.module.run(args)
+
+
+def cmd_notify(args: argparse.Namespace):
+    crawler, import_s = _import("crawler")
+    report_startup(import_s)
+    crawler.main_notify(digest=args.digest or crawler.DISCORD_DIGEST)
+
+
+def cmd_reextract(args: argparse.Namespace):
+    report_startup(args.import_s)
+    args.module.run(args)
+
+
+def cmd_daemon(args: argparse.Namespace):
+    report_startup(args.import_s)
+    args.module.run(args)
+
+
+def report_startup(import_s: float):
+    """명령을 시작하기 전까지의 비용을 출력하고 실행 요약에 기록"""
+    from metrics import metrics
+
+    startup = {
+        "import_s": import_s,
+        "cli_s": time.perf_counter() - _STARTED,
+        # 인터프리터 시작을 포함한 이 프로세스의 CPU 시간
+        "process_cpu_s": time.process_time(),
+    }
+    metrics.set_startup(**startup)
+    print("⏱️ 시작 비용: " + ", ".join(f"{name} {value:.3f}s" for name, value in startup.items()), flush=True)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="충남대 컴퓨터융합학부 공지사항 크롤러")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    crawl = commands.add_parser("crawl", help="새 공지 크롤링, 요약, 저장, 알림")
+    crawl.add_argument("--mode", choices=CRAWL_MODES, default=os.getenv("CRAWLER_MODE") or "sync")
+    crawl.set_defaults(handler=cmd_crawl)
+
+    # backfill/re-extract/daemon의 인자(-h 포함)는 명령을 고른 뒤 해당 모듈의 add_arguments로 파싱한다.
+    backfill = commands.add_parser("backfill", help="과거 공지사항 백필 (알림 없음)", add_help=False)
+    backfill.set_defaults(handler=cmd_backfill, module="backfill")
+
+    notify = commands.add_parser("notify", help="저장됐지만 전송되지 못한 공지 전송")
+    notify.add_argument("--digest", action="store_true", help="embed로 묶어서 전송")
+    notify.set_defaults(handler=cmd_notify)
+
+    reextract = commands.add_parser("re-extract", help="본문이 바뀐 공지의 일정 재추출", add_help=False)
+    reextract.set_defaults(handler=cmd_reextract, module="reextract")
+
+    daemon = commands.add_parser("daemon", help="게시판별 적응형 주기로 계속 확인하는 상주 모드", add_help=False)
+    daemon.set_defaults(handler=cmd_daemon, module="daemon")
+    return parser
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = build_parser()
+    args, rest = parser.parse_known_args(argv)
+
+    # 다른 명령이 쓰지 않는 모듈은 import하지 않도록, 고른 명령의 모듈만 불러와 나머지 인자를 파싱한다.
+    module_name = getattr(args, "module", None)
+    if module_name:
+        args.module, args.import_s = _import(module_name)
+        sub = argparse.ArgumentParser(prog=f"{parser.prog} {args.command}")
+        args.module.add_arguments(sub)
+        sub.parse_args(rest, namespace=args)
+    elif rest:
+        parser.error(f"알 수 없는 인자: {' '.join(rest)}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    args.handler(args)
+    print(f"⏱️ 프로세스 CPU 시간 합계 {time.process_time():.3f}s", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,21 @@
 from datetime import datetime
-import hashlib
+from urllib.parse import urlsplit
+import asyncio
+import difflib
+import threading
 import time
 import os
+from typing import List
 
 import requests
-from bs4 import BeautifulSoup
 
-from board import Board
-from database import SupabaseManager
-from gpt_client import GPTClient
+from board import Board, parse_list_page
+from http_client import ConditionalFetcher, make_session
+from job_queue import JOB_MAX_ATTEMPTS, Deadline, JobQueue, NoticeJob
+from lazy import LazyClient
+from metrics import metrics, write_run_summary
+from seen_index import RowFingerprint, SeenIndex, article_no_from_url, content_hash, get_title_hash, list_row_fingerprint
+from webhook_sender import WebhookSender, make_embed, pack_embeds
 
 CRAWLING_URL_LIST = [
 "https://computer.cnu.ac.kr/computer/notice/bachelor.do",
@@ -23,46 +30,88 @@ headers = {
     "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7"
 }
 
-def b_title_box_parser (item) :
-    notice_data = {}
-
-    link = item.select_one("a")
-    if link:
-        notice_data['title'] = link.get_text().strip()
-        notice_data['url'] = link.get('href', '')
-
-    # 새 글 여부 확인
-    new_mark = item.select_one(".b-new span")
-    notice_data['is_new'] = new_mark is not None
-
-    # 세부 정보 추출
-    m_con = item.select_one(".b-m-con")
-    if m_con:
-        # 공지 여부
-        notice_mark = m_con.select_one(".b-notice")
-        notice_data['is_notice'] = notice_mark is not None
-
-        # 작성자
-        writer = m_con.select_one(".b-writer")
-        notice_data['writer'] = writer.get_text().strip() if writer else ""
-
-        # 날짜
-        date = m_con.select_one(".b-date")
-        notice_data['date'] = date.get_text().strip() if date else ""
-
-        # 조회수
-        hit = m_con.select_one(".hit")
-        notice_data['views'] = hit.get_text().strip().replace('조회수 ', '') if hit else "0"
-
-    return notice_data
-
 def make_pagination_url(page, url):
     offset = (page - 1) * 10
     return f"{url}?mode=list&&articleLimit=10&article.offset={offset}"
 
-
-gpt = GPTClient()
-db_manager = SupabaseManager()
+# 비동기 크롤링 시 호스트별 최대 동시 요청 수 (고정 sleep 대신 사용)
+HOST_CONCURRENCY = int(os.getenv("CRAWLER_HOST_CONCURRENCY", "4"))
+
+class HostLimiter:
+    """호스트(netloc)별로 동시 요청 수를 제한하는 세마포어 모음"""
+
+    def __init__(self, limit: int = HOST_CONCURRENCY):
+        self.limit = max(1, limit)
+        self._semaphores: dict = {}
+
+    def get(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.limit)
+        return self._semaphores[host]
+
+async def fetch_text_async(url: str, limiter: HostLimiter) -> str:
+    """호스트별 동시성 제한 안에서 session.get을 스레드로 실행"""
+    async with limiter.get(url):
+        with metrics.span("fetch_detail", url=url):
+            response = await asyncio.to_thread(session.get, url, timeout=10)
+            response.raise_for_status()
+        return response.text
+
+
+def _make_gpt():
+    # LangChain/OpenAI import는 LLM 호출이 필요할 때까지 미룬다.
+    from gpt_client import GPTClient
+    return GPTClient()
+
+def _make_db_manager():
+    from database import SupabaseManager
+    return SupabaseManager()
+
+# 클라이언트는 처음 사용할 때 만든다. 새 글이 없는 실행은 LLM/DB 클라이언트를 만들지 않는다.
+# (테스트/벤치마크에서는 crawler.gpt = ... 처럼 모듈 속성을 바로 바꿔 끼워도 된다)
+gpt = LazyClient("gpt", _make_gpt)
+db_manager = LazyClient("db_manager", _make_db_manager)
+seen_index = LazyClient("seen_index", SeenIndex)
+job_queue = LazyClient("job_queue", JobQueue)
+
+# CNU, Discord 요청이 커넥션을 재사용하도록 하나의 세션을 공유
+session = LazyClient("session", lambda: make_session(headers=headers))
+list_fetcher = LazyClient("list_fetcher", lambda: ConditionalFetcher(session))
+webhook_sender = LazyClient(
+    "webhook_sender",
+    lambda: WebhookSender(max_workers=int(os.getenv("WEBHOOK_CONCURRENCY", "16")), post=session.post),
+)
+
+def find_existing_hashes(items: list, category: int) -> set:
+    """
+    목록 행들 중 이미 저장된 공지사항의 title_hash 집합을 반환.
+    로컬 인덱스에 있는 행은 네트워크 요청 없이 건너뛰고, 나머지만 DB에 한 번에 확인한다.
+    """
+    hashes = [get_title_hash(item['title']) for item in items]
+    known_local = seen_index.known(hashes)
+
+    unknown = [h for h in hashes if h not in known_local]
+    found_remote = db_manager.get_existing_title_hashes(unknown) if unknown else set()
+    if found_remote:
+        seen_index.add(found_remote, category)
+
+    return known_local | found_remote
+
+def mark_seen(notice: dict, item: dict, category: int):
+    """저장이 끝난 공지사항을 로컬 인덱스, high-water mark, 목록 행 지문에 반영"""
+    title_hash = notice.get('title_hash') or get_title_hash(item['title'])
+    article_no = article_no_from_url(item['url'])
+    seen_index.add([title_hash], category)
+    seen_index.update_high_water(category, article_no)
+    seen_index.set_fingerprint(category, article_no, list_row_fingerprint(item), title_hash, content_hash(notice.get('content')))
+
+def prepare_seen_index():
+    """인덱스가 비어 있으면 DB에서 채우고, SEEN_INDEX_RECONCILE 설정 시 DB와 동기화"""
+    if seen_index.is_empty():
+        seen_index.cold_start(db_manager)
+    elif os.getenv("SEEN_INDEX_RECONCILE"):
+        seen_index.reconcile(db_manager)
 
 def update_notice_schedules(deep_url: str, base_url: str):
     """
@@ -71,7 +120,7 @@ def update_notice_schedules(deep_url: str, base_url: str):
     title = ""  # for exception logging
     try:
         # 상세 페이지로 이동하여 내용 가져오기
-        deepResponse = requests.get(deep_url, headers=headers, timeout=10)
+        deepResponse = session.get(deep_url, timeout=10)
         deepResponse.raise_for_status()
         context = Board(boardHtml=deepResponse.text, baseUrl=base_url)
 
@@ -96,143 +145,496 @@ def update_notice_schedules(deep_url: str, base_url: str):
         error_title = f"'{title}' " if title else ""
         print(f"🔴 {error_title}공지사항의 일정 업데이트 처리 중 예외 발생({deep_url}): {e}", flush=True)
 
+# 실행(run) 동안 재사용하는 활성 webhook 스냅샷
+_webhook_snapshot = None
+_webhook_snapshot_lock = threading.Lock()
+
+def get_webhook_snapshot() -> list:
+    """활성 webhook 목록을 실행당 한 번만 읽어 캐시"""
+    global _webhook_snapshot
+    with _webhook_snapshot_lock:
+        if _webhook_snapshot is None:
+            _webhook_snapshot = db_manager.get_active_webhooks_snapshot()
+            print(f"📥 활성 webhook {len(_webhook_snapshot)}개를 불러왔습니다.")
+        return _webhook_snapshot
+
+def reset_webhook_snapshot():
+    global _webhook_snapshot
+    with _webhook_snapshot_lock:
+        _webhook_snapshot = None
+
+def deactivate_webhook(webhook_id: int):
+    """DB에서 비활성화하고 스냅샷에서도 제거"""
+    global _webhook_snapshot
+    db_manager.deactivate_webhook(webhook_id)
+    with _webhook_snapshot_lock:
+        if _webhook_snapshot is not None:
+            _webhook_snapshot = [w for w in _webhook_snapshot if w.id != webhook_id]
+
+# 설정 시 한 실행의 새 공지들을 embed로 묶어 webhook당 최소한의 메시지로 전송
+DISCORD_DIGEST = bool(os.getenv("DISCORD_DIGEST"))
+
+def build_notice_payloads(notices: List[dict], digest: bool = False) -> List[dict]:
+    """공지사항 목록을 webhook payload 목록으로 변환 (digest면 embed로 묶음)"""
+    if digest:
+        embeds = [
+            make_embed(
+                title=("✏️ [수정] " if notice.get('is_update') else "") + (notice.get('ai_summary_title') or notice.get('title', '')),
+                description=notice.get('markdown_content') or "요약 내용이 없습니다.",
+                url=notice.get('original_url', ''),
+            )
+            for notice in notices
+        ]
+        return pack_embeds(embeds)
+
+    payloads = []
+    for notice in notices:
+        markdown_content = notice.get('markdown_content') or "요약 내용이 없습니다."
+        original_url_text = f"\n\n🔗 **원본 링크**: {notice.get('original_url', '')}"
+        update_mark = "✏️ **[수정된 공지]**\n" if notice.get('is_update') else ""
+        payloads.append({"content": update_mark + markdown_content + original_url_text})
+    return payloads
 
-
-from typing import List, Dict
-
-def discord_web_hook(notices: List[dict]):
-    """새로운 공지사항들을 Discord webhook으로 전송합니다."""
+def discord_web_hook(notices: List[dict], digest: bool = DISCORD_DIGEST):
+    """새로운 공지사항들을 Discord webhook으로 병렬 전송합니다."""
     if not notices:
         return
-    
-    # 활성화된 webhook 총 개수 확인
-    total_webhooks = db_manager.get_active_webhooks_count()
-    
-    if total_webhooks == 0:
+
+    webhooks = get_webhook_snapshot()
+
+    if not webhooks:
         print("ℹ️ 활성화된 Discord webhook이 없습니다.")
         return
     
-    print(f"📢 {len(notices)}개의 새로운 공지사항을 {total_webhooks}개의 webhook으로 배치 전송합니다.")
-    
-    batch_size = 50  # 한 번에 처리할 webhook 개수
-    
-    for notice in notices:
-        markdown_content = notice.get('markdown_content') or "요약 내용이 없습니다."
-        original_url_text = f"\n\n🔗 **원본 링크**: {notice.get('original_url', '')}"
-        
-        payload = {
-            "content": markdown_content + original_url_text
-        }
-        
-        # 배치 단위로 webhook 처리
-        offset = 0
-        batch_count = 0
-        
-        while True:
-            webhook_batch = db_manager.get_active_webhooks_batch(batch_size=batch_size, offset=offset)
-            
-            if not webhook_batch:
-                break
-            
-            batch_count += 1
-            print(f"🔄 배치 {batch_count}: {len(webhook_batch)}개의 webhook 처리 중...")
-            
-            # 현재 배치의 webhook들에 전송
-            for webhook in webhook_batch:
-                try:
-                    response = requests.post(webhook.url, json=payload, headers=headers, timeout=10)
-                    response.raise_for_status()
-                    print(f"✅ Webhook '{webhook.url[:50]}...'에 '{notice.get('title', '')[:30]}...' 전송 성공")
-                except requests.exceptions.HTTPError as e:
-                    if response.status_code == 404:
-                        print(f"🔴 Webhook '{webhook.url[:50]}...'이 존재하지 않습니다. 비활성화합니다.")
-                        db_manager.deactivate_webhook(webhook.id)
-                    else:
-                        print(f"❌ Webhook '{webhook.url[:50]}...'에 전송 실패 (HTTP {response.status_code}): {e}")
-                except Exception as e:
-                    print(f"❌ Webhook 전송 중 예외 발생: {e}")
-            
-            offset += batch_size
-            
-            # 배치 간 짧은 대기 (서버 부하 방지)
-            if webhook_batch:
-                time.sleep(0.1)
-        
-        print(f"✅ '{notice.get('title', '')[:30]}...' 공지사항을 모든 webhook에 전송 완료")
+    print(f"📢 {len(notices)}개의 새로운 공지사항을 {len(webhooks)}개의 webhook으로 전송합니다.")
+
+    payloads = build_notice_payloads(notices, digest=digest)
+
+    with metrics.span("discord_deliver", notices=len(notices), webhooks=len(webhooks)):
+        report = webhook_sender.deliver(webhooks, payloads, on_not_found=deactivate_webhook)
+    # delivered는 webhook에 실제로 전달된 (공지, webhook) 수, webhook_messages_*는 webhook별 메시지 수
+    notices_per_payload = [len(payload.get("embeds", ())) if digest else 1 for payload in payloads]
+    metrics.incr("delivered", sum(count * report.sent_by_payload[i] for i, count in enumerate(notices_per_payload)))
+    metrics.incr("webhook_messages_sent", report.sent)
+    metrics.incr("webhook_messages_failed", report.failed)
+
+    print(f"✅ {len(notices)}개 공지사항 전송 완료 (성공 {report.sent}, 실패 {report.failed}, 429 재시도 {report.rate_limited})")
 
 def triggered_notice_exists(notices: List[dict]):
-    discord_web_hook(notices)
+    # digest 모드에서는 실행이 끝날 때 main()에서 한꺼번에 전송
+    if not DISCORD_DIGEST:
+        discord_web_hook(notices)
 
-# url String을 매개변수로 받아, 해당 사이트 html을 긁어와, 전체적인 파싱을 시작하는 함수
-def crawler(url : str, page : int, category : int):
-    response = requests.get(make_pagination_url(page, url), headers=headers, timeout=10)
-    soup = BeautifulSoup(response.text, "html.parser")
+def make_save_entry(item: dict, url: str, category: int, context: Board, ai_response, ai_schedules) -> dict:
+    """파싱된 게시글과 GPT 결과로 save_notice 인자(notice_data, image_urls, files, ai_schedules)를 만든다."""
+    deepUrl = url + item['url']
 
-    items = soup.select("div.b-title-box")
+    # 2. DB에 저장할 데이터 준비
+    try:
+        # 날짜 문자열('YYYY-MM-DD' 또는 'YYYY.MM.DD')을 date 객체로 변환
+        date_str = context.date.replace('.', '-')
+        publish_date_obj = datetime.strptime(date_str, '%Y-%m-%d').date()
+    except (ValueError, TypeError):
+        publish_date_obj = None  # 날짜 파싱 실패 또는 날짜 정보가 없는 경우 None으로 처리
+
+    # models.Notice에 맞는 데이터 구조 생성
+    notice_data = {
+        'title': context.title,
+        'content': context.detail_text,
+        'writer': context.writer,
+        'writer_email': context.email,
+        'publish_date': publish_date_obj,
+        'is_notice': item.get('is_notice', False),
+        'ai_summary_title': ai_response.AI_SUMMARY_TITLE,
+        'ai_summary_content': ai_response.AI_SUMMARY_CONTENT,
+        'markdown_content': ai_response.MARKDOWN_CONTENT,
+        'original_url': deepUrl,
+        'category': category,
+    }
 
-    # title, url, is_new, is_notice, writer, date, views 딕셔너리로 데이터 존재, 리스트임.
-    items = list(map(b_title_box_parser, items))
+    return {
+        'notice_data': notice_data,
+        'image_urls': context.images,
+        'files': context.file_box,
+        'ai_schedules': ai_schedules,
+    }
 
-    # print(*items, sep="\n")
+# 한 번의 실행에서 따라갈 최대 목록 페이지 수
+CRAWL_MAX_PAGES = int(os.getenv("CRAWL_MAX_PAGES", "5"))
+# 순차 크롤링에서 상세 페이지/게시판 사이에 쉬는 시간(초)
+CRAWL_DELAY_SECONDS = float(os.getenv("CRAWL_DELAY_SECONDS", "5"))
 
-    notices = []
+def fetch_list_items(url: str, page: int) -> list:
+    with metrics.span("fetch_list", url=url, page=page):
+        response = session.get(make_pagination_url(page, url), timeout=10)
+        response.raise_for_status()
+    with metrics.span("parse_list"):
+        return parse_list_page(response.text)
 
+def reached_high_water(items: list, high_water: int | None) -> bool:
+    """고정 공지를 제외한 행 중 high-water mark(지금까지 저장한 가장 큰 articleNo) 이하의 글이 있는지"""
+    if high_water is None:
+        return False
     for item in items:
-        if db_manager.notice_exists(title=item['title']) :
-            # print(f"⚠️ '{item['title']}' 이전에 있는 공지사항입니다. 일정 정보 업데이트를 시도합니다.", flush=True)
-            
-            # deepUrl = url + item['url']
-            # update_notice_schedules(deep_url=deepUrl, base_url=url)
+        article_no = article_no_from_url(item['url'])
+        if not item.get('is_notice') and article_no is not None and article_no <= high_water:
+            return True
+    return False
 
-            # time.sleep(10) # GPT API 호출 부하를 줄이기 위해 대기
+def iter_new_items(url: str, category: int, start_page: int = 1, first_page_items: list | None = None,
+                   max_pages: int = CRAWL_MAX_PAGES, fetched_items: list | None = None):
+    """
+    목록 페이지를 차례로 넘기며 아직 저장되지 않은 행을 하나씩 yield하는 제너레이터.
+    모든 행이 이미 저장된 페이지, 빈 페이지, high-water mark에 닿은 페이지를 만나거나 max_pages에 도달하면 멈춘다.
+    first_page_items를 주면 첫 페이지는 다시 가져오지 않는다.
+    fetched_items를 주면 이 제너레이터가 직접 가져온 페이지의 행을 모두 담는다. 제목이 바뀐 기존 글은 yield하지 않으므로
+    호출한 쪽이 first_page_items와 fetched_items를 process_edited_items로 확인해야 한다.
+    """
+    yielded = set()  # 페이지를 넘기는 사이 새 글이 올라와 행이 밀려도 중복으로 내보내지 않음
+    high_water = seen_index.get_high_water(category)
+
+    for page in range(start_page, start_page + max_pages):
+        if page == start_page and first_page_items is not None:
+            items = first_page_items
+        else:
+            items = fetch_list_items(url, page)
+            if fetched_items is not None:
+                fetched_items.extend(items)
+        if not items:
+            return
+
+        metrics.incr("seen", len(items))
+        existing_hashes = find_existing_hashes(items, category)
+        known_articles = seen_index.get_fingerprints(category, filter(None, (article_no_from_url(i['url']) for i in items)))
+        new_count = 0
+
+        for item in items:
+            title_hash = get_title_hash(item['title'])
+            if title_hash in existing_hashes:
+                print(f"⚠️ '{item['title']}' 이전에 있는 공지사항입니다.", flush=True)
+                metrics.incr("skipped")
+                continue
+            if article_no_from_url(item['url']) in known_articles:
+                continue  # 제목이 바뀐 기존 글. 호출한 쪽이 process_edited_items에서 수정으로 처리한다.
+            if title_hash in yielded:
+                continue
+
+            yielded.add(title_hash)
+            new_count += 1
+            yield item
+
+        if new_count == 0:
+            return
+        if reached_high_water(items, high_water):
+            return  # 다음 페이지부터는 지난 실행까지 이미 확인한 글들이다.
 
-            print(f"⚠️ '{item['title']}' 이전에 있는 공지사항입니다.", flush=True)
+def find_edited_items(items: list, category: int) -> List[tuple]:
+    """
+    목록 행 지문(날짜/작성자/제목/articleNo)이 지난번과 달라진 기존 공지를 (item, 이전 RowFingerprint)로 반환.
+    지문이 없는 기존 공지는 이번 행으로 기준 지문만 기록하고, 새 글은 저장 후 mark_seen에서 기록한다.
+    """
+    by_article = {article_no_from_url(item['url']): item for item in items}
+    by_article.pop(None, None)
+
+    stored = seen_index.get_fingerprints(category, by_article)
+    baseline = {no: item for no, item in by_article.items() if no not in stored}
+    known = seen_index.known(get_title_hash(item['title']) for item in baseline.values())
+
+    edited = []
+    for article_no, item in by_article.items():
+        fingerprint = list_row_fingerprint(item)
+        if article_no in baseline:
+            title_hash = get_title_hash(item['title'])
+            if title_hash in known:
+                seen_index.set_fingerprint(category, article_no, fingerprint, title_hash)
+        elif stored[article_no].fingerprint != fingerprint:
+            edited.append((item, stored[article_no]))
+    return edited
+
+def update_edited_notice(item: dict, url: str, category: int, previous: RowFingerprint, detail_html: str) -> dict | None:
+    """
+    목록 정보가 바뀐 공지의 상세 페이지를 이전 본문과 비교해, 제목이나 본문이 바뀌었으면
+    다시 요약/일정 추출하여 기존 notice를 갱신한다. 바뀐 게 없으면 지문만 갱신하고 None.
+    """
+    with metrics.span("parse_detail"):
+        context = Board(boardHtml=detail_html, baseUrl=url)
+    article_no = article_no_from_url(item['url'])
+    fingerprint = list_row_fingerprint(item)
+
+    stored = db_manager.get_notice_by_title_hash(previous.title_hash, "id,content")
+    if stored is None:
+        print(f"⚠️ 수정된 공지사항의 원본을 찾을 수 없습니다: {item['title']}", flush=True)
+        return None
+
+    new_title_hash = get_title_hash(context.title)
+    new_content_hash = content_hash(context.detail_text)
+    old_content_hash = previous.content_hash or content_hash(stored.get('content'))
+
+    if new_title_hash == previous.title_hash and new_content_hash == old_content_hash:
+        seen_index.set_fingerprint(category, article_no, fingerprint, previous.title_hash, old_content_hash)
+        print(f"ℹ️ '{item['title']}' 목록 정보만 바뀌고 본문은 같습니다.", flush=True)
+        return None
+
+    diff = difflib.unified_diff((stored.get('content') or "").splitlines(), context.detail_text.splitlines(), lineterm="", n=0)
+    changed_lines = sum(1 for line in diff if line[:1] in "+-" and line[:3] not in ("+++", "---"))
+    print(f"✏️ '{context.title}' 공지사항이 수정되었습니다. (변경된 줄 {changed_lines}개)", flush=True)
+
+    ai_response, ai_schedules = gpt.analyze_notice(title=context.title, content=context.detail_text)
+    metrics.incr("summarized")
+    entry = make_save_entry(item, url, category, context, ai_response, ai_schedules)
+    with metrics.span("db_save", kind="update"):
+        notice = db_manager.update_notice(stored['id'], **entry)
+    metrics.incr("updated")
+
+    seen_index.add([new_title_hash], category)
+    seen_index.set_fingerprint(category, article_no, fingerprint, new_title_hash, new_content_hash)
+    return dict(notice, is_update=True)
+
+def process_edited_items(items: list, url: str, category: int, deadline: Deadline | None = None) -> List[dict]:
+    """목록 행 지문이 바뀐 공지만 상세 페이지를 가져와 수정 여부를 확인하고, 갱신된 공지들을 반환"""
+    updated = []
+    for item, previous in find_edited_items(items, category):
+        if deadline and not deadline.allows(job_queue.estimate("analyze", ANALYZE_ESTIMATE_SECONDS)):
+            break  # 지문을 갱신하지 않았으므로 다음 실행에서 다시 확인한다.
+        try:
+            with metrics.span("fetch_detail", url=url + item['url']):
+                detail = session.get(url + item['url'], timeout=10)
+                detail.raise_for_status()
+            notice = update_edited_notice(item, url, category, previous, detail.text)
+        except Exception as e:
+            # 수정 반영은 새 공지 처리를 막지 않는다. 지문이 그대로라 다음 실행에서 다시 확인한다.
+            print(f"🔴 '{item['title']}' 수정 반영 중 오류 발생: {e}", flush=True)
+            metrics.incr("failed")
             continue
+        if notice:
+            updated.append(notice)
+    return updated
 
-        deepUrl = url + item['url']
-        deepResponse = requests.get(deepUrl, headers=headers, timeout=10)
-        context = Board(boardHtml=deepResponse.text, baseUrl=url)
+# 상세 페이지 + LLM 분석 한 건의 예상 소요 시간(초). 기록된 소요 시간이 없을 때 사용
+ANALYZE_ESTIMATE_SECONDS = float(os.getenv("ANALYZE_ESTIMATE_SECONDS", "30"))
 
-        print(deepUrl + " 로 접속하여 2차 크롤링을 진행합니다.", flush=True)
+def advance_job(job: NoticeJob, deadline: Deadline) -> NoticeJob | None:
+    """
+    작업을 saved 단계까지 진행. 단계마다 결과를 작업 큐에 기록하므로 중간에 멈춰도 다음 실행에서 이어진다.
+    남은 시간 안에 끝낼 수 없는 LLM 작업은 시작하지 않고 None을 반환한다.
+    """
+    resumed = job.stage == "analyzed"
 
-        ai_response = gpt.process_notice_content(title=context.title, content=context.detail_text)
-        ai_schedules = gpt.extract_schedule_from_notice(title=context.title, content=context.detail_text)
+    if job.stage == "pending":
+        if not deadline.allows(job_queue.estimate("analyze", ANALYZE_ESTIMATE_SECONDS)):
+            return None
 
+        started = time.monotonic()
+        deepUrl = job.board_url + job.item['url']
+        with metrics.span("fetch_detail", url=deepUrl):
+            deepResponse = session.get(deepUrl, timeout=10)
+            deepResponse.raise_for_status()
+        with metrics.span("parse_detail"):
+            context = Board(boardHtml=deepResponse.text, baseUrl=job.board_url)
 
-        # 2. DB에 저장할 데이터 준비
+        print(deepUrl + " 로 접속하여 2차 크롤링을 진행합니다.", flush=True)
+
+        ai_response, ai_schedules = gpt.analyze_notice(title=context.title, content=context.detail_text)
+        metrics.incr("summarized")
+        entry = make_save_entry(job.item, job.board_url, job.category, context, ai_response, ai_schedules)
+        job = job_queue.advance(job, "analyzed", entry=entry)
+        job_queue.record_duration("analyze", time.monotonic() - started)
+
+    if job.stage == "analyzed":
+        assert job.entry is not None
+        notice = None
+        if resumed:
+            # 저장 직후 단계 기록 전에 중단되었을 수 있으므로 중복 저장하지 않도록 먼저 확인
+            notice = db_manager.get_notice_by_title_hash(get_title_hash(job.entry['notice_data']['title']), "*")
+        if notice is None:
+            with metrics.span("db_save", kind="insert"):
+                notice = db_manager.save_notice(**job.entry)
+            metrics.incr("saved")
+        mark_seen(notice, job.item, job.category)
+        job = job_queue.advance(job, "saved", notice=notice)
+
+    return job
+
+def run_jobs(jobs: List[NoticeJob], deadline: Deadline) -> List[dict]:
+    """작업들을 차례로 saved 단계까지 진행하고 저장된 공지들을 반환. 실패한 작업은 기록만 하고 계속한다."""
+    notices = []
+    for job in jobs:
+        if job.stage not in ("pending", "analyzed"):
+            continue
         try:
-            # 날짜 문자열('YYYY-MM-DD' 또는 'YYYY.MM.DD')을 date 객체로 변환
-            date_str = context.date.replace('.', '-')
-            publish_date_obj = datetime.strptime(date_str, '%Y-%m-%d').date()
-        except (ValueError, TypeError):
-            publish_date_obj = None  # 날짜 파싱 실패 또는 날짜 정보가 없는 경우 None으로 처리
-
-        # models.Notice에 맞는 데이터 구조 생성
-        notice_data = {
-            'title': context.title,
-            'content': context.detail_text,
-            'writer': context.writer,
-            'writer_email': context.email,
-            'publish_date': publish_date_obj,
-            'is_notice': item.get('is_notice', False),
-            'ai_summary_title': ai_response.AI_SUMMARY_TITLE,
-            'ai_summary_content': ai_response.AI_SUMMARY_CONTENT,
-            'markdown_content': ai_response.MARKDOWN_CONTENT,
-            'original_url': deepUrl,
-            'category': category,
-        }
-
-        # 3. 데이터베이스에 공지사항 및 이미지 정보 저장
+            advanced = advance_job(job, deadline)
+        except Exception as e:
+            fail_job(job, e)
+            continue
+
+        if advanced is None:
+            print(f"⏱️ 남은 시간({deadline.remaining():.0f}초)이 부족해 나머지 작업은 다음 실행에서 이어서 처리합니다.", flush=True)
+            break
+        notices.append(advanced.notice)
+        if job.stage == "pending":
+            time.sleep(CRAWL_DELAY_SECONDS)  # 상세 페이지를 가져온 경우에만 원본 사이트 부하를 줄이기 위해 대기
+    return notices
+
+# 비동기 크롤링에서 여러 게시판이 동시에 전송해도 같은 작업을 두 번 보내지 않도록
+_notify_lock = threading.Lock()
+
+def notify_saved_jobs(extra: List[dict] | None = None, digest: bool = False):
+    """saved 단계의 작업(이전 실행에서 남은 것 포함)과 extra 공지를 전송하고 notified로 표시"""
+    with _notify_lock:
+        jobs = job_queue.in_stages(["saved"])
+        discord_web_hook(list(extra or []) + [job.notice for job in jobs], digest=digest)
+        job_queue.mark(jobs, "notified")
+
+def resume_jobs(deadline: Deadline) -> List[dict]:
+    """이전 실행에서 시간 제한이나 오류로 끝내지 못한 작업을 이어서 처리"""
+    jobs = job_queue.in_stages(["pending", "analyzed"])
+    if jobs:
+        print(f"♻️ 이전 실행에서 남은 작업 {len(jobs)}건을 이어서 처리합니다.", flush=True)
+    notices = run_jobs(jobs, deadline)
+    if not DISCORD_DIGEST:
+        notify_saved_jobs()
+    return notices
+
+# 한 번의 save_notices(한 트랜잭션)로 저장할 최대 공지 수
+SAVE_BATCH_SIZE = int(os.getenv("SAVE_BATCH_SIZE", "5"))
+
+def fail_job(job: NoticeJob, error: BaseException):
+    """작업 실패를 기록하고, 재시도 횟수를 다 쓰면 관리자에게 알린다."""
+    failed = job_queue.fail(job, error)
+    metrics.incr("failed")
+    print(f"🔴 '{job.item.get('title')}' 처리 실패 ({failed.attempts}/{JOB_MAX_ATTEMPTS}): {error}", flush=True)
+    if failed.stage == "failed":
+        discord_web_hook_admin(f"[{job.board_url}] '{job.item.get('title')}' {JOB_MAX_ATTEMPTS}회 실패: {error}")
+
+def _finish_saved(job: NoticeJob, notice: dict) -> dict:
+    mark_seen(notice, job.item, job.category)
+    job_queue.advance(job, "saved", notice=notice)
+    return notice
+
+def save_analyzed_jobs(jobs: List[NoticeJob], batch_size: int = SAVE_BATCH_SIZE) -> List[dict]:
+    """
+    analyzed 작업들을 batch_size개씩 save_notices 한 번으로 저장하고 saved로 옮긴다.
+    batch가 실패하면 그 batch만 한 건씩 다시 저장해, 문제 있는 행 하나가 나머지 공지의 저장을 막지 않게 한다.
+    """
+    notices = []
+    for i in range(0, len(jobs), max(1, batch_size)):
+        batch = jobs[i:i + max(1, batch_size)]
         try:
-            notice = db_manager.save_notice(notice_data=notice_data, image_urls=context.images, files=context.file_box, ai_schedules=ai_schedules)
+            with metrics.span("db_save", kind="batch", notices=len(batch)):
+                saved = db_manager.save_notices([job.entry for job in batch])
         except Exception as e:
-            print(f"🔴 데이터베이스 저장 중 오류 발생: {e}")
-            raise
-            
-        notices.append(notice)  # notice는 dict
-        time.sleep(5)
-    
-    triggered_notice_exists(notices)
+            print(f"⚠️ 공지 {len(batch)}건 일괄 저장 실패, 한 건씩 다시 저장합니다: {e}", flush=True)
+            for job in batch:
+                try:
+                    with metrics.span("db_save", kind="insert"):
+                        notice = db_manager.save_notice(**job.entry)
+                except Exception as row_error:
+                    fail_job(job, row_error)  # 분석 결과는 작업 큐에 남아 다음 실행에서 저장만 다시 시도한다.
+                    continue
+                metrics.incr("saved")
+                notices.append(_finish_saved(job, notice))
+            continue
+
+        metrics.incr("saved", len(saved))
+        notices.extend(_finish_saved(job, notice) for job, notice in zip(batch, saved))
+    return notices
+
+# url String을 매개변수로 받아, 해당 사이트 html을 긁어와, 전체적인 파싱을 시작하는 함수
+def crawler(url : str, page : int, category : int, deadline: Deadline | None = None):
+    deadline = deadline or Deadline()
+
+    # 조건부 GET: 지난 실행 이후 목록이 바뀌지 않았다면 파싱 없이 종료
+    with metrics.span("fetch_list", url=url, page=page):
+        page_fetch = list_fetcher.fetch(make_pagination_url(page, url))
+    if not page_fetch.changed:
+        print(f"ℹ️ [{url}] 목록 페이지 {page}에 변경이 없습니다.", flush=True)
+        return []
+
+    # title, url, is_new, is_notice, writer, date, views 딕셔너리로 데이터 존재, 리스트임.
+    with metrics.span("parse_list"):
+        items = parse_list_page(page_fetch.text)
+
+    # print(*items, sep="\n")
+
+    # 목록 행 지문이 바뀐 기존 공지만 상세 페이지를 확인해 수정 사항을 반영
+    notices = process_edited_items(items, url, category, deadline)
+
+    # 이미 있는 행은 건너뛰고, 첫 페이지에 새 글이 있으면 다음 페이지도 이어서 확인
+    # (존재 여부는 로컬 인덱스 + 페이지당 한 번의 DB 요청으로 확인)
+    # 새 글은 먼저 작업 큐에 기록하므로, 이번 실행에서 끝내지 못해도 다음 실행이 이어서 처리한다.
+    fetched_items: list = []
+    jobs = [
+        job_queue.enqueue(category, url, item)
+        for item in iter_new_items(url, category, start_page=page, first_page_items=items, fetched_items=fetched_items)
+    ]
+    # 다음 페이지들에서 목록 행 지문이 바뀐 기존 공지도 수정 여부를 확인
+    notices.extend(process_edited_items(fetched_items, url, category, deadline))
+    list_fetcher.commit(page_fetch)
+
+    notices.extend(run_jobs(jobs, deadline))  # notice는 dict
+
+    if not DISCORD_DIGEST:
+        notify_saved_jobs(extra=[notice for notice in notices if notice.get('is_update')])
+    return notices
+
+async def crawler_async(url: str, page: int, category: int, limiter: HostLimiter):
+    """
+    crawler()의 비동기 버전. 상세 페이지들을 동시에 가져오고 처리 결과는 목록 순서를 유지한다.
+    새 글은 작업 큐에 기록하고 분석이 끝날 때마다 analyzed로 남기므로, 저장이 실패해도 LLM 결과는 다음 실행에서 재사용된다.
+    """
+    list_url = make_pagination_url(page, url)
+    async with limiter.get(list_url):
+        with metrics.span("fetch_list", url=url, page=page):
+            page_fetch = await asyncio.to_thread(list_fetcher.fetch, list_url)
+    if not page_fetch.changed:
+        print(f"ℹ️ [{url}] 목록 페이지 {page}에 변경이 없습니다.", flush=True)
+        return []
+
+    with metrics.span("parse_list"):
+        items = parse_list_page(page_fetch.text)
+    updated = await asyncio.to_thread(process_edited_items, items, url, category)
+
+    # 목록 페이지 넘김은 순서대로, 상세 페이지 처리는 아래에서 동시에
+    # (analyzed 이후 단계의 작업은 main_async 시작 시 resume_jobs가 이어서 처리한다)
+    fetched_items: list = []
+    jobs = await asyncio.to_thread(lambda: [
+        job for job in (job_queue.enqueue(category, url, item)
+                        for item in iter_new_items(url, category, start_page=page, first_page_items=items,
+                                                   fetched_items=fetched_items))
+        if job.stage == "pending"
+    ])
+    updated += await asyncio.to_thread(process_edited_items, fetched_items, url, category)
+
+    async def process(job: NoticeJob) -> NoticeJob:
+        """상세 페이지 수집 + 분석 결과를 작업 큐에 analyzed로 기록 (저장은 아래에서 batch로)"""
+        deepUrl = url + job.item['url']
+        detail_html = await fetch_text_async(deepUrl, limiter)
+        with metrics.span("parse_detail"):
+            context = Board(boardHtml=detail_html, baseUrl=url)
+
+        print(deepUrl + " 로 접속하여 2차 크롤링을 진행합니다.", flush=True)
+
+        # LLM 호출은 GPTClient의 동시성/RPM/TPM 제한 안에서 비동기로 실행
+        ai_response, ai_schedules = await gpt.aanalyze_notice(title=context.title, content=context.detail_text)
+        metrics.incr("summarized")
+        entry = make_save_entry(job.item, url, category, context, ai_response, ai_schedules)
+        return job_queue.advance(job, "analyzed", entry=entry)
+
+    # gather는 입력 순서대로 결과를 돌려주므로 순차 crawler()와 같은 순서가 된다.
+    results = await asyncio.gather(*(process(job) for job in jobs), return_exceptions=True)
+
+    analyzed = []
+    for job, result in zip(jobs, results):
+        if isinstance(result, BaseException):
+            fail_job(job, result)
+        else:
+            analyzed.append(result)
+
+    notices = updated + await asyncio.to_thread(save_analyzed_jobs, analyzed)
+    if not DISCORD_DIGEST:
+        await asyncio.to_thread(notify_saved_jobs, updated)
+    list_fetcher.commit(page_fetch)
+    return notices
 
 def discord_web_hook_admin(error_message: str):
     """관리자용 Discord Webhook으로 에러 메시지 전송"""
@@ -248,24 +650,92 @@ def discord_web_hook_admin(error_message: str):
     }
 
     try:
-        response = requests.post(admin_webhook_url, json=payload, headers=headers, timeout=10)
+        response = session.post(admin_webhook_url, json=payload, timeout=10)
         response.raise_for_status()
         print("✅ 에러 메시지를 관리자 Discord Webhook으로 전송했습니다.")
     except Exception as e:
         print(f"❌ 관리자 Discord Webhook 전송 실패: {e}")
 
 def main():
+    metrics.reset()
+    try:
+        _run()
+    finally:
+        # 실행이 예외로 끝나도 실행 요약은 남긴다.
+        write_run_summary()
+
+def _run():
+    deadline = Deadline()
+    prepare_seen_index()
+    reset_webhook_snapshot()
+    job_queue.purge()
+
+    run_notices = resume_jobs(deadline)
+
     category = 0
     for url in CRAWLING_URL_LIST:
+        if deadline.expired():
+            print("⏱️ 실행 시간 예산을 모두 사용해 남은 게시판은 다음 실행에서 확인합니다.", flush=True)
+            break
         try:
-            crawler(url, 1, category)
+            run_notices.extend(crawler(url, 1, category, deadline))
         except Exception as e:
             error_message = f"[{url}] {str(e)}"
             discord_web_hook_admin(error_message)
             print(e, "에러로 인해, 시스템 중지.")
-            return
+            break
         category += 1
-        time.sleep(5)
+        time.sleep(CRAWL_DELAY_SECONDS)
+
+    if DISCORD_DIGEST:
+        notify_saved_jobs(extra=[notice for notice in run_notices if notice.get('is_update')], digest=True)
+
+def main_notify(digest: bool = DISCORD_DIGEST):
+    """크롤링 없이, 이전 실행에서 저장만 되고 전송되지 못한 공지(saved 단계 작업)만 전송"""
+    metrics.reset()
+    try:
+        reset_webhook_snapshot()
+        notify_saved_jobs(digest=digest)
+    finally:
+        write_run_summary()
+
+async def main_async(host_concurrency: int = HOST_CONCURRENCY):
+    """모든 게시판을 동시에 크롤링. 게시판별 에러는 각각 관리자에게 전송한다."""
+    metrics.reset()
+    try:
+        await _run_async(host_concurrency)
+    finally:
+        write_run_summary()
+
+async def _run_async(host_concurrency: int):
+    prepare_seen_index()
+    reset_webhook_snapshot()
+    job_queue.purge()
+
+    resumed = await asyncio.to_thread(resume_jobs, Deadline())
+
+    limiter = HostLimiter(host_concurrency)
+    results = await asyncio.gather(
+        *(crawler_async(url, 1, category, limiter) for category, url in enumerate(CRAWLING_URL_LIST)),
+        return_exceptions=True,
+    )
+
+    run_notices = list(resumed)
+    for url, result in zip(CRAWLING_URL_LIST, results):
+        if isinstance(result, BaseException):
+            discord_web_hook_admin(f"[{url}] {str(result)}")
+            print(result, "에러로 인해, 해당 게시판 크롤링 중지.")
+        else:
+            run_notices.extend(result)
+
+    if DISCORD_DIGEST:
+        notify_saved_jobs(extra=[notice for notice in run_notices if notice.get('is_update')], digest=True)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    if os.getenv("CRAWLER_MODE") == "async":
+        asyncio.run(main_async())
+    elif os.getenv("CRAWLER_MODE") == "pipeline":
+        from pipeline import main_pipeline
+        asyncio.run(main_pipeline())
+    else:
+        main()
\ No newline at end of file
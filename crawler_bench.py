@@ -0,0 +1,291 @@
+"""
+외부 서비스(CNU, OpenAI, Supabase, Discord) 없이 크롤러 전체를 돌리는 오프라인 벤치마크.
+
+    python crawler_bench.py                           # 게시판 4개 × 새 글 20개
+    python crawler_bench.py --notices 40 --llm-latency 1.0 --webhooks 200
+    python crawler_bench.py --mode async --json bench.json
+
+fixtures/boards 의 HTML로 목록/상세 페이지를 만들어 주는 가짜 사이트, FakeStructuredChatModel,
+SQLiteManager, MockWebhookServer로 crawler 모듈의 외부 의존성을 바꿔 끼우고
+단계별 처리량과 지연 시간 분위수(p50/p90/p99)를 출력한다.
+"""
+import os
+
+# crawler 모듈의 클라이언트용 값. 아래에서 모두 로컬 대역으로 바꾸므로 실제로 접속하지 않는다.
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_KEY", "offline-bench")
+os.environ.setdefault("OPENAI_API_KEY", "offline-bench")
+os.environ.setdefault("LLM_CACHE_DISABLED", "1")
+
+import argparse
+import asyncio
+import functools
+import glob
+import html
+import json
+import re
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import parse_qs, urlsplit
+
+import crawler
+from fake_db import SQLiteManager
+from fake_llm import FakeStructuredChatModel
+from gpt_client import OPENAI_RPM, OPENAI_TPM, GPTClient
+from http_client import ConditionalFetcher, make_session
+from job_queue import Deadline, JobQueue
+from metrics import percentile
+from mock_webhook_server import MockWebhookServer
+from rate_limiter import RateLimiter
+from seen_index import SeenIndex, article_no_from_url
+from webhook_sender import WebhookSender
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "boards")
+
+LIST_ROW_TEMPLATE = """<tr>
+	<td class="b-num-box">{number}</td>
+	<td class="b-td-left">
+		<div class="b-title-box">
+			<a href="?mode=view&amp;articleNo={article_no}&amp;article.offset={offset}&amp;articleLimit=10" title="자세히 보기">{title}</a>
+			<div class="b-m-con">
+				<span class="b-writer">{writer}</span>
+				<span class="b-date">{date}</span>
+				<span class="hit">조회수 {views}</span>
+			</div>
+		</div>
+	</td>
+	<td>{writer}</td><td>{date}</td><td>{views}</td>
+</tr>
+"""
+DETAIL_TITLE_RE = re.compile(r'(<td class="b-title-box"[^>]*>)(.*?)(</td>)', re.S)
+
+
+class StageTimer:
+    """단계별 호출 소요 시간을 모으는 계측기 (스레드/asyncio 모두에서 사용)"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            self.samples[stage].append(seconds)
+
+    def wrap(self, stage: str, func):
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(stage, time.perf_counter() - started)
+        return timed
+
+    def wrap_async(self, stage: str, func):
+        @functools.wraps(func)
+        async def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                self.record(stage, time.perf_counter() - started)
+        return timed
+
+    def summary(self) -> dict:
+        result = {}
+        for stage, values in self.samples.items():
+            values = sorted(values)
+            total = sum(values)
+            result[stage] = {
+                "count": len(values),
+                "total_s": total,
+                "per_s": len(values) / total if total else 0.0,
+                "p50_ms": percentile(values, 50) * 1000,
+                "p90_ms": percentile(values, 90) * 1000,
+                "p99_ms": percentile(values, 99) * 1000,
+                "max_ms": values[-1] * 1000,
+            }
+        return result
+
+
+class FakeResponse:
+    def __init__(self, text: str, status_code: int = 200):
+        self.text = text
+        self.status_code = status_code
+        self.headers: dict = {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FixtureSite:
+    """
+    게시판마다 notices개의 글이 있는 가짜 CNU 사이트. requests.Session.get 대신 쓴다.
+    목록 페이지는 fixture의 행 구조로 만들고, 상세 페이지는 detail fixture들을 돌려 쓰며 제목만 바꾼다.
+    """
+
+    def __init__(self, boards: list, notices: int, latency: float = 0.0, timer: StageTimer | None = None):
+        self.latency = latency
+        self.timer = timer or StageTimer()
+
+        with open(os.path.join(FIXTURE_DIR, "list_bachelor.html"), encoding="utf-8") as f:
+            page = f.read()
+        self.list_head = page[:page.index("<tbody>") + len("<tbody>\n")]
+        self.list_tail = page[page.index("</tbody>"):]
+
+        self.detail_templates = []
+        for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "detail_*.html"))):
+            with open(path, encoding="utf-8") as f:
+                self.detail_templates.append(f.read())
+
+        # 최신 글이 앞에 오도록 articleNo 내림차순
+        self.articles = {
+            url: [
+                {
+                    "article_no": 900000 + category * 10000 + n,
+                    "title": f"[벤치 {category}] 테스트 공지 {n}",
+                    "writer": "학과사무실",
+                    "date": "24.09.02",
+                    "views": str(100 + n),
+                }
+                for n in range(notices, 0, -1)
+            ]
+            for category, url in boards
+        }
+
+    def list_html(self, board_url: str, offset: int) -> str:
+        rows = self.articles[board_url][offset:offset + 10]
+        body = "".join(
+            LIST_ROW_TEMPLATE.format(number=len(self.articles[board_url]) - offset - i, offset=offset,
+                                     **{k: html.escape(v) if isinstance(v, str) else v for k, v in row.items()})
+            for i, row in enumerate(rows)
+        )
+        return self.list_head + body + self.list_tail
+
+    def detail_html(self, board_url: str, article_no: int) -> str:
+        article = next(a for a in self.articles[board_url] if a["article_no"] == article_no)
+        template = self.detail_templates[article_no % len(self.detail_templates)]
+        return DETAIL_TITLE_RE.sub(lambda m: m.group(1) + html.escape(article["title"]) + m.group(3), template, count=1)
+
+    def get(self, url: str, headers: dict | None = None, timeout: float | None = None) -> FakeResponse:
+        started = time.perf_counter()
+        if self.latency:
+            time.sleep(self.latency)
+
+        board_url = url.split("?")[0]
+        query = parse_qs(urlsplit(url).query)
+        if query.get("mode") == ["list"]:
+            response = FakeResponse(self.list_html(board_url, int(query.get("article.offset", ["0"])[0])))
+            self.timer.record("fetch_list", time.perf_counter() - started)
+        else:
+            response = FakeResponse(self.detail_html(board_url, article_no_from_url(url) or 0))
+            self.timer.record("fetch_detail", time.perf_counter() - started)
+        return response
+
+
+def install_stand_ins(site: FixtureSite, db: SQLiteManager, timer: StageTimer,
+                      llm_latency: float, webhook_workers: int, rpm: float = OPENAI_RPM, tpm: float = OPENAI_TPM):
+    """crawler 모듈의 외부 의존성을 로컬 대역으로 바꾸고 단계별 계측을 건다."""
+    crawler.session = site
+    crawler.list_fetcher = ConditionalFetcher(site, path=":memory:")
+    crawler.db_manager = db
+    crawler.seen_index = SeenIndex(":memory:")
+    crawler.job_queue = JobQueue(":memory:")
+    crawler.gpt = GPTClient(llm=FakeStructuredChatModel(latency=llm_latency), cache=None,
+                            rate_limiter=RateLimiter(rpm, tpm))
+    crawler.webhook_sender = WebhookSender(max_workers=webhook_workers, post=make_session().post)
+    crawler.CRAWL_DELAY_SECONDS = 0
+    crawler.reset_webhook_snapshot()
+
+    crawler.Board = timer.wrap("Board", crawler.Board)
+    crawler.parse_list_page = timer.wrap("parse_list_page", crawler.parse_list_page)
+    crawler.gpt.analyze_notice = timer.wrap("llm_analyze", crawler.gpt.analyze_notice)
+    crawler.gpt.aanalyze_notice = timer.wrap_async("llm_analyze", crawler.gpt.aanalyze_notice)
+    db.save_notice = timer.wrap("db_save", db.save_notice)
+    db.save_notices = timer.wrap("db_save_batch", db.save_notices)
+    crawler.discord_web_hook = timer.wrap("discord_web_hook", crawler.discord_web_hook)
+    crawler.crawler = timer.wrap("crawler()", crawler.crawler)
+    crawler.crawler_async = timer.wrap_async("crawler_async()", crawler.crawler_async)
+
+
+def run_benchmark(boards: int = 4, notices: int = 20, llm_latency: float = 0.3, site_latency: float = 0.02,
+                  webhooks: int = 20, webhook_latency: float = 0.01, webhook_workers: int = 16,
+                  mode: str = "sync", rpm: float = OPENAI_RPM, tpm: float = OPENAI_TPM) -> dict:
+    timer = StageTimer()
+    board_list = list(enumerate(crawler.CRAWLING_URL_LIST[:boards]))
+    site = FixtureSite(board_list, notices, latency=site_latency, timer=timer)
+    db = SQLiteManager()
+
+    with MockWebhookServer(latency=webhook_latency) as server:
+        for i in range(1, webhooks + 1):
+            db.add_webhook(server.webhook_url(i))
+        install_stand_ins(site, db, timer, llm_latency, webhook_workers, rpm=rpm, tpm=tpm)
+
+        started = time.perf_counter()
+        crawler.prepare_seen_index()
+        if mode == "async":
+            limiter = crawler.HostLimiter()
+
+            async def run_all():
+                return await asyncio.gather(*(crawler.crawler_async(url, 1, category, limiter) for category, url in board_list))
+
+            results = asyncio.run(run_all())
+        else:
+            results = [crawler.crawler(url, 1, category, Deadline(0)) for category, url in board_list]
+        elapsed = time.perf_counter() - started
+        delivered = sum(len(messages) for messages in server.received.values())
+
+    saved = sum(len(rows) for rows in db.iter_notice_hashes())
+    return {
+        "mode": mode,
+        "boards": len(board_list),
+        "notices": sum(len(r) for r in results),
+        "saved": saved,
+        "webhook_messages": delivered,
+        "elapsed_s": elapsed,
+        "notices_per_s": saved / elapsed if elapsed else 0.0,
+        "stages": timer.summary(),
+    }
+
+
+def print_report(report: dict):
+    print(f"📊 mode={report['mode']} 게시판 {report['boards']}개, 새 공지 {report['saved']}건 저장, "
+          f"webhook 메시지 {report['webhook_messages']}건, {report['elapsed_s']:.2f}s "
+          f"({report['notices_per_s']:.2f} notices/s)")
+    print(f"{'stage':20s} {'count':>6s} {'total(s)':>9s} {'per s':>9s} {'p50(ms)':>9s} {'p90(ms)':>9s} {'p99(ms)':>9s} {'max(ms)':>9s}")
+    for stage, s in sorted(report["stages"].items(), key=lambda kv: -kv[1]["total_s"]):
+        print(f"{stage:20s} {s['count']:6d} {s['total_s']:9.3f} {s['per_s']:9.1f} "
+              f"{s['p50_ms']:9.2f} {s['p90_ms']:9.2f} {s['p99_ms']:9.2f} {s['max_ms']:9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 크롤러 end-to-end 벤치마크")
+    parser.add_argument("--mode", choices=["sync", "async"], default="sync")
+    parser.add_argument("--boards", type=int, default=len(crawler.CRAWLING_URL_LIST))
+    parser.add_argument("--notices", type=int, default=20, help="게시판당 새 글 수 (CRAWL_MAX_PAGES × 10 이하)")
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--site-latency", type=float, default=0.02)
+    parser.add_argument("--webhooks", type=int, default=20)
+    parser.add_argument("--webhook-latency", type=float, default=0.01)
+    parser.add_argument("--webhook-workers", type=int, default=16)
+    parser.add_argument("--rpm", type=float, default=OPENAI_RPM, help="LLM 요청 제한 (기본: OPENAI_RPM)")
+    parser.add_argument("--tpm", type=float, default=OPENAI_TPM, help="LLM 토큰 제한 (기본: OPENAI_TPM)")
+    parser.add_argument("--json", help="결과를 JSON으로 저장할 경로")
+    args = parser.parse_args()
+
+    report = run_benchmark(
+        boards=args.boards, notices=args.notices, llm_latency=args.llm_latency,
+        site_latency=args.site_latency, webhooks=args.webhooks, webhook_latency=args.webhook_latency,
+        webhook_workers=args.webhook_workers, mode=args.mode, rpm=args.rpm, tpm=args.tpm,
+    )
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""
+상주(daemon) 모드.
+
+    python cli.py daemon
+    python cli.py daemon --health-port 8080 --min-interval 300 --max-interval 21600
+
+cron으로 매번 새 프로세스를 띄우는 대신, 클라이언트(HTTP 세션, LLM, DB, 로컬 인덱스)를 유지한 채
+게시판마다 각자의 주기로 목록 페이지를 확인한다. 주기는 게시판(category)별로 관측한 게시 빈도로 정한다.
+글이 자주 올라오는 게시판은 자주, 조용한 게시판은 드물게 확인한다.
+
+SIGTERM/SIGINT를 받으면 새 LLM 작업은 시작하지 않고 진행 중인 확인만 마친 뒤 종료한다.
+끝내지 못한 글은 작업 큐에 남아 다음에 시작할 때 이어서 처리된다.
+
+    GET /healthz  게시판별 주기/게시 빈도/마지막 확인 시각 (멈춘 게시판이 있거나 종료 중이면 503)
+    GET /metrics  마지막 확인의 Prometheus 지표와 게시판별 주기
+"""
+import argparse
+import json
+import os
+import signal
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+import crawler
+from job_queue import Deadline
+from metrics import PROM_PREFIX, metrics, write_run_summary
+
+DAEMON_STATE_PATH = os.getenv("DAEMON_STATE_PATH", ".cache/daemon.sqlite3")
+DAEMON_HEALTH_PORT = int(os.getenv("DAEMON_HEALTH_PORT", "8080"))  # 0이면 health 서버를 띄우지 않음
+DAEMON_MIN_INTERVAL_SECONDS = float(os.getenv("DAEMON_MIN_INTERVAL_SECONDS", "300"))
+DAEMON_MAX_INTERVAL_SECONDS = float(os.getenv("DAEMON_MAX_INTERVAL_SECONDS", "21600"))
+# 게시 빈도 기록이 없는 게시판의 첫 주기
+DAEMON_INITIAL_INTERVAL_SECONDS = float(os.getenv("DAEMON_INITIAL_INTERVAL_SECONDS", "1800"))
+# 한 번 확인할 때 평균적으로 찾고 싶은 새 글 수. 작을수록 자주 확인한다.
+DAEMON_TARGET_POSTS_PER_POLL = float(os.getenv("DAEMON_TARGET_POSTS_PER_POLL", "0.5"))
+# 게시 빈도 추정의 반감기(시간). 오래된 관측일수록 가중치가 줄어든다.
+DAEMON_RATE_HALF_LIFE_HOURS = float(os.getenv("DAEMON_RATE_HALF_LIFE_HOURS", "168"))
+# webhook 스냅샷 갱신, 작업 큐 정리 주기
+DAEMON_REFRESH_SECONDS = float(os.getenv("DAEMON_REFRESH_SECONDS", "600"))
+# 예정 시각보다 이만큼 넘게 확인하지 못한 게시판이 있으면 /healthz가 503을 돌려준다.
+DAEMON_STALL_SECONDS = float(os.getenv("DAEMON_STALL_SECONDS", "900"))
+
+
+class ShutdownDeadline(Deadline):
+    """종료 요청을 받으면 만료되는 Deadline. 진행 중인 작업은 끝내고 새 LLM 작업은 시작하지 않는다."""
+
+    def __init__(self, stopping: threading.Event):
+        super().__init__(budget=0)
+        self.stopping = stopping
+
+    def remaining(self) -> float:
+        return 0.0 if self.stopping.is_set() else super().remaining()
+
+
+@dataclass
+class BoardState:
+    """
+    게시판 하나의 확인 주기와 게시 빈도.
+    posts/hours는 반감기만큼 지날 때마다 절반으로 줄어드는 가중 합이고, 게시 빈도는 posts / hours(시간당 글 수)이다.
+    """
+    category: int
+    url: str
+    posts: float = 0.0
+    hours: float = 0.0
+    last_polled_at: Optional[float] = None
+    next_due: float = 0.0
+    interval: float = DAEMON_INITIAL_INTERVAL_SECONDS
+    last_new: int = 0
+    last_error: Optional[str] = None
+    consecutive_errors: int = 0
+
+    @property
+    def rate_per_hour(self) -> Optional[float]:
+        return self.posts / self.hours if self.hours > 0 else None
+
+    def observe(self, new_posts: int, now: float, half_life_hours: float = DAEMON_RATE_HALF_LIFE_HOURS):
+        """확인 한 번의 결과(새 글 수)를 게시 빈도에 반영"""
+        if self.last_polled_at is not None:
+            elapsed = max(0.0, now - self.last_polled_at) / 3600
+            decay = 0.5 ** (elapsed / half_life_hours)
+            self.posts = self.posts * decay + new_posts
+            self.hours = self.hours * decay + elapsed
+        self.last_polled_at = now
+        self.last_new = new_posts
+        self.last_error = None
+        self.consecutive_errors = 0
+
+
+def poll_interval(rate_per_hour: Optional[float],
+                  target_posts: float = DAEMON_TARGET_POSTS_PER_POLL,
+                  min_interval: float = DAEMON_MIN_INTERVAL_SECONDS,
+                  max_interval: float = DAEMON_MAX_INTERVAL_SECONDS,
+                  initial_interval: float = DAEMON_INITIAL_INTERVAL_SECONDS) -> float:
+    """확인 한 번에 평균 target_posts개의 새 글이 쌓이도록 주기(초)를 정하고 [min, max]로 제한"""
+    if rate_per_hour is None:
+        interval = initial_interval
+    elif rate_per_hour <= 0:
+        interval = max_interval
+    else:
+        interval = target_posts / rate_per_hour * 3600
+    return min(max_interval, max(min_interval, interval))
+
+
+class PollStats:
+    """게시판별 게시 빈도(가중 합)와 마지막 확인 시각을 저장하는 로컬 SQLite 저장소"""
+
+    def __init__(self, path: str = DAEMON_STATE_PATH):
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS board_polls (
+                category INTEGER PRIMARY KEY,
+                posts REAL NOT NULL,
+                hours REAL NOT NULL,
+                last_polled_at REAL
+            )
+        """)
+        self.conn.commit()
+
+    def load(self, board: BoardState):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT posts, hours, last_polled_at FROM board_polls WHERE category = ?", (board.category,)
+            ).fetchone()
+        if row:
+            board.posts, board.hours, board.last_polled_at = row
+
+    def save(self, board: BoardState):
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO board_polls (category, posts, hours, last_polled_at) VALUES (?, ?, ?, ?)",
+                (board.category, board.posts, board.hours, board.last_polled_at),
+            )
+            self.conn.commit()
+
+
+class Daemon:
+    def __init__(self, boards: List[tuple], stats: Optional[PollStats] = None,
+                 health_port: int = DAEMON_HEALTH_PORT,
+                 min_interval: float = DAEMON_MIN_INTERVAL_SECONDS,
+                 max_interval: float = DAEMON_MAX_INTERVAL_SECONDS,
+                 clock=time.time):
+        """boards: (category, url) 목록"""
+        self.stats = stats or PollStats()
+        self.health_port = health_port
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.clock = clock
+        self.stopping = threading.Event()
+        self.started_at = clock()
+        self._refreshed_at: Optional[float] = None
+        self._health: Optional[ThreadingHTTPServer] = None
+
+        now = clock()
+        self.boards = [BoardState(category, url) for category, url in boards]
+        for board in self.boards:
+            self.stats.load(board)
+            board.interval = self._interval(board)
+            # 마지막 확인 시각이 남아 있으면 재시작해도 원래 일정대로, 없으면 바로 확인한다.
+            board.next_due = (board.last_polled_at + board.interval) if board.last_polled_at else now
+
+    def _interval(self, board: BoardState) -> float:
+        return poll_interval(board.rate_per_hour, min_interval=self.min_interval, max_interval=self.max_interval)
+
+    def request_stop(self, *_):
+        if not self.stopping.is_set():
+            print("🛑 종료 요청을 받았습니다. 진행 중인 확인을 마치고 종료합니다.", flush=True)
+        self.stopping.set()
+
+    # --- 확인 ---------------------------------------------------------------
+
+    def housekeeping(self):
+        """webhook 스냅샷을 다시 읽고 오래된 작업을 정리 (DAEMON_REFRESH_SECONDS마다)"""
+        now = self.clock()
+        if self._refreshed_at is not None and now - self._refreshed_at < DAEMON_REFRESH_SECONDS:
+            return
+        self._refreshed_at = now
+        crawler.reset_webhook_snapshot()
+        crawler.job_queue.purge()
+
+    def poll(self, board: BoardState) -> List[dict]:
+        """게시판 하나를 확인하고 게시 빈도와 다음 확인 시각을 갱신"""
+        metrics.reset()
+        deadline = ShutdownDeadline(self.stopping)
+        try:
+            with metrics.span("daemon.poll", category=board.category):
+                notices = crawler.resume_jobs(deadline)
+                notices += crawler.crawler(board.url, 1, board.category, deadline)
+        except Exception as e:
+            board.consecutive_errors += 1
+            board.last_error = str(e)
+            # 같은 오류가 이어지면 간격을 두 배씩 늘리고, 관리자에게는 처음 한 번만 알린다.
+            board.next_due = self.clock() + min(self.max_interval, self.min_interval * 2 ** board.consecutive_errors)
+            print(f"🔴 [{board.url}] 확인 실패 ({board.consecutive_errors}회 연속): {e}", flush=True)
+            if board.consecutive_errors == 1:
+                crawler.discord_web_hook_admin(f"[{board.url}] {str(e)}")
+            write_run_summary()  # 실패한 확인의 지표도 남긴다.
+            return []
+
+        if crawler.DISCORD_DIGEST:
+            crawler.notify_saved_jobs(extra=[notice for notice in notices if notice.get('is_update')], digest=True)
+
+        now = self.clock()
+        # 이전에 남은 작업이 이어서 처리된 경우도 있으므로 이 게시판의 새 글만 센다.
+        new_posts = sum(1 for notice in notices if not notice.get('is_update') and notice.get('category') == board.category)
+        board.observe(new_posts, now)
+        board.interval = self._interval(board)
+        board.next_due = now + board.interval
+        self.stats.save(board)
+
+        rate = board.rate_per_hour
+        print(f"🕒 [{board.url}] 새 글 {board.last_new}건, 게시 빈도 {rate or 0:.3f}건/시간, "
+              f"다음 확인까지 {board.interval / 60:.0f}분", flush=True)
+        write_run_summary()
+        return notices
+
+    def run(self):
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, self.request_stop)
+            signal.signal(signal.SIGINT, self.request_stop)
+        if self.health_port:
+            self.start_health_server(self.health_port)
+
+        print(f"🚀 daemon 모드 시작: 게시판 {len(self.boards)}개", flush=True)
+        try:
+            crawler.prepare_seen_index()
+            while not self.stopping.is_set():
+                self.housekeeping()
+                board = min(self.boards, key=lambda b: b.next_due)
+                wait = board.next_due - self.clock()
+                if wait > 0:
+                    # 다음 예정 시각까지 기다리되 housekeeping 주기를 넘기지 않는다.
+                    if self.stopping.wait(min(wait, DAEMON_REFRESH_SECONDS)):
+                        break
+                    continue
+                self.poll(board)
+        finally:
+            self.stop_health_server()
+            print("👋 daemon 모드를 종료합니다.", flush=True)
+
+    # --- health -------------------------------------------------------------
+
+    def health(self) -> dict:
+        now = self.clock()
+        stalled = [b.category for b in self.boards if now - b.next_due > DAEMON_STALL_SECONDS]
+        status = "stopping" if self.stopping.is_set() else ("stalled" if stalled else "ok")
+        return {
+            "status": status,
+            "started_at": self.started_at,
+            "uptime_s": round(now - self.started_at, 3),
+            "stalled": stalled,
+            "boards": [
+                dict(asdict(board), rate_per_hour=board.rate_per_hour, due_in_s=round(board.next_due - now, 3))
+                for board in self.boards
+            ],
+        }
+
+    def to_prometheus(self) -> str:
+        lines = [
+            f"# HELP {PROM_PREFIX}_poll_interval_seconds Current adaptive poll interval per board.",
+            f"# TYPE {PROM_PREFIX}_poll_interval_seconds gauge",
+        ]
+        lines += [f'{PROM_PREFIX}_poll_interval_seconds{{category="{b.category}"}} {b.interval:.3f}' for b in self.boards]
+        lines += [
+            f"# HELP {PROM_PREFIX}_posting_rate_per_hour Estimated new notices per hour per board.",
+            f"# TYPE {PROM_PREFIX}_posting_rate_per_hour gauge",
+        ]
+        lines += [f'{PROM_PREFIX}_posting_rate_per_hour{{category="{b.category}"}} {b.rate_per_hour or 0:.6f}' for b in self.boards]
+        return metrics.to_prometheus() + "\n".join(lines) + "\n"
+
+    def start_health_server(self, port: int, host: str = "0.0.0.0"):
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") == "/healthz":
+                    health = daemon.health()
+                    body = json.dumps(health, ensure_ascii=False).encode()
+                    status, content_type = (200 if health["status"] == "ok" else 503), "application/json"
+                elif self.path.rstrip("/") == "/metrics":
+                    body = daemon.to_prometheus().encode()
+                    status, content_type = 200, "text/plain; version=0.0.4"
+                else:
+                    body, status, content_type = b"not found", 404, "text/plain"
+
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._health = ThreadingHTTPServer((host, port), Handler)
+        self._health.daemon_threads = True
+        threading.Thread(target=self._health.serve_forever, daemon=True).start()
+        print(f"🩺 health 서버: http://{host}:{self._health.server_address[1]}/healthz", flush=True)
+
+    def stop_health_server(self):
+        if self._health is not None:
+            self._health.shutdown()
+            self._health.server_close()
+            self._health = None
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--health-port", type=int, default=DAEMON_HEALTH_PORT, help="health 서버 포트 (0이면 사용 안 함)")
+    parser.add_argument("--min-interval", type=float, default=DAEMON_MIN_INTERVAL_SECONDS, help="최소 확인 주기(초)")
+    parser.add_argument("--max-interval", type=float, default=DAEMON_MAX_INTERVAL_SECONDS, help="최대 확인 주기(초)")
+    parser.add_argument("--board", type=int, action="append", help="확인할 게시판 category (여러 번 지정 가능)")
+
+
+def run(args: argparse.Namespace):
+    boards = [
+        (category, url) for category, url in enumerate(crawler.CRAWLING_URL_LIST)
+        if args.board is None or category in args.board
+    ]
+    Daemon(boards, health_port=args.health_port, min_interval=args.min_interval, max_interval=args.max_interval).run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="게시판별 적응형 주기로 확인하는 상주 크롤러")
+    add_arguments(parser)
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,73 @@
-from sqlite3 import Date
 from postgrest import CountMethod
-from gpt_client import ScheduleItem
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
-from models import Base, Notice, NoticeImage, NoticeFile, Schedule, Webhook
-import hashlib
-from typing import Optional, List, cast
+from schemas import ScheduleItem
+from board import Attachment
+from seen_index import get_title_hash
+import json
+from typing import Optional, List, NamedTuple, cast
 import os
 from dotenv import load_dotenv
 from typing import List, Dict
 from datetime import date, datetime
 from supabase import create_client, Client
+from postgrest.exceptions import APIError
 
 load_dotenv()
 
+
+# PostgREST: 호출한 함수가 존재하지 않을 때의 에러 코드
+MISSING_FUNCTION_CODE = "PGRST202"
+
+# 0이면 RPC 대신 테이블별 insert로 저장
+SUPABASE_SAVE_RPC = os.getenv("SUPABASE_SAVE_RPC", "1") != "0"
+
+SQL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sql")
+
+
+def schedule_row(s) -> dict:
+    """ScheduleItem 또는 dict 일정을 schedules 테이블 행(notice_id 제외)으로 변환"""
+    if isinstance(s, dict):
+        s = ScheduleItem(**s)
+    return {
+        "title": s.title,
+        "description": s.description,
+        "begin": s.begin,
+        "end": s.end,
+        "is_ignored": False,
+    }
+
+
+def make_save_notice_params(notice_data: dict, title_hash: str,
+                            image_urls: Optional[List[str]] = None,
+                            files: Optional[List[Attachment]] = None,
+                            ai_schedules: Optional[List[ScheduleItem]] = None) -> dict:
+    """save_notice_atomic 함수의 인자(jsonb) 구성"""
+    return {
+        "p_notice": {
+            "title": notice_data['title'],
+            "content": notice_data['content'],
+            "writer": notice_data.get('writer'),
+            "writer_email": notice_data.get('writer_email'),
+            "publish_date": cast(date, notice_data.get('publish_date')).isoformat() if notice_data.get('publish_date') else None,
+            "is_notice": notice_data.get('is_notice', False),
+            "ai_summary_title": notice_data.get('ai_summary_title'),
+            "ai_summary_content": notice_data.get('ai_summary_content'),
+            "markdown_content": notice_data.get('markdown_content'),
+            "original_url": notice_data['original_url'],
+            "ignore_flag": notice_data.get('ignore_flag', False),
+            "title_hash": title_hash,
+            "category": notice_data['category'],
+        },
+        "p_schedules": [schedule_row(s) for s in ai_schedules or []],
+        "p_images": [{"url": url} for url in image_urls or []],
+        "p_files": [{"filename": f.file_name, "url": f.download_link} for f in files or []],
+    }
+
+
+class WebhookTarget(NamedTuple):
+    """전송에 필요한 webhook의 id, url만 담는 가벼운 레코드"""
+    id: int
+    url: str
+
 # class DatabaseManager:
 #     def __init__(self, db_url: str | None = None):
 #         if not db_url:
@@ -211,20 +265,67 @@ class SupabaseManager:
         assert SUPABASE_KEY is not None
 
         self.client: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+        self.use_rpc = SUPABASE_SAVE_RPC
+        # 배포되지 않은(PGRST202) 함수 이름. 함수마다 따로 기록해, 하나가 없다고 다른 RPC까지 끄지 않는다.
+        self.missing_rpcs: set = set()
+
+    def _rpc_enabled(self, name: str) -> bool:
+        return self.use_rpc and name not in self.missing_rpcs
+
+    def _rpc_missing(self, name: str, e: APIError, fallback: str, sql_file: str):
+        """PGRST202가 아니면 다시 raise하고, 맞으면 이 함수만 이후 호출에서 건너뛰도록 기록"""
+        if e.code != MISSING_FUNCTION_CODE:
+            raise e
+        print(f"⚠️ {name} 함수가 없어 {fallback} 방식으로 처리합니다. (sql/{sql_file} 적용 필요)")
+        self.missing_rpcs.add(name)
 
     def get_title_hash(self, title: str) -> str:
-        return hashlib.sha256(title.encode('utf-8')).hexdigest()
+        return get_title_hash(title)
 
     def notice_exists(self, title: str) -> bool:
         title_hash = self.get_title_hash(title)
         response = self.client.table("notice").select("id").eq("title_hash", title_hash).limit(1).execute()
         return bool(response.data)
 
+    def get_existing_title_hashes(self, title_hashes: List[str]) -> set:
+        """주어진 title_hash 중 이미 저장된 것들을 한 번의 in_ 쿼리로 조회"""
+        if not title_hashes:
+            return set()
+        response = self.client.table("notice").select("title_hash").in_("title_hash", list(set(title_hashes))).execute()
+        return {row["title_hash"] for row in response.data}
+
+    def get_notice_by_title_hash(self, title_hash: str, columns: str = "id,content") -> Optional[dict]:
+        response = self.client.table("notice").select(columns).eq("title_hash", title_hash).limit(1).execute()
+        return dict(response.data[0]) if response.data else None
+
+    def iter_notice_hashes(self, batch_size: int = 1000):
+        """notice 테이블의 (id, title_hash, category)를 id 커서 기반으로 배치 단위 순회"""
+        return self.iter_notices("id,title_hash,category", batch_size=batch_size)
+
+    def iter_notices(self, columns: str, batch_size: int = 1000):
+        """notice 테이블의 지정한 컬럼(id 포함)을 id 커서 기반으로 배치 단위 순회"""
+        last_id = 0
+        while True:
+            response = (
+                self.client.table("notice")
+                .select(columns)
+                .gt("id", last_id)
+                .order("id")
+                .limit(batch_size)
+                .execute()
+            )
+            if not response.data:
+                break
+            yield response.data
+            last_id = response.data[-1]["id"]
+
     def get_active_webhooks(self) -> list:
+        from models import Webhook  # sqlalchemy 모델은 이 메서드들에서만 쓰므로 필요할 때 import한다.
         response = self.client.table("webhooks").select("*").eq("is_active", True).execute()
         return [Webhook(**row) for row in response.data]
 
     def get_active_webhooks_batch(self, batch_size: int = 50, offset: int = 0) -> list:
+        from models import Webhook
         response = (
             self.client.table("webhooks")
             .select("*")
@@ -234,6 +335,28 @@ class SupabaseManager:
         )
         return [Webhook(**row) for row in response.data]
 
+    def get_active_webhooks_snapshot(self, batch_size: int = 1000) -> List[WebhookTarget]:
+        """활성화된 webhook 전체를 id 커서(keyset) 페이지네이션으로 한 번에 읽어온다."""
+        snapshot: List[WebhookTarget] = []
+        last_id = 0
+        while True:
+            response = (
+                self.client.table("webhooks")
+                .select("id,url")
+                .eq("is_active", True)
+                .gt("id", last_id)
+                .order("id")
+                .limit(batch_size)
+                .execute()
+            )
+            if not response.data:
+                break
+            snapshot.extend(WebhookTarget(row["id"], row["url"]) for row in response.data)
+            if len(response.data) < batch_size:
+                break
+            last_id = response.data[-1]["id"]
+        return snapshot
+
     def get_active_webhooks_count(self) -> int:
         response = self.client.table("webhooks").select("id", count=CountMethod.exact).eq("is_active", True).execute()
         return response.count or 0
@@ -251,34 +374,147 @@ class SupabaseManager:
             print(f"⚠️ Webhook ID {webhook_id}를 찾을 수 없습니다.")
 
     def save_schedules(self, notice_title: str, schedules: list):
+        """공지사항의 일정을 모두 새 일정으로 교체 (notice 조회 1번 + 교체 1번)"""
         title_hash = self.get_title_hash(notice_title)
         notice_resp = self.client.table("notice").select("id").eq("title_hash", title_hash).limit(1).execute()
         if not notice_resp.data:
             print(f"⚠️ 공지사항을 찾을 수 없습니다: {notice_title}")
             return
         notice_id = notice_resp.data[0]["id"]
-        # 기존 일정 삭제
-        old_scheds = self.client.table("schedules").select("id").eq("notice_id", notice_id).execute()
-        for sched in old_scheds.data:
-            self.client.table("schedules").delete().eq("id", sched["id"]).execute()
-        # 새 일정 추가
-        from datetime import datetime
-        for sched_data in schedules:
-            self.client.table("schedules").insert({
-                "title": sched_data["title"],
-                "description": sched_data.get("description"),
-                "begin": sched_data["begin"],
-                "end": sched_data["end"],
-                "notice_id": notice_id,
-                "created_at": datetime.now().isoformat()
-            }).execute()
+
+        self.replace_schedules({notice_id: schedules})
         print(f"✅ '{notice_title}'에 새로운 일정 {len(schedules)}개를 저장했습니다.")
 
+    def save_schedules_bulk(self, schedules_by_notice_id: Dict[int, list]) -> int:
+        """여러 공지사항의 일정을 notice_id 기준으로 한꺼번에 교체하고 교체한 공지 수를 반환 (postgres_manager.PostgresManager와 같은 형태)"""
+        self.replace_schedules(schedules_by_notice_id)
+        if schedules_by_notice_id:
+            print(f"✅ 공지사항 {len(schedules_by_notice_id)}건의 일정을 교체했습니다.")
+        return len(schedules_by_notice_id)
+
+    def replace_schedules(self, schedules_by_notice_id: Dict[int, list]):
+        """
+        notice_id별 일정을 교체. replace_schedules_bulk RPC로 한 트랜잭션에 처리하고,
+        함수가 없으면 notice_id 기준 delete 1번 + 일괄 insert 1번으로 처리한다.
+        """
+        if not schedules_by_notice_id:
+            return
+
+        if self._rpc_enabled("replace_schedules_bulk"):
+            items = [
+                {"notice_id": notice_id, "schedules": [schedule_row(s) for s in schedules]}
+                for notice_id, schedules in schedules_by_notice_id.items()
+            ]
+            try:
+                self.client.rpc("replace_schedules_bulk", {"p_items": items}).execute()
+                return
+            except APIError as e:
+                self._rpc_missing("replace_schedules_bulk", e, "delete + insert", "replace_schedules.sql")
+
+        self.client.table("schedules").delete().in_("notice_id", list(schedules_by_notice_id)).execute()
+
+        rows = [
+            dict(schedule_row(s), notice_id=notice_id)
+            for notice_id, schedules in schedules_by_notice_id.items()
+            for s in schedules
+        ]
+        if rows:
+            self.client.table("schedules").insert(rows).execute()
+
     def save_notice(self, notice_data: dict,
                     image_urls: Optional[List[str]] = None,
-                    files: Optional[List[Dict[str, str]]] = None,
+                    files: Optional[List[Attachment]] = None,
+                    ai_schedules: Optional[List[ScheduleItem]] = None) -> dict:
+        """공지사항 저장 (항상 dict 리턴). save_notice_atomic RPC 한 번으로 한 트랜잭션에 저장한다."""
+        if self._rpc_enabled("save_notice_atomic"):
+            try:
+                params = make_save_notice_params(notice_data, self.get_title_hash(notice_data['title']), image_urls, files, ai_schedules)
+                result = self.client.rpc("save_notice_atomic", params).execute()
+                print(f"✅ 공지사항 저장 완료: {notice_data['title'][:50]}...")
+                return dict(cast(dict, result.data))
+            except APIError as e:
+                if e.code != MISSING_FUNCTION_CODE:
+                    print(f"❌ 공지사항 저장 실패: {e}")
+                self._rpc_missing("save_notice_atomic", e, "개별 insert", "save_notice.sql")
+
+        return self._save_notice_legacy(notice_data, image_urls=image_urls, files=files, ai_schedules=ai_schedules)
+
+    def save_notices(self, entries: List[dict]) -> List[dict]:
+        """
+        여러 공지사항을 save_notices_bulk RPC 한 번, 한 트랜잭션으로 저장.
+        entries의 각 항목은 save_notice의 인자(notice_data, image_urls, files, ai_schedules)를 담은 dict
+        """
+        if not entries:
+            return []
+
+        if self._rpc_enabled("save_notices_bulk"):
+            items = []
+            for entry in entries:
+                params = make_save_notice_params(
+                    entry['notice_data'], self.get_title_hash(entry['notice_data']['title']),
+                    entry.get('image_urls'), entry.get('files'), entry.get('ai_schedules'),
+                )
+                items.append({
+                    "notice": params["p_notice"],
+                    "schedules": params["p_schedules"],
+                    "images": params["p_images"],
+                    "files": params["p_files"],
+                })
+            try:
+                result = self.client.rpc("save_notices_bulk", {"p_items": items}).execute()
+                print(f"✅ 공지사항 {len(entries)}건 일괄 저장 완료")
+                return [dict(row) for row in cast(list, result.data)]
+            except APIError as e:
+                if e.code != MISSING_FUNCTION_CODE:
+                    print(f"❌ 공지사항 일괄 저장 실패: {e}")
+                self._rpc_missing("save_notices_bulk", e, "개별 저장", "save_notice.sql")
+
+        return [self.save_notice(**entry) for entry in entries]
+
+    def update_notice(self, notice_id: int, notice_data: dict,
+                      image_urls: Optional[List[str]] = None,
+                      files: Optional[List[Attachment]] = None,
+                      ai_schedules: Optional[List[ScheduleItem]] = None) -> dict:
+        """
+        수정된 공지사항의 내용/요약과 일정/이미지/파일을 교체 (update_notice_atomic RPC 한 번).
+        original_url, category는 처음 저장한 값을 유지한다.
+        """
+        params = make_save_notice_params(notice_data, self.get_title_hash(notice_data['title']), image_urls, files, ai_schedules)
+
+        if self._rpc_enabled("update_notice_atomic"):
+            try:
+                result = self.client.rpc("update_notice_atomic", dict(params, p_notice_id=notice_id)).execute()
+                print(f"✅ 공지사항 수정 반영 완료: {notice_data['title'][:50]}...")
+                return dict(cast(dict, result.data))
+            except APIError as e:
+                if e.code != MISSING_FUNCTION_CODE:
+                    print(f"❌ 공지사항 수정 반영 실패: {e}")
+                self._rpc_missing("update_notice_atomic", e, "테이블별 update/delete/insert", "update_notice.sql")
+
+        notice_payload = {
+            key: value for key, value in params["p_notice"].items()
+            if key not in ("original_url", "category")
+        }
+        notice_result = self.client.table("notice").update(notice_payload).eq("id", notice_id).execute()
+        if not notice_result.data:
+            raise ValueError(f"notice {notice_id}를 찾을 수 없습니다.")
+
+        self.replace_schedules({notice_id: ai_schedules or []})
+        self.client.table("notice_images").delete().eq("notice_id", notice_id).execute()
+        if params["p_images"]:
+            self.client.table("notice_images").insert([dict(i, notice_id=notice_id) for i in params["p_images"]]).execute()
+        self.client.table("notice_files").delete().eq("notice_id", notice_id).execute()
+        if params["p_files"]:
+            self.client.table("notice_files").insert([dict(f, notice_id=notice_id) for f in params["p_files"]]).execute()
+
+        print(f"✅ 공지사항 수정 반영 완료: {notice_data['title'][:50]}...")
+        return dict(notice_result.data[0])
+
+    def _save_notice_legacy(self, notice_data: dict,
+                    image_urls: Optional[List[str]] = None,
+                    files: Optional[List[Attachment]] = None,
                     ai_schedules: Optional[List[ScheduleItem]] = None) -> dict:
-        """공지사항 저장 (항상 dict 리턴)"""
+        """테이블별 insert 4번으로 저장하고 실패 시 수동 롤백 (save_notice_atomic 함수가 없을 때 사용)"""
         try:
             # 공지사항 먼저 insert
             title_hash = self.get_title_hash(notice_data['title'])
@@ -306,16 +542,8 @@ class SupabaseManager:
 
             # 일정 insert
             if ai_schedules:
-                schedule_payload = []
-                for s in ai_schedules:
-                    schedule_payload.append({
-                        "title": s.title,
-                        "description": s.description,
-                        "begin": s.begin,
-                        "end": s.end,
-                        "notice_id": notice_id,
-                        "is_ignored": False  # NOT NULL 컬럼 기본값 추가
-                    })
+                # 작업 큐에서 이어서 처리한 작업의 일정은 dict이므로 schedule_row로 변환
+                schedule_payload = [dict(schedule_row(s), notice_id=notice_id) for s in ai_schedules]
                 schedules_result = self.client.table("schedules").insert(schedule_payload).execute()
                 result_dict["schedules"] = [dict(row) for row in getattr(schedules_result, 'data', [])]
 
@@ -328,8 +556,8 @@ class SupabaseManager:
             # 파일 insert
             if files:
                 file_payload = [{
-                    "filename": f["file_name"],
-                    "url": f["download_link"],
+                    "filename": f.file_name,
+                    "url": f.download_link,
                     "notice_id": notice_id
                 } for f in files]
                 files_result = self.client.table("notice_files").insert(file_payload).execute()
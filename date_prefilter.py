@@ -0,0 +1,88 @@
+"""
+공지 본문에서 일정이 될 만한 한국어 날짜/기간 표현을 찾는 규칙 기반 pre-pass.
+
+    find_date_candidates("신청 기간: 2024. 9. 2.(월) ~ 9. 6.(금) 18:00까지, 서류는 상시 접수")
+    # ['2024. 9. 2.(월) ~ 9. 6.(금) 18:00까지', '상시']
+    find_date_candidates("신청: 9/2 ~ 9/6, 보고서는 9.30까지")
+    # ['9/2 ~ 9/6', '9.30까지']
+
+GPTClient는 찾은 후보를 프롬프트에 힌트로 넣고, 후보가 없는 공지는 일정 추출을 건너뛴다 (SCHEDULE_PREFILTER_SKIP=0이면 힌트만 넣는다).
+놓친 날짜는 곧 놓친 일정이므로 정밀도보다 recall을 우선한다.
+recall은 `python date_prefilter_bench.py` (fixtures/dates/labeled.jsonl)로 확인한다.
+"""
+import re
+from typing import List
+
+_WEEKDAY = r"(?:\s*\(\s*[월화수목금토일](?:요일)?\s*\))"
+_TIME = r"(?:\s*(?:(?:오전|오후)\s*)?\d{1,2}\s*(?::\s*\d{2}|시(?:\s*\d{1,2}\s*분|\s*반)?))"
+
+# 2024. 9. 2. / 2024-09-02 / 2024/9/2 / 24.09.02
+_NUMERIC_DATE = r"(?<![\d.])(?:\d{4}|\d{2})\s*[./-]\s*\d{1,2}\s*[./-]\s*\d{1,2}(?:\s*\.)?(?![\d])"
+# 9. 6. / 9.6.(금) / 9/6(금)  (연도 없는 형식은 끝의 마침표나 요일이 있어야 날짜로 본다)
+_SHORT_DATE = (
+    r"(?<![\d.])\d{1,2}\s*\.\s*\d{1,2}\s*\.(?!\s*\d)"
+    r"|(?<![\d./])\d{1,2}\s*[./]\s*\d{1,2}(?=" + _WEEKDAY + r")"
+)
+# 9/2 / 9.30  (마침표나 요일이 없는 형식. 소수나 분수와 구별되지 않으므로 기간(~)이나 까지/부터와 함께일 때만 날짜로 본다)
+_BARE_DATE = r"(?<![\d./])(?:1[0-2]|0?[1-9])\s*[./]\s*(?:3[01]|[12]\d|0?[1-9])(?!\d|\s*[./]\s*\d)"
+_RANGE_MARK = r"[~∼～〜]"
+# 2024년 9월 30일 / 9월 30일 / 9월 말
+_KOREAN_DATE = (
+    r"(?:\d{2,4}\s*년\s*)?\d{1,2}\s*월\s*\d{1,2}\s*일"
+    r"|(?:\d{2,4}\s*년\s*)?\d{1,2}\s*월\s*(?:초순|중순|하순|초|중|말)(?![가-힣])"
+)
+# 다음 주 금요일 / 이번주 월요일까지 / 다음 달 15일 / 이번 달 말 / 내일 18시까지  (게시일 기준 상대 날짜)
+_RELATIVE_DATE = (
+    r"(?:다음|이번|금|차)\s*주\s*[월화수목금토일]요일"
+    r"|(?:다음|이번)\s*달\s*(?:\d{1,2}\s*일|(?:초순|중순|하순|초|중|말)(?![가-힣]))"
+    r"|(?:오늘|내일|모레)(?=" + _TIME + r"|\s*까지)"
+)
+# 마감 기한 없이 진행되는 일정
+_OPEN_ENDED = r"상시|연중|수시\s*(?:접수|모집|신청)|(?:예산|재원|정원)\s*(?:소진|마감)\s*시"
+
+_BARE_BEFORE_RANGE = (
+    _BARE_DATE + r"(?=" + _WEEKDAY + r"?" + _TIME + r"?\s*(?:" + _RANGE_MARK + r"|까지|부터))"
+)
+_DATE = (
+    r"(?:" + "|".join((_NUMERIC_DATE, _SHORT_DATE, _KOREAN_DATE, _BARE_BEFORE_RANGE, _RELATIVE_DATE)) + r")"
+    + _WEEKDAY + r"?" + _TIME + r"?"
+)
+# 시작일 없이 "~ 10.15 18:00"처럼 끝나는 날짜만 있는 기간
+_OPEN_START = _RANGE_MARK + r"\s*(?:" + _SHORT_DATE + r"|" + _BARE_DATE + r")" + _WEEKDAY + r"?" + _TIME + r"?"
+
+_CANDIDATE_RE = re.compile(r"(?:" + _DATE + r"|" + _OPEN_START + r")(?:\s*(?:까지|부터))?|" + _OPEN_ENDED)
+# 두 후보 사이에 이것만 있으면 하나의 기간으로 합친다.
+_RANGE_GAP_RE = re.compile(r"\s*[~∼～〜–-]\s*")
+# 같은 날의 시간 범위 (예: "10. 7.(월) 14:00 ~ 16:00"의 "~ 16:00", "7월 1일부터 오전 9시 ~ 오후 4시"의 "오전 9시 ~ 오후 4시")
+_TIME_TAIL_RE = re.compile(r"(?:" + _TIME + r")?\s*[~∼～〜–-]" + _TIME + r"(?:\s*까지)?")
+# 단독으로는 후보가 아닌 기간의 끝 (예: "9/2 ~ 9/6"의 "~ 9/6", "9월 2일 ~ 6일"의 "~ 6일")
+_END_TAIL_RE = re.compile(
+    r"\s*[~∼～〜–-]\s*(?:" + "|".join((_SHORT_DATE, _BARE_DATE, r"\d{1,2}\s*일")) + r")"
+    + _WEEKDAY + r"?" + _TIME + r"?(?:\s*까지)?"
+)
+
+
+def find_date_candidates(text: str) -> List[str]:
+    """본문에서 날짜/기간/상시 표현을 등장 순서대로 찾아 중복 없이 반환. '~'로 이어진 날짜는 한 기간으로 합친다."""
+    spans: List[list] = []
+    for match in _CANDIDATE_RE.finditer(text or ""):
+        start, end = match.span()
+        if spans and start < spans[-1][1]:
+            continue  # 앞 후보의 시간 범위에 이미 포함됨
+        if spans and _RANGE_GAP_RE.fullmatch(text[spans[-1][1]:start]):
+            spans[-1][1] = end
+        else:
+            spans.append([start, end])
+        while tail := _TIME_TAIL_RE.match(text, spans[-1][1]) or _END_TAIL_RE.match(text, spans[-1][1]):
+            spans[-1][1] = tail.end()
+
+    candidates: List[str] = []
+    for start, end in spans:
+        candidate = " ".join(text[start:end].split())
+        if candidate not in candidates:
+            candidates.append(candidate)
+    return candidates
+
+
+def has_date_candidates(text: str) -> bool:
+    return _CANDIDATE_RE.search(text or "") is not None
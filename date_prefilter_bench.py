@@ -0,0 +1,120 @@
+"""
+날짜 pre-pass(date_prefilter)의 recall 측정과 마이크로벤치마크.
+
+    python date_prefilter_bench.py
+    python date_prefilter_bench.py --number 2000 --min-recall 1.0
+    python date_prefilter_bench.py --collect 3 --out fixtures/dates/cnu_notices.jsonl
+
+fixtures/dates/labeled.jsonl 의 각 줄은 {"text", "has_schedule", "dates"} 이다.
+has_schedule이 null인 줄(--collect로 모은 뒤 아직 라벨링하지 않은 공지)은 recall 계산에서 빼고 후보 수만 출력한다.
+- 공지 recall: has_schedule인 공지 중 후보를 하나 이상 찾은 비율 (놓치면 일정 추출을 건너뛴다)
+- 표현 recall: 라벨의 날짜 표현 중 후보 하나에 (공백 무시하고) 포함된 비율
+- 건너뜀 비율: has_schedule이 아닌 공지 중 후보가 없어 LLM 호출을 아낄 수 있는 비율
+공지 recall이 --min-recall보다 낮으면 종료 코드 1.
+
+--collect N은 게시판별 목록 1..N 페이지의 실제 공지 본문(Board.detail_text)을 has_schedule: null로 --out에 덧붙인다.
+라벨을 채워 labeled.jsonl에 옮긴 뒤 recall을 측정한다. (SCHEDULE_PREFILTER_SKIP은 기본으로 켜져 있다)
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+from date_prefilter import find_date_candidates
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "dates", "labeled.jsonl")
+
+
+def load_labeled(path: str = FIXTURE_PATH) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _compact(text: str) -> str:
+    return "".join(text.split())
+
+
+def collect(pages: int, out: str) -> int:
+    """게시판별 목록 1..pages 페이지의 공지 본문을 라벨 없이 out에 덧붙이고 모은 개수를 반환"""
+    import crawler  # 수집할 때만 requests/bs4가 필요하다.
+    from board import Board
+
+    count = 0
+    with open(out, "a", encoding="utf-8") as f:
+        for url in crawler.CRAWLING_URL_LIST:
+            for page in range(1, pages + 1):
+                for item in crawler.fetch_list_items(url, page):
+                    response = crawler.session.get(url + item["url"], timeout=10)
+                    response.raise_for_status()
+                    context = Board(boardHtml=response.text, baseUrl=url)
+                    row = {"url": url + item["url"], "text": f"{context.title}\n{context.detail_text}",
+                           "has_schedule": None, "dates": []}
+                    f.write(json.dumps(row, ensure_ascii=False) + "\n")
+                    count += 1
+    return count
+
+
+def evaluate(rows: list) -> dict:
+    unlabeled = [row for row in rows if row["has_schedule"] is None]
+    for row in unlabeled:
+        print(f"ℹ️ 라벨 없음 ({len(find_date_candidates(row['text']))}개 후보): {row.get('url') or row['text'][:60]!r}")
+    rows = [row for row in rows if row["has_schedule"] is not None]
+    positives = [row for row in rows if row["has_schedule"]]
+    negatives = [row for row in rows if not row["has_schedule"]]
+
+    notice_hits = 0
+    expected = found = 0
+    skipped = 0
+    for row in rows:
+        candidates = [_compact(c) for c in find_date_candidates(row["text"])]
+        if row["has_schedule"]:
+            if candidates:
+                notice_hits += 1
+            else:
+                print(f"❌ 후보 없음: {row['text'][:60]!r}")
+        elif not candidates:
+            skipped += 1
+
+        for date in row["dates"]:
+            expected += 1
+            if any(_compact(date) in candidate for candidate in candidates):
+                found += 1
+            else:
+                print(f"⚠️ 표현 누락: {date!r} (후보: {find_date_candidates(row['text'])})")
+
+    return {
+        "notices": len(rows),
+        "notice_recall": notice_hits / len(positives) if positives else 1.0,
+        "expression_recall": found / expected if expected else 1.0,
+        "skip_rate": skipped / len(negatives) if negatives else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="날짜 pre-pass recall 측정과 벤치마크")
+    parser.add_argument("--number", type=int, default=1000, help="벤치마크 반복 횟수")
+    parser.add_argument("--min-recall", type=float, default=1.0, help="허용하는 최소 공지 recall")
+    parser.add_argument("--collect", type=int, metavar="PAGES", help="게시판별 목록 페이지 수만큼 실제 공지를 라벨 없이 수집")
+    parser.add_argument("--out", default=FIXTURE_PATH, help="--collect로 모은 공지를 덧붙일 파일")
+    args = parser.parse_args()
+
+    if args.collect:
+        print(f"📥 공지 {collect(args.collect, args.out)}건을 {args.out}에 추가했습니다. has_schedule/dates를 채워주세요.")
+        return
+
+    rows = load_labeled()
+    report = evaluate(rows)
+    print(f"📋 공지 {report['notices']}건: 공지 recall {report['notice_recall']:.3f}, "
+          f"표현 recall {report['expression_recall']:.3f}, 일정 없는 공지 건너뜀 {report['skip_rate']:.3f}")
+
+    texts = [row["text"] for row in rows]
+    seconds = timeit.timeit(lambda: [find_date_candidates(text) for text in texts], number=args.number)
+    print(f"⏱️ 공지당 {seconds / (args.number * len(texts)) * 1e6:.1f}µs")
+
+    if report["notice_recall"] < args.min_recall:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+벤치마크/개발용 로컬 SQLite DB 대역. Supabase 없이 crawler 모듈을 돌릴 수 있다.
+
+    crawler.db_manager = SQLiteManager()
+"""
+import json
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+from board import Attachment
+from database import WebhookTarget, make_save_notice_params, schedule_row
+from schemas import ScheduleItem
+from seen_index import get_title_hash
+
+
+class SQLiteManager:
+    """
+    SupabaseManager의 크롤러용 메서드들을 로컬 SQLite로 구현한 대역.
+    외부 서비스 없이 크롤러를 끝까지 돌리는 벤치마크/개발용이며, 행은 JSON으로 저장한다.
+    """
+    def __init__(self, path: str = ":memory:"):
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS notice (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title_hash TEXT NOT NULL UNIQUE,
+                category INTEGER,
+                data TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS children (
+                kind TEXT NOT NULL,
+                notice_id INTEGER NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS children_notice ON children (kind, notice_id);
+            CREATE TABLE IF NOT EXISTS webhooks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL UNIQUE,
+                is_active INTEGER NOT NULL DEFAULT 1
+            );
+        """)
+        self.conn.commit()
+
+    def get_title_hash(self, title: str) -> str:
+        return get_title_hash(title)
+
+    def _notice_row(self, row, columns: str = "*") -> dict:
+        notice = dict(json.loads(row[1]), id=row[0])
+        if columns.strip() == "*":
+            return notice
+        return {column: notice.get(column) for column in (c.strip() for c in columns.split(","))}
+
+    def _replace_children(self, kind: str, notice_id: int, rows: list):
+        self.conn.execute("DELETE FROM children WHERE kind = ? AND notice_id = ?", (kind, notice_id))
+        self.conn.executemany(
+            "INSERT INTO children (kind, notice_id, data) VALUES (?, ?, ?)",
+            [(kind, notice_id, json.dumps(row, ensure_ascii=False)) for row in rows],
+        )
+
+    def _children(self, kind: str, notice_id: int) -> list:
+        rows = self.conn.execute("SELECT data FROM children WHERE kind = ? AND notice_id = ?", (kind, notice_id))
+        return [dict(json.loads(data), notice_id=notice_id) for (data,) in rows]
+
+    def _with_children(self, notice: dict) -> dict:
+        return dict(
+            notice,
+            schedules=self._children("schedules", notice["id"]),
+            images=self._children("images", notice["id"]),
+            files=self._children("files", notice["id"]),
+        )
+
+    def get_existing_title_hashes(self, title_hashes: List[str]) -> set:
+        title_hashes = list(set(title_hashes))
+        if not title_hashes:
+            return set()
+        placeholders = ",".join("?" * len(title_hashes))
+        with self._lock:
+            rows = self.conn.execute(f"SELECT title_hash FROM notice WHERE title_hash IN ({placeholders})", title_hashes)
+            return {row[0] for row in rows}
+
+    def get_notice_by_title_hash(self, title_hash: str, columns: str = "id,content") -> Optional[dict]:
+        with self._lock:
+            row = self.conn.execute("SELECT id, data FROM notice WHERE title_hash = ?", (title_hash,)).fetchone()
+        return self._notice_row(row, columns) if row else None
+
+    def iter_notice_hashes(self, batch_size: int = 1000):
+        return self.iter_notices("id,title_hash,category", batch_size=batch_size)
+
+    def iter_notices(self, columns: str, batch_size: int = 1000):
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self.conn.execute(
+                    "SELECT id, data FROM notice WHERE id > ? ORDER BY id LIMIT ?", (last_id, batch_size)
+                ).fetchall()
+            if not rows:
+                break
+            yield [self._notice_row(row, columns) for row in rows]
+            last_id = rows[-1][0]
+
+    def save_notice(self, notice_data: dict,
+                    image_urls: Optional[List[str]] = None,
+                    files: Optional[List[Attachment]] = None,
+                    ai_schedules: Optional[List[ScheduleItem]] = None) -> dict:
+        with self._lock:
+            with self.conn:
+                return self._save(notice_data, image_urls, files, ai_schedules)
+
+    def save_notices(self, entries: List[dict]) -> List[dict]:
+        """한 트랜잭션으로 저장 (하나라도 실패하면 전체 롤백)"""
+        with self._lock:
+            with self.conn:
+                return [self._save(**entry) for entry in entries]
+
+    def _save(self, notice_data, image_urls=None, files=None, ai_schedules=None) -> dict:
+        params = make_save_notice_params(notice_data, self.get_title_hash(notice_data['title']), image_urls, files, ai_schedules)
+        notice = params["p_notice"]
+        notice_id = self.conn.execute(
+            "INSERT INTO notice (title_hash, category, data) VALUES (?, ?, ?)",
+            (notice["title_hash"], notice["category"], json.dumps(notice, ensure_ascii=False)),
+        ).lastrowid
+        self._replace_children("schedules", notice_id, params["p_schedules"])
+        self._replace_children("images", notice_id, params["p_images"])
+        self._replace_children("files", notice_id, params["p_files"])
+        return self._with_children(dict(notice, id=notice_id))
+
+    def update_notice(self, notice_id: int, notice_data: dict,
+                      image_urls: Optional[List[str]] = None,
+                      files: Optional[List[Attachment]] = None,
+                      ai_schedules: Optional[List[ScheduleItem]] = None) -> dict:
+        params = make_save_notice_params(notice_data, self.get_title_hash(notice_data['title']), image_urls, files, ai_schedules)
+        with self._lock:
+            with self.conn:
+                row = self.conn.execute("SELECT id, data FROM notice WHERE id = ?", (notice_id,)).fetchone()
+                if row is None:
+                    raise ValueError(f"notice {notice_id}를 찾을 수 없습니다.")
+                stored = json.loads(row[1])
+                notice = dict(params["p_notice"], original_url=stored["original_url"], category=stored["category"])
+                self.conn.execute(
+                    "UPDATE notice SET title_hash = ?, data = ? WHERE id = ?",
+                    (notice["title_hash"], json.dumps(notice, ensure_ascii=False), notice_id),
+                )
+                self._replace_children("schedules", notice_id, params["p_schedules"])
+                self._replace_children("images", notice_id, params["p_images"])
+                self._replace_children("files", notice_id, params["p_files"])
+                return self._with_children(dict(notice, id=notice_id))
+
+    def replace_schedules(self, schedules_by_notice_id: Dict[int, list]):
+        with self._lock:
+            with self.conn:
+                for notice_id, schedules in schedules_by_notice_id.items():
+                    self._replace_children("schedules", notice_id, [schedule_row(s) for s in schedules])
+
+    def add_webhook(self, url: str) -> int:
+        with self._lock:
+            with self.conn:
+                return self.conn.execute("INSERT INTO webhooks (url) VALUES (?)", (url,)).lastrowid
+
+    def get_active_webhooks_snapshot(self, batch_size: int = 1000) -> List[WebhookTarget]:
+        with self._lock:
+            rows = self.conn.execute("SELECT id, url FROM webhooks WHERE is_active = 1 ORDER BY id").fetchall()
+        return [WebhookTarget(*row) for row in rows]
+
+    def deactivate_webhook(self, webhook_id: int):
+        with self._lock:
+            with self.conn:
+                self.conn.execute("UPDATE webhooks SET is_active = 0 WHERE id = ?", (webhook_id,))
@@ -0,0 +1,58 @@
+"""
+테스트/벤치마크용 가짜 채팅 모델. OpenAI 없이 GPTClient를 돌릴 수 있다.
+
+    gpt = GPTClient(llm=FakeStructuredChatModel(latency=0.5), cache=None)
+"""
+import asyncio
+import time
+from typing import Any, List, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import RunnableLambda
+from pydantic import BaseModel
+
+
+def _fake_value(annotation, text: str):
+    """필드 타입에 맞는 더미 값 (문자열은 프롬프트 일부, 리스트는 빈 리스트)"""
+    if getattr(annotation, "__origin__", None) in (list, List):
+        return []
+    return text
+
+
+class FakeStructuredChatModel(BaseChatModel):
+    """지연 시간을 흉내내고, with_structured_output 스키마를 더미 값으로 채워 돌려주는 모델"""
+
+    latency: float = 0.0
+    fail_every: int = 0
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-structured"
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        time.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=str(messages[-1].content)[:100]))])
+
+    def _build(self, schema: type, prompt) -> BaseModel:
+        self.calls += 1
+        if self.fail_every and self.calls % self.fail_every == 0:
+            raise ValueError("fake structured output parse failure")
+
+        text = str(prompt)[:100]
+        values = {name: _fake_value(field.annotation, text) for name, field in schema.model_fields.items()}
+        return schema(**values)
+
+    def with_structured_output(self, schema, **kwargs):  # type: ignore[override]
+        def invoke(prompt):
+            time.sleep(self.latency)
+            return self._build(schema, prompt)
+
+        async def ainvoke(prompt):
+            await asyncio.sleep(self.latency)
+            return self._build(schema, prompt)
+
+        return RunnableLambda(invoke, afunc=ainvoke)
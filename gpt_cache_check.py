@@ -0,0 +1,63 @@
+"""
+통합 분석(analyze_notice) 결과가 개별 호출의 캐시로도 쓰이는지 확인하는 스크립트.
+
+    python gpt_cache_check.py
+
+가짜 모델과 메모리 캐시로 다음을 확인한다. 실패하면 종료 코드 1.
+- analyze_notice 뒤 같은 본문의 extract_schedule_from_notice / process_notice_content는 모델을 호출하지 않는다.
+- 비동기 경로(aanalyze_notice → aextract_schedule_from_notice)도 같다.
+- schedule 키가 없는 예전 analysis 캐시를 읽으면 schedule 키를 채운다.
+"""
+import asyncio
+import sys
+
+from fake_llm import FakeStructuredChatModel
+from gpt_client import GPTClient
+from llm_cache import LLMCache
+
+TITLE = "[장학] 교외장학금 추천 대상자 모집"
+CONTENT = "1. 신청: 2024. 9. 2.(월) ~ 9. 6.(금) 18:00까지\n2. 제출서류: 장학금 신청서 1부"
+
+
+def make_client() -> tuple:
+    model = FakeStructuredChatModel()
+    return GPTClient(llm=model, cache=LLMCache(":memory:")), model
+
+
+def check(name: str, ok: bool) -> bool:
+    print(f"{'✅' if ok else '❌'} {name}")
+    return ok
+
+
+def main():
+    results = []
+
+    gpt, model = make_client()
+    gpt.analyze_notice(title=TITLE, content=CONTENT)
+    calls = model.calls
+    gpt.extract_schedule_from_notice(title=TITLE, content=CONTENT)
+    gpt.process_notice_content(title=TITLE, content=CONTENT)
+    results.append(check("analyze_notice 뒤 일정 재추출/요약은 모델을 호출하지 않음", calls == 1 and model.calls == calls))
+
+    gpt, model = make_client()
+
+    async def run_async():
+        await gpt.aanalyze_notice(title=TITLE, content=CONTENT)
+        await gpt.aextract_schedule_from_notice(title=TITLE, content=CONTENT)
+
+    asyncio.run(run_async())
+    results.append(check("aanalyze_notice 뒤 일정 재추출은 모델을 호출하지 않음", model.calls == 1))
+
+    gpt, model = make_client()
+    gpt.analyze_notice(title=TITLE, content=CONTENT)
+    assert gpt.cache is not None
+    gpt.cache.conn.execute("DELETE FROM llm_cache WHERE key = ?", (gpt._cache_key("schedule", TITLE, CONTENT),))
+    gpt.analyze_notice(title=TITLE, content=CONTENT)
+    gpt.extract_schedule_from_notice(title=TITLE, content=CONTENT)
+    results.append(check("캐시된 analysis를 읽으면 비어 있는 schedule 키를 채움", model.calls == 1))
+
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,49 @@
+import asyncio
 import os
+import re
+from itertools import chain
 from dotenv import load_dotenv
 
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models import BaseChatModel
 from langchain_openai import ChatOpenAI
 from pydantic import BaseModel, Field, SecretStr
-from typing import List
+from typing import Iterable, List, Optional, cast
 
-from sqlalchemy import desc
+from date_prefilter import find_date_candidates
+from llm_cache import LLMCache, make_cache_key
+from metrics import metrics
+from rate_limiter import RateLimiter
+from schemas import ScheduleItem
+
+MODEL_NAME = "gpt-4o-mini"
+MAX_COMPLETION_TOKENS = 5000
+
+# 비동기 호출 시 동시 요청 수와 OpenAI 분당 제한 (gpt-4o-mini tier 1 기준 기본값)
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "4"))
+OPENAI_RPM = int(os.getenv("OPENAI_RPM", "500"))
+OPENAI_TPM = int(os.getenv("OPENAI_TPM", "200000"))
+# TPM 제한에서 호출마다 미리 예약하는 응답 토큰 수. 실제 사용량을 받으면 차이를 정산하므로 최대치(MAX_COMPLETION_TOKENS)를 잡지 않는다.
+LLM_EXPECTED_COMPLETION_TOKENS = int(os.getenv("LLM_EXPECTED_COMPLETION_TOKENS", "1000"))
+# 프롬프트나 스키마를 바꾸면 올려서 이전 캐시를 무효화한다.
+PROMPT_VERSION = "3"
+
+# 본문이 LLM_CONTENT_TOKEN_BUDGET 토큰을 넘으면 LLM_CHUNK_TOKENS 크기의 조각으로 나누어
+# 조각별로 요약/일정 추출한 뒤 합친다(map-reduce). 조각은 LLM_MAX_CHUNKS개까지만 처리한다.
+# 요약 응답에는 본문 전체의 마크다운 변환본이 들어가므로, 예산은 MAX_COMPLETION_TOKENS보다 충분히 작게 잡는다.
+# 토큰 수는 count_tokens의 추정치로 센다.
+LLM_CONTENT_TOKEN_BUDGET = int(os.getenv("LLM_CONTENT_TOKEN_BUDGET", str(MAX_COMPLETION_TOKENS * 3 // 5)))
+LLM_CHUNK_TOKENS = int(os.getenv("LLM_CHUNK_TOKENS", str(MAX_COMPLETION_TOKENS // 2)))
+# 일정 추출 조각에만 겹쳐 넣는 줄 수. 요약(마크다운) 조각은 겹치지 않게 나눠 변환본에 줄이 중복되지 않게 한다.
+LLM_CHUNK_OVERLAP_LINES = int(os.getenv("LLM_CHUNK_OVERLAP_LINES", "2"))
+LLM_MAX_CHUNKS = int(os.getenv("LLM_MAX_CHUNKS", "12"))
+
+# 0이면 날짜 pre-pass를 하지 않는다. 켜져 있으면 찾은 날짜 후보 중 최대 SCHEDULE_HINT_LIMIT개를 프롬프트에 힌트로 넣는다.
+SCHEDULE_PREFILTER = os.getenv("SCHEDULE_PREFILTER", "1") != "0"
+# 날짜 후보가 없는 공지의 일정 추출을 건너뛴다 (0이면 힌트만 넣는다). recall은 date_prefilter_bench.py로 확인하며,
+# 새 날짜 형식을 놓치면 fixtures/dates/labeled.jsonl에 추가하고 패턴을 보강한다.
+SCHEDULE_PREFILTER_SKIP = os.getenv("SCHEDULE_PREFILTER_SKIP", "1") != "0"
+SCHEDULE_HINT_LIMIT = int(os.getenv("SCHEDULE_HINT_LIMIT", "20"))
 
 class NoticeItem(BaseModel):
     '''내용에 대한 제목 요약, 요약된 내용, 마크다운으로 변환된 전체 내용을 제공하세요.'''
@@ -14,98 +52,616 @@ class NoticeItem(BaseModel):
     AI_SUMMARY_CONTENT: str = Field(..., description='중요한 내용을 요약 (100자 이내)')
     MARKDOWN_CONTENT: str = Field(..., description='전체 내용을 원본 의미를 유지하며 사용자가 읽기 쉬운 마크다운 형식으로 변환한다. 이모지를 사용해도 됨.')
 
-class ScheduleItem(BaseModel):
-    title: str = Field(..., description='일정의 제목 (예: "2024년 2학기 국가장학금 1차 신청")')
-    description: str = Field(..., description='일정에 대한 구체적인 설명')
-    begin: str = Field(..., description="일정(신청/제출 기간)이 시작하는 날짜와 시간 (KST, 'YYYY-MM-DDTHH:MM:SS+09:00' 형식)")
-    end: str = Field(..., description="일정(신청/제출 기간)이 끝나는 날짜와 시간 (KST, 'YYYY-MM-DDTHH:MM:SS+09:00' 형식)")
+class NoticeSummary(BaseModel):
+    '''조각별 요약을 종합한 공지 전체의 제목과 요약 (map-reduce의 reduce 단계)'''
+
+    AI_SUMMARY_TITLE : str = Field(..., description='핵심 내용을 담은 간결한 제목 (45자 이내)')
+    AI_SUMMARY_CONTENT: str = Field(..., description='중요한 내용을 요약 (100자 이내)')
 
 class ScheduleList(BaseModel):
     '''ScheduleItem을 리스트로 하는 멤버를 가지는 Wrapper 클래스'''
     items : List[ScheduleItem]
 
+class NoticeAnalysis(NoticeItem):
+    '''공지 요약(NoticeItem)과 일정 목록(ScheduleList)을 한 번의 호출로 받기 위한 통합 스키마'''
+    items : List[ScheduleItem] = Field(..., description='학생이 행동해야 하는 일정 목록. 없으면 빈 리스트')
+
+    def to_notice_item(self) -> NoticeItem:
+        return NoticeItem(
+            AI_SUMMARY_TITLE=self.AI_SUMMARY_TITLE,
+            AI_SUMMARY_CONTENT=self.AI_SUMMARY_CONTENT,
+            MARKDOWN_CONTENT=self.MARKDOWN_CONTENT,
+        )
+
+# 일정 추출 규칙 (extract_schedule_from_notice, analyze_notice 공용)
+SCHEDULE_RULES = """
+**추출 대상:**
+- **신청/접수 기간:** 장학금 신청, 프로그램 지원, 수강 신청 등 (상시 접수 포함)
+- **제출 마감:** 서류 제출, 과제 제출 등
+- **등록/납부 기간:** 등록금 납부, 기숙사 신청 등
+- **중요한 행동이 필요한 명확한 마감 기한이 있거나 상시 진행되는 모든 일정**
+
+**제외 대상:**
+- **단순 행사 안내:** 축제, 특강, 설명회 등 (단, 사전 신청/등록이 필수인 경우는 추출 대상에 포함)
+- **정보 제공성 게시물:** 단순 공지, 소식 전달 등
+"""
+
+SCHEDULE_REQUIREMENTS = """
+**요구사항:**
+1.  `title`: 일정의 제목 (예: "2024년 2학기 국가장학금 1차 신청")
+2.  `description`: 일정에 대한 구체적인 설명
+3.  `begin`: 일정(신청/제출 기간)이 시작하는 날짜와 시간 (KST, 'YYYY-MM-DDTHH:MM:SS+09:00' 형식)
+4.  `end`: 일정(신청/제출 기간)이 끝나는 날짜와 시간 (KST, 'YYYY-MM-DDTHH:MM:SS+09:00' 형식)
+
+- **마감 기한(`end` date)이 없는 상시 일정** (예: "상시 접수", "연중 모집")의 경우, `end` 값은 `9999-12-31T23:59:59+09:00` (KST)로 설정해주세요. 이는 '무기한'을 의미합니다.
+- **중요한 행동(신청, 제출 등)이 필요하지 않은 단순 정보는 추출하지 마세요.**
+- **신청 시작일(`begin` date) 없이 마감 기한만 명시된 경우,** `begin` 값은 `1970-01-01T00:00:00+09:00` 으로 설정해주세요. 이는 '이미 시작되었음'을 의미합니다.
+- 원문에 명시된 모든 날짜와 시간은 **한국 표준시(KST, UTC+9)로 간주**하고, 최종 결과도 **KST**로 반환해주세요.
+- 시간이 명확하게 명시되지 않은 경우, `begin` 날짜의 시간은 `00:00:00`으로, `end` 날짜의 시간은 `23:59:59`으로 간주해주세요.
+- 모든 날짜는 현재 연도를 기준으로 파싱해주세요.
+- 추출할 수 있는 해당 유형의 일정이 하나도 없다면, `items: []`로 반환해주세요.
+"""
+
+
+def count_tokens(text: str) -> int:
+    """
+    토크나이저 없이 대략적인 토큰 수 추정 (한글 1자 ≈ 1토큰, 영문 3~4자 ≈ 1토큰).
+    분할 기준과 TPM 예약에만 쓰이므로 tiktoken(실행 중 인코딩 파일을 내려받는다)을 의존성에 두지 않고 의도적으로 추정치를 쓴다.
+    LLM_CONTENT_TOKEN_BUDGET 등의 기본값도 이 추정치 기준이다.
+    """
+    return len(text.encode('utf-8')) // 3 + 1
+
+
+def split_content(text: str, chunk_tokens: int = LLM_CHUNK_TOKENS, overlap_lines: int = 0) -> List[str]:
+    """
+    본문을 줄 단위로 chunk_tokens 이하의 조각으로 나눈다. 한 줄이 조각보다 길면 글자 수로 자른다.
+    overlap_lines가 있으면 경계에 걸친 일정을 놓치지 않도록 앞 조각의 마지막 overlap_lines줄을 다음 조각에 겹쳐 넣는다.
+    (조각 결과를 이어 붙이는 요약/마크다운에는 쓰지 않는다)
+    """
+    lines = []
+    for line in text.splitlines():
+        while (tokens := count_tokens(line)) > chunk_tokens:
+            cut = max(1, len(line) * chunk_tokens // tokens)
+            lines.append(line[:cut])
+            line = line[cut:]
+        lines.append(line)
+
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for line in lines:
+        tokens = count_tokens(line) + 1  # 줄바꿈
+        if current and current_tokens + tokens > chunk_tokens:
+            chunks.append("\n".join(current))
+            overlap = current[-overlap_lines:] if overlap_lines > 0 else []
+            overlap_tokens = sum(count_tokens(l) + 1 for l in overlap)
+            # 겹치는 줄이 조각의 절반을 넘으면 겹치지 않는다.
+            current, current_tokens = (overlap, overlap_tokens) if overlap_tokens * 2 <= chunk_tokens else ([], 0)
+        current.append(line)
+        current_tokens += tokens
+
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def _normalize_title(title: str) -> str:
+    return re.sub(r"\s+", "", title).lower()
+
+
+def merge_schedules(schedule_lists: Iterable[List[ScheduleItem]]) -> List[ScheduleItem]:
+    """
+    조각별로 추출한 일정을 순서대로 합치며 중복을 제거한다.
+    기간(begin, end)이 같고 제목이 같거나 한쪽이 다른 쪽을 포함하면 같은 일정으로 보고 설명이 긴 쪽을 남긴다.
+    """
+    merged: List[ScheduleItem] = []
+    for item in chain.from_iterable(schedule_lists):
+        key = _normalize_title(item.title)
+        for i, kept in enumerate(merged):
+            kept_key = _normalize_title(kept.title)
+            if (kept.begin, kept.end) == (item.begin, item.end) and (
+                key == kept_key or (key and kept_key and (key in kept_key or kept_key in key))
+            ):
+                if len(item.description) > len(kept.description):
+                    merged[i] = item
+                break
+        else:
+            merged.append(item)
+    return merged
+
+
+class TokenUsageHandler(BaseCallbackHandler):
+    """
+    LLM 응답의 usage_metadata(또는 llm_output.token_usage)를 metrics에 기록하는 콜백.
+    호출마다 새로 만들어 total로 그 호출의 사용량을 읽는다 (RateLimiter 정산용).
+    """
+
+    def __init__(self):
+        self.total = 0
+
+    def _add(self, prompt_tokens: int, completion_tokens: int):
+        metrics.add_tokens(prompt_tokens, completion_tokens)
+        self.total += prompt_tokens + completion_tokens
+
+    def on_llm_end(self, response, **kwargs):
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        if usage:
+            self._add(usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0))
+            return
+
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                self._add(usage.get("input_tokens", 0), usage.get("output_tokens", 0))
+
 
 class GPTClient:
-    def __init__(self, api_key: str | None = None):
+    def __init__(self, api_key: str | None = None, cache: LLMCache | None = None,
+                 llm: BaseChatModel | None = None, max_concurrency: int = LLM_CONCURRENCY,
+                 rate_limiter: RateLimiter | None = None,
+                 content_token_budget: int = LLM_CONTENT_TOKEN_BUDGET, chunk_tokens: int = LLM_CHUNK_TOKENS,
+                 max_chunks: int = LLM_MAX_CHUNKS, schedule_prefilter: bool = SCHEDULE_PREFILTER,
+                 schedule_prefilter_skip: bool = SCHEDULE_PREFILTER_SKIP):
         load_dotenv()
 
+        # llm을 직접 넘기면(테스트용 가짜 모델 등) API key 없이도 생성 가능
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
-        if not self.api_key:
+        if not self.api_key and llm is None:
             raise ValueError("OpenAI API key가 필요합니다.")
+
+        # LLM_CACHE_DISABLED가 설정되지 않았다면 디스크 캐시 사용
+        if cache is None and not os.getenv('LLM_CACHE_DISABLED'):
+            cache = LLMCache()
+        self.cache = cache
         
-        self.llm = ChatOpenAI(api_key=SecretStr(self.api_key), model="gpt-4o-mini", temperature=0.4, max_completion_tokens=5000)
+        self.llm = llm or ChatOpenAI(api_key=SecretStr(cast(str, self.api_key)), model=MODEL_NAME, temperature=0.4, max_completion_tokens=MAX_COMPLETION_TOKENS)
         self.structedSummaryLLM = self.llm.with_structured_output(NoticeItem)
         self.structedScheduleLLM = self.llm.with_structured_output(ScheduleList)
+        self.structedAnalysisLLM = self.llm.with_structured_output(NoticeAnalysis)
+        self.structedReduceLLM = self.llm.with_structured_output(NoticeSummary)
 
-    def process_notice_content(self, title: str, content: str) -> NoticeItem:
-        '''공지사항 내용을 GPT로 처리하여 요약, 제목, 마크다운 생성'''
+        self.content_token_budget = content_token_budget
+        self.chunk_tokens = min(chunk_tokens, content_token_budget)
+        self.max_chunks = max(1, max_chunks)
+        self.schedule_prefilter = schedule_prefilter
+        self.schedule_prefilter_skip = schedule_prefilter_skip
+
+        self.max_concurrency = max(1, max_concurrency)
+        self.rate_limiter = rate_limiter or RateLimiter(OPENAI_RPM, OPENAI_TPM)
+        self._semaphore: asyncio.Semaphore | None = None
+        self._semaphore_loop = None
+
+    def _cache_key(self, kind: str, title: str, content: str) -> str:
+        return make_cache_key(MODEL_NAME, PROMPT_VERSION, kind, title, content)
 
-        prompt = f"""
+    def _cache_get(self, kind: str, title: str, content: str):
+        if self.cache is None:
+            return None
+        cached = self.cache.get(self._cache_key(kind, title, content))
+        metrics.incr("llm_cache_hit" if cached is not None else "llm_cache_miss")
+        return cached
+
+    def _cache_set(self, kind: str, title: str, content: str, value):
+        if self.cache is not None:
+            self.cache.set(self._cache_key(kind, title, content), value)
+
+    def _share_analysis(self, title: str, content: str, result: "NoticeAnalysis", from_cache: bool = False):
+        """
+        통합 분석 결과를 summary/schedule 키에도 저장해, 같은 본문의 개별 호출
+        (update_notice_schedules, reextract.py의 일정 재추출 등)이 LLM을 다시 부르지 않게 한다.
+        캐시에서 읽은 결과면 비어 있는 키만 채운다.
+        """
+        if self.cache is None:
+            return
+        for kind, value in (("summary", result.to_notice_item()), ("schedule", ScheduleList(items=result.items))):
+            key = self._cache_key(kind, title, content)
+            if not from_cache or self.cache.get(key) is None:
+                self.cache.set(key, value.model_dump())
+
+    def _summary_prompt(self, title: str, content: str, note: str = "") -> str:
+        return f"""
 다음 대학교 공지사항을 분석하여 JSON 형식으로 정리해주세요. 마크다운으로 변환할 때는 가독성이 좋게, 다양한 서식을 활용하여, 풍성하게 구성할 것.
+{note}
+**공지사항 원문:**
+- 제목: {title}
+- 내용: {content}
+"""
+
+    def _schedule_prompt(self, title: str, content: str, note: str = "") -> str:
+        return f"""
+다음 대학교 공지사항을 분석하여, **학생들이 반드시 확인하고 행동해야 하는 중요한 일정 정보**를 JSON 객체의 items 리스트에 담아 반환해주세요. 마감 기한이 명확한 일정과 상시 진행되는 일정을 모두 포함해주세요.
+{SCHEDULE_RULES}{note}
+**공지사항 원문:**
+- 제목: {title}
+- 내용: {content}
+{SCHEDULE_REQUIREMENTS}"""
+
+    def _analysis_prompt(self, title: str, content: str, note: str = "") -> str:
+        return f"""
+다음 대학교 공지사항을 분석하여 JSON 형식으로 정리해주세요.
 
+1. 요약: 핵심 제목(AI_SUMMARY_TITLE), 요약(AI_SUMMARY_CONTENT), 마크다운 변환본(MARKDOWN_CONTENT)을 작성하세요. 마크다운으로 변환할 때는 가독성이 좋게, 다양한 서식을 활용하여, 풍성하게 구성할 것.
+2. 일정: **학생들이 반드시 확인하고 행동해야 하는 중요한 일정 정보**를 items 리스트에 담으세요. 마감 기한이 명확한 일정과 상시 진행되는 일정을 모두 포함해주세요.
+{SCHEDULE_RULES}{note}
 **공지사항 원문:**
 - 제목: {title}
 - 내용: {content}
+{SCHEDULE_REQUIREMENTS}"""
+
+    def _reduce_prompt(self, title: str, summaries: List[str]) -> str:
+        parts = "\n".join(f"{i}. {summary}" for i, summary in enumerate(summaries, 1))
+        return f"""
+다음은 긴 대학교 공지사항을 여러 조각으로 나누어 각각 요약한 결과입니다. 조각 요약들을 종합하여 공지 전체의 핵심 제목(AI_SUMMARY_TITLE)과 요약(AI_SUMMARY_CONTENT)을 JSON 형식으로 작성해주세요.
+
+**공지사항 제목:** {title}
+**조각별 요약:**
+{parts}
 """
+
+    # --- 긴 본문: 조각별 처리(map) 후 합치기(reduce) ---------------------------
+
+    # --- 날짜 pre-pass ----------------------------------------------------------
+
+    def _date_candidates(self, title: str, content: str) -> Optional[List[str]]:
+        """제목과 본문의 날짜 후보. pre-pass를 끈 경우 None (후보 여부와 관계없이 일정을 추출한다)"""
+        if not self.schedule_prefilter:
+            return None
+        return find_date_candidates(f"{title}\n{content}")
+
+    def _skip_schedules(self, candidates: Optional[List[str]]) -> bool:
+        """
+        날짜 후보가 없어 일정 추출을 건너뛸지. LLM 호출이 실제로 줄어드는 곳은 extract_schedule_from_notice뿐이고,
+        통합 호출(analyze_notice)에서는 일정 없는 요약 스키마로 바꿔 호출할 뿐 호출 수는 같다.
+        """
+        if candidates == [] and self.schedule_prefilter_skip:
+            metrics.incr("schedule_prefilter_skipped")
+            return True
+        return False
+
+    def _hint_note(self, candidates: Optional[List[str]]) -> str:
+        if not candidates:
+            return ""
+        hints = " / ".join(candidates[:SCHEDULE_HINT_LIMIT])
+        return f"\n※ 원문에서 찾은 날짜/기간 표현 (참고용, 일정 여부는 원문으로 판단): {hints}\n"
+
+    def _part_note(self, index: int, total: int) -> str:
+        return f"\n※ 아래 원문은 긴 공지사항을 {total}개로 나눈 조각 중 {index}번째입니다. 이 조각에 있는 내용만 다루세요.\n"
+
+    def _split(self, content: str, overlap_lines: int = 0) -> Optional[List[str]]:
+        """본문이 토큰 예산 안이면 None, 넘으면 나눈 조각 목록 (최대 max_chunks개)"""
+        if count_tokens(content) <= self.content_token_budget:
+            return None
+
+        chunks = split_content(content, self.chunk_tokens, overlap_lines)
+        if len(chunks) > self.max_chunks:
+            print(f"⚠️ 본문이 너무 길어 {len(chunks)}개 조각 중 앞의 {self.max_chunks}개만 처리합니다.")
+            metrics.incr("llm_chunks_dropped", len(chunks) - self.max_chunks)
+            chunks = chunks[:self.max_chunks]
+        metrics.incr("llm_chunked")
+        metrics.incr("llm_chunks", len(chunks))
+        return chunks
+
+    def _chunk_cached(self, kind: str, schema: type, title: str, chunk: str):
+        """조각 결과는 <kind>.chunk로 캐시해, 긴 공지의 일부만 수정되면 바뀐 조각만 다시 호출한다."""
+        cached = self._cache_get(f"{kind}.chunk", title, chunk)
+        return schema.model_validate(cached) if cached is not None else None
+
+    def _invoke_chunk(self, runnable, schema: type, kind: str, prompt: str, title: str, chunk: str):
+        result = self._chunk_cached(kind, schema, title, chunk)
+        if result is None:
+            result = self._invoke(runnable, prompt, f"{kind}.chunk")
+            assert isinstance(result, schema)
+            self._cache_set(f"{kind}.chunk", title, chunk, result.model_dump())
+        return result
+
+    async def _ainvoke_chunk(self, runnable, schema: type, kind: str, prompt: str, title: str, chunk: str):
+        result = self._chunk_cached(kind, schema, title, chunk)
+        if result is None:
+            result = await self._ainvoke(runnable, prompt, f"{kind}.chunk")
+            assert isinstance(result, schema)
+            self._cache_set(f"{kind}.chunk", title, chunk, result.model_dump())
+        return result
+
+    def _combine_summaries(self, summary: NoticeSummary, parts: list) -> NoticeItem:
+        """reduce 결과의 제목/요약에 조각별 마크다운을 이어 붙인 전체 변환본을 합친다."""
+        return NoticeItem(
+            AI_SUMMARY_TITLE=summary.AI_SUMMARY_TITLE,
+            AI_SUMMARY_CONTENT=summary.AI_SUMMARY_CONTENT,
+            MARKDOWN_CONTENT="\n\n".join(part.MARKDOWN_CONTENT for part in parts),
+        )
+
+    def _reduce(self, title: str, parts: list) -> NoticeItem:
+        summary = self._invoke(self.structedReduceLLM, self._reduce_prompt(title, [p.AI_SUMMARY_CONTENT for p in parts]), "reduce")
+        assert isinstance(summary, NoticeSummary)
+        return self._combine_summaries(summary, parts)
+
+    async def _areduce(self, title: str, parts: list) -> NoticeItem:
+        summary = await self._ainvoke(self.structedReduceLLM, self._reduce_prompt(title, [p.AI_SUMMARY_CONTENT for p in parts]), "reduce")
+        assert isinstance(summary, NoticeSummary)
+        return self._combine_summaries(summary, parts)
+
+    def _summarize_chunks(self, title: str, chunks: List[str]) -> NoticeItem:
+        parts = [
+            self._invoke_chunk(self.structedSummaryLLM, NoticeItem, "summary",
+                               self._summary_prompt(title, chunk, self._part_note(i, len(chunks))), title, chunk)
+            for i, chunk in enumerate(chunks, 1)
+        ]
+        return self._reduce(title, parts)
+
+    def _chunk_note(self, title: str, chunk: str, index: int, total: int) -> str:
+        return self._part_note(index, total) + self._hint_note(self._date_candidates(title, chunk))
+
+    def _chunk_tail(self, chunks: List[str], index: int) -> str:
+        """index번째(1부터) 조각 바로 앞 조각의 마지막 LLM_CHUNK_OVERLAP_LINES줄"""
+        if index <= 1 or LLM_CHUNK_OVERLAP_LINES <= 0:
+            return ""
+        return "\n".join(chunks[index - 2].splitlines()[-LLM_CHUNK_OVERLAP_LINES:])
+
+    def _analysis_chunk_prompt(self, title: str, chunks: List[str], index: int) -> tuple:
+        """
+        통합 분석 조각의 (프롬프트, 캐시 키 본문). 조각은 겹치지 않게 나누고,
+        경계에 걸친 일정은 앞 조각의 마지막 줄을 마크다운에 넣지 않는 참고용 문맥으로 붙여 찾게 한다.
+        """
+        chunk, tail = chunks[index - 1], self._chunk_tail(chunks, index)
+        note = self._chunk_note(title, f"{tail}\n{chunk}" if tail else chunk, index, len(chunks))
+        if tail:
+            note += f"\n※ 앞 조각의 마지막 줄 (일정 판단용 문맥, 마크다운 변환본에는 넣지 마세요):\n{tail}\n"
+        return self._analysis_prompt(title, chunk, note), f"{tail}\n{chunk}"
+
+    def _analyze_chunk(self, title: str, chunks: List[str], index: int) -> NoticeAnalysis:
+        prompt, key = self._analysis_chunk_prompt(title, chunks, index)
+        return self._invoke_chunk(self.structedAnalysisLLM, NoticeAnalysis, "analysis", prompt, title, key)
+
+    async def _aanalyze_chunk(self, title: str, chunks: List[str], index: int) -> NoticeAnalysis:
+        prompt, key = self._analysis_chunk_prompt(title, chunks, index)
+        return await self._ainvoke_chunk(self.structedAnalysisLLM, NoticeAnalysis, "analysis", prompt, title, key)
+
+    def _dated_chunks(self, title: str, chunks: List[str]) -> List[tuple]:
+        """일정 추출이 필요한 (번호, 조각). SCHEDULE_PREFILTER_SKIP이면 날짜 후보가 없는 조각은 건너뛴다."""
+        return [(i, chunk) for i, chunk in enumerate(chunks, 1)
+                if not self._skip_schedules(self._date_candidates(title, chunk))]
+
+    def _extract_chunks(self, title: str, chunks: List[str]) -> ScheduleList:
+        parts = [
+            self._invoke_chunk(self.structedScheduleLLM, ScheduleList, "schedule",
+                               self._schedule_prompt(title, chunk, self._chunk_note(title, chunk, i, len(chunks))), title, chunk)
+            for i, chunk in self._dated_chunks(title, chunks)
+        ]
+        return ScheduleList(items=merge_schedules(part.items for part in parts))
+
+    def _analyze_chunks(self, title: str, chunks: List[str]) -> NoticeAnalysis:
+        parts = [self._analyze_chunk(title, chunks, i) for i in range(1, len(chunks) + 1)]
+        notice = self._reduce(title, parts)
+        return NoticeAnalysis(**notice.model_dump(), items=merge_schedules(part.items for part in parts))
+
+    async def _asummarize_chunks(self, title: str, chunks: List[str]) -> NoticeItem:
+        parts = await asyncio.gather(*(
+            self._ainvoke_chunk(self.structedSummaryLLM, NoticeItem, "summary",
+                                self._summary_prompt(title, chunk, self._part_note(i, len(chunks))), title, chunk)
+            for i, chunk in enumerate(chunks, 1)
+        ))
+        return await self._areduce(title, parts)
+
+    async def _aextract_chunks(self, title: str, chunks: List[str]) -> ScheduleList:
+        parts = await asyncio.gather(*(
+            self._ainvoke_chunk(self.structedScheduleLLM, ScheduleList, "schedule",
+                                self._schedule_prompt(title, chunk, self._chunk_note(title, chunk, i, len(chunks))), title, chunk)
+            for i, chunk in self._dated_chunks(title, chunks)
+        ))
+        return ScheduleList(items=merge_schedules(part.items for part in parts))
+
+    async def _aanalyze_chunks(self, title: str, chunks: List[str]) -> NoticeAnalysis:
+        parts = await asyncio.gather(*(self._aanalyze_chunk(title, chunks, i) for i in range(1, len(chunks) + 1)))
+        notice = await self._areduce(title, parts)
+        return NoticeAnalysis(**notice.model_dump(), items=merge_schedules(part.items for part in parts))
+
+    def _fallback_notice_item(self, title: str, content: str) -> NoticeItem:
+        return NoticeItem(
+            AI_SUMMARY_TITLE=title[:30],
+            AI_SUMMARY_CONTENT=content[:100],
+            MARKDOWN_CONTENT=self._simple_markdown_convert(content)
+        )
+
+    def process_notice_content(self, title: str, content: str) -> NoticeItem:
+        '''공지사항 내용을 GPT로 처리하여 요약, 제목, 마크다운 생성'''
+
+        prompt = self._summary_prompt(title, content)
+        cached = self._cache_get("summary", title, content)
+        if cached is not None:
+            return NoticeItem.model_validate(cached)
+
+        chunks = self._split(content)
         try:
-            result = self.structedSummaryLLM.invoke(prompt)
+            if chunks:
+                result = self._summarize_chunks(title, chunks)
+            else:
+                result = self._invoke(self.structedSummaryLLM, prompt, "summary")
             assert isinstance(result, NoticeItem)
 
+            self._cache_set("summary", title, content, result.model_dump())
             return result
         except Exception as e:
             print(f"❌ 공지 요약 처리 실패: {e}")
             # 실패 시 기본값 반환
-            return NoticeItem(
-                AI_SUMMARY_TITLE=title[:30],
-                AI_SUMMARY_CONTENT=content[:100],
-                MARKDOWN_CONTENT=self._simple_markdown_convert(content)
-            )
+            return self._fallback_notice_item(title, content)
 
     def _simple_markdown_convert(self, text: str) -> str:
         """텍스트의 줄바꿈을 <br>로 변환하는 간단한 마크다운 변환기"""
         return text.replace('\n', '<br>')
 
     def extract_schedule_from_notice(self, title: str, content: str) -> list:
-        """공지사항 내용에서 일정 정보를 추출하여 JSON으로 반환"""
-        prompt = f"""
-다음 대학교 공지사항을 분석하여, **학생들이 반드시 확인하고 행동해야 하는 중요한 일정 정보**를 JSON 객체의 items 리스트에 담아 반환해주세요. 마감 기한이 명확한 일정과 상시 진행되는 일정을 모두 포함해주세요.
+        """공지사항 내용에서 일정 정보를 추출하여 JSON으로 반환. SCHEDULE_PREFILTER_SKIP이면 날짜 후보가 없을 때 LLM을 호출하지 않는다."""
+        candidates = self._date_candidates(title, content)
+        if self._skip_schedules(candidates):
+            return []
 
-**추출 대상:**
-- **신청/접수 기간:** 장학금 신청, 프로그램 지원, 수강 신청 등 (상시 접수 포함)
-- **제출 마감:** 서류 제출, 과제 제출 등
-- **등록/납부 기간:** 등록금 납부, 기숙사 신청 등
-- **중요한 행동이 필요한 명확한 마감 기한이 있거나 상시 진행되는 모든 일정**
+        prompt = self._schedule_prompt(title, content, self._hint_note(candidates))
+        cached = self._cache_get("schedule", title, content)
+        if cached is not None:
+            return ScheduleList.model_validate(cached).items
 
-**제외 대상:**
-- **단순 행사 안내:** 축제, 특강, 설명회 등 (단, 사전 신청/등록이 필수인 경우는 추출 대상에 포함)
-- **정보 제공성 게시물:** 단순 공지, 소식 전달 등
+        chunks = self._split(content, LLM_CHUNK_OVERLAP_LINES)
+        try:
+            if chunks:
+                result = self._extract_chunks(title, chunks)
+            else:
+                result = self._invoke(self.structedScheduleLLM, prompt, "schedule")
+            assert isinstance(result, ScheduleList)
 
-**공지사항 원문:**
-- 제목: {title}
-- 내용: {content}
+            self._cache_set("schedule", title, content, result.model_dump())
+            return result.items
+        except Exception as e:
+            print(f"❌ 일정 추출 실패: {e}")
+            raise e
 
-**요구사항:**
-1.  `title`: 일정의 제목 (예: "2024년 2학기 국가장학금 1차 신청")
-2.  `description`: 일정에 대한 구체적인 설명
-3.  `begin`: 일정(신청/제출 기간)이 시작하는 날짜와 시간 (KST, 'YYYY-MM-DDTHH:MM:SS+09:00' 형식)
-4.  `end`: 일정(신청/제출 기간)이 끝나는 날짜와 시간 (KST, 'YYYY-MM-DDTHH:MM:SS+09:00' 형식)
+    def analyze_notice(self, title: str, content: str) -> tuple:
+        '''
+        요약(NoticeItem)과 일정 목록을 한 번의 호출로 받아 (NoticeItem, List[ScheduleItem])로 반환.
+        통합 호출이 실패하면 기존 process_notice_content / extract_schedule_from_notice 경로로 되돌아간다.
+        SCHEDULE_PREFILTER_SKIP이면 날짜 후보가 없는 공지는 요약만 요청한다. (호출 수는 같고 응답 스키마만 줄어든다)
+        '''
+        candidates = self._date_candidates(title, content)
+        if self._skip_schedules(candidates):
+            return self.process_notice_content(title=title, content=content), []
 
-- **마감 기한(`end` date)이 없는 상시 일정** (예: "상시 접수", "연중 모집")의 경우, `end` 값은 `9999-12-31T23:59:59+09:00` (KST)로 설정해주세요. 이는 '무기한'을 의미합니다.
-- **중요한 행동(신청, 제출 등)이 필요하지 않은 단순 정보는 추출하지 마세요.**
-- **신청 시작일(`begin` date) 없이 마감 기한만 명시된 경우,** `begin` 값은 `1970-01-01T00:00:00+09:00` 으로 설정해주세요. 이는 '이미 시작되었음'을 의미합니다.
-- 원문에 명시된 모든 날짜와 시간은 **한국 표준시(KST, UTC+9)로 간주**하고, 최종 결과도 **KST**로 반환해주세요.
-- 시간이 명확하게 명시되지 않은 경우, `begin` 날짜의 시간은 `00:00:00`으로, `end` 날짜의 시간은 `23:59:59`으로 간주해주세요.
-- 모든 날짜는 현재 연도를 기준으로 파싱해주세요.
-- 추출할 수 있는 해당 유형의 일정이 하나도 없다면, `items: []`로 반환해주세요.
-"""
+        prompt = self._analysis_prompt(title, content, self._hint_note(candidates))
+        cached = self._cache_get("analysis", title, content)
+        if cached is not None:
+            result = NoticeAnalysis.model_validate(cached)
+            self._share_analysis(title, content, result, from_cache=True)
+            return result.to_notice_item(), result.items
+
+        chunks = self._split(content)
+        try:
+            if chunks:
+                result = self._analyze_chunks(title, chunks)
+            else:
+                result = self._invoke(self.structedAnalysisLLM, prompt, "analysis")
+            assert isinstance(result, NoticeAnalysis)
+
+            self._cache_set("analysis", title, content, result.model_dump())
+            self._share_analysis(title, content, result)
+            return result.to_notice_item(), result.items
+        except Exception as e:
+            print(f"❌ 통합 분석 실패, 개별 호출로 재시도합니다: {e}")
+            return (
+                self.process_notice_content(title=title, content=content),
+                self.extract_schedule_from_notice(title=title, content=content),
+            )
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """현재 이벤트 루프용 세마포어 (asyncio.run마다 새 루프가 생기므로 루프별로 만든다)"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    def _expected_tokens(self, prompt: str) -> int:
+        """TPM 제한에서 예약할 토큰 수 (프롬프트 + 예상 응답)"""
+        return count_tokens(prompt) + min(LLM_EXPECTED_COMPLETION_TOKENS, MAX_COMPLETION_TOKENS)
+
+    def _settle(self, reserved: float, usage: TokenUsageHandler):
+        # 사용량을 돌려주지 않는 모델이면 예약한 만큼 쓴 것으로 둔다.
+        if usage.total:
+            self.rate_limiter.settle(reserved, usage.total)
+
+    def _invoke(self, runnable, prompt: str, kind: str):
+        """RPM/TPM 제한 안에서 llm.<kind> span과 토큰 사용량을 기록하며 invoke 실행"""
+        reserved = self.rate_limiter.acquire_blocking(self._expected_tokens(prompt))
+        usage = TokenUsageHandler()
+        with metrics.span(f"llm.{kind}"):
+            result = runnable.invoke(prompt, config={"callbacks": [usage]})
+        self._settle(reserved, usage)
+        return result
+
+    async def _ainvoke(self, runnable, prompt: str, kind: str):
+        """동시성 제한과 RPM/TPM 제한 안에서 ainvoke 실행"""
+        async with self._get_semaphore():
+            reserved = await self.rate_limiter.acquire(self._expected_tokens(prompt))
+            usage = TokenUsageHandler()
+            with metrics.span(f"llm.{kind}"):
+                result = await runnable.ainvoke(prompt, config={"callbacks": [usage]})
+            self._settle(reserved, usage)
+            return result
+
+    async def aprocess_notice_content(self, title: str, content: str) -> NoticeItem:
+        '''process_notice_content의 비동기 버전'''
+        cached = self._cache_get("summary", title, content)
+        if cached is not None:
+            return NoticeItem.model_validate(cached)
+
+        chunks = self._split(content)
+        try:
+            if chunks:
+                result = await self._asummarize_chunks(title, chunks)
+            else:
+                result = await self._ainvoke(self.structedSummaryLLM, self._summary_prompt(title, content), "summary")
+            assert isinstance(result, NoticeItem)
+
+            self._cache_set("summary", title, content, result.model_dump())
+            return result
+        except Exception as e:
+            print(f"❌ 공지 요약 처리 실패: {e}")
+            return self._fallback_notice_item(title, content)
+
+    async def aextract_schedule_from_notice(self, title: str, content: str) -> list:
+        '''extract_schedule_from_notice의 비동기 버전'''
+        candidates = self._date_candidates(title, content)
+        if self._skip_schedules(candidates):
+            return []
+
+        cached = self._cache_get("schedule", title, content)
+        if cached is not None:
+            return ScheduleList.model_validate(cached).items
+
+        chunks = self._split(content, LLM_CHUNK_OVERLAP_LINES)
         try:
-            result = self.structedScheduleLLM.invoke(prompt)
+            if chunks:
+                result = await self._aextract_chunks(title, chunks)
+            else:
+                result = await self._ainvoke(self.structedScheduleLLM, self._schedule_prompt(title, content, self._hint_note(candidates)), "schedule")
             assert isinstance(result, ScheduleList)
 
+            self._cache_set("schedule", title, content, result.model_dump())
             return result.items
         except Exception as e:
             print(f"❌ 일정 추출 실패: {e}")
             raise e
 
+    async def aanalyze_notice(self, title: str, content: str) -> tuple:
+        '''analyze_notice의 비동기 버전. 실패 시 개별 비동기 호출로 되돌아간다.'''
+        candidates = self._date_candidates(title, content)
+        if self._skip_schedules(candidates):
+            return await self.aprocess_notice_content(title=title, content=content), []
 
+        cached = self._cache_get("analysis", title, content)
+        if cached is not None:
+            result = NoticeAnalysis.model_validate(cached)
+            self._share_analysis(title, content, result, from_cache=True)
+            return result.to_notice_item(), result.items
+
+        chunks = self._split(content)
+        try:
+            if chunks:
+                result = await self._aanalyze_chunks(title, chunks)
+            else:
+                result = await self._ainvoke(self.structedAnalysisLLM, self._analysis_prompt(title, content, self._hint_note(candidates)), "analysis")
+            assert isinstance(result, NoticeAnalysis)
+
+            self._cache_set("analysis", title, content, result.model_dump())
+            self._share_analysis(title, content, result)
+            return result.to_notice_item(), result.items
+        except Exception as e:
+            print(f"❌ 통합 분석 실패, 개별 호출로 재시도합니다: {e}")
+            return await asyncio.gather(
+                self.aprocess_notice_content(title=title, content=content),
+                self.aextract_schedule_from_notice(title=title, content=content),
+            )
 
+    async def aanalyze_notices(self, notices: List[tuple], return_exceptions: bool = False) -> list:
+        '''(title, content) 목록을 max_concurrency와 RPM/TPM 제한 안에서 병렬 분석. 결과는 입력 순서'''
+        return await asyncio.gather(
+            *(self.aanalyze_notice(title=title, content=content) for title, content in notices),
+            return_exceptions=return_exceptions,
+        )
@@ -0,0 +1,126 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from typing import NamedTuple, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "32"))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "3"))
+HTTP_CACHE_PATH = os.getenv("HTTP_CACHE_PATH", ".cache/http_cache.sqlite3")
+
+# 내용이 같아도 매번 바뀌는 부분 (조회수 등). body hash 비교 전에 지운다.
+VOLATILE_PATTERNS = [
+    # 상세 페이지: <th scope="row">조회수</th><td>1532</td>
+    re.compile(r"<th[^>]*>\s*조회수\s*</th>\s*<td[^>]*>\s*[\d,]+\s*</td>"),
+    # 목록 페이지: <span class="hit">조회수 1532</span>
+    re.compile(r"조회수\s*[\d,]+"),
+]
+
+
+def make_session(pool_size: int = HTTP_POOL_SIZE, retries: int = HTTP_RETRIES,
+                 headers: Optional[dict] = None) -> requests.Session:
+    """keep-alive 커넥션 풀과 재시도(지수 백오프)가 설정된 requests 세션"""
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.5,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD"}),  # POST(webhook)는 중복 전송 위험이 있어 재시도하지 않음
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def body_hash(text: str) -> str:
+    for pattern in VOLATILE_PATTERNS:
+        text = pattern.sub("", text)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class PageFetch(NamedTuple):
+    url: str
+    changed: bool
+    text: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body_hash: Optional[str]
+
+
+class ConditionalFetcher:
+    """
+    ETag/Last-Modified 조건부 GET으로 목록 페이지를 가져온다.
+    서버가 검증자를 주지 않으면 (변하는 부분을 지운) 본문 해시로 변경 여부를 판단한다.
+    검증자는 commit()을 호출해야 저장되므로, 처리 중 실패하면 다음 실행에서 다시 가져온다.
+    """
+
+    def __init__(self, session: requests.Session, path: str = HTTP_CACHE_PATH, timeout: float = 10):
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self.session = session
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS page_validators (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body_hash TEXT
+            )
+        """)
+        self.conn.commit()
+
+    def _load(self, url: str) -> tuple:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT etag, last_modified, body_hash FROM page_validators WHERE url = ?", (url,)
+            ).fetchone()
+        return row or (None, None, None)
+
+    def fetch(self, url: str, headers: Optional[dict] = None) -> PageFetch:
+        etag, last_modified, old_hash = self._load(url)
+
+        request_headers = dict(headers or {})
+        if etag:
+            request_headers["If-None-Match"] = etag
+        if last_modified:
+            request_headers["If-Modified-Since"] = last_modified
+
+        response = self.session.get(url, headers=request_headers, timeout=self.timeout)
+        if response.status_code == 304:
+            return PageFetch(url, False, "", etag, last_modified, old_hash)
+
+        response.raise_for_status()
+        text = response.text
+        new_hash = body_hash(text)
+        return PageFetch(
+            url=url,
+            changed=new_hash != old_hash,
+            text=text,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            body_hash=new_hash,
+        )
+
+    def commit(self, page: PageFetch):
+        """처리가 끝난 페이지의 검증자를 저장"""
+        if not page.changed:
+            return
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO page_validators (url, etag, last_modified, body_hash) VALUES (?, ?, ?, ?)",
+                (page.url, page.etag, page.last_modified, page.body_hash),
+            )
+            self.conn.commit()
@@ -0,0 +1,252 @@
+"""
+공지사항 처리 작업 큐와 실행 시간 예산.
+
+새 글은 처리 전에 먼저 로컬 SQLite jobs 테이블에 기록되고, 단계가 끝날 때마다 결과와 함께 갱신된다.
+
+    pending  → 상세 페이지 + LLM 분석 전
+    analyzed → 분석 결과(save_notice 인자) 저장됨, DB 저장 전
+    saved    → DB 저장됨, 알림 전
+    notified → 완료
+    failed   → JOB_MAX_ATTEMPTS번 실패
+
+실행이 시간 제한에 걸려 멈춰도 다음 실행은 남은 단계부터 이어서 처리하므로,
+이미 요약한 글의 LLM 비용을 다시 내거나 저장/알림이 빠지는 일이 없다.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import date
+from typing import Iterable, List, NamedTuple, Optional
+
+from board import Attachment
+from seen_index import article_no_from_url
+
+JOB_QUEUE_PATH = os.getenv("JOB_QUEUE_PATH", ".cache/jobs.sqlite3")
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_RETENTION_DAYS = int(os.getenv("JOB_RETENTION_DAYS", "7"))
+# failed 작업이 목록에 다시 새 글로 보이면, 마지막 실패로부터 이만큼 지난 뒤 다시 처리한다.
+JOB_FAILED_RETRY_SECONDS = float(os.getenv("JOB_FAILED_RETRY_SECONDS", "21600"))
+
+# 실행 시간 예산(초). 0이면 제한 없음. GitHub Actions의 4분 timeout보다 여유 있게 설정한다.
+RUN_BUDGET_SECONDS = float(os.getenv("RUN_BUDGET_SECONDS", "0"))
+# 남은 시간이 (예상 소요 시간 + 여유분)보다 적으면 새 LLM 작업을 시작하지 않는다.
+DEADLINE_MARGIN_SECONDS = float(os.getenv("DEADLINE_MARGIN_SECONDS", "15"))
+
+STAGES = ("pending", "analyzed", "saved", "notified", "failed")
+
+
+class Deadline:
+    """실행 시작 시점부터의 시간 예산"""
+
+    def __init__(self, budget: float = RUN_BUDGET_SECONDS, margin: float = DEADLINE_MARGIN_SECONDS,
+                 clock=time.monotonic):
+        self.budget = budget
+        self.margin = margin
+        self.clock = clock
+        self.started = clock()
+
+    def remaining(self) -> float:
+        if self.budget <= 0:
+            return float("inf")
+        return self.budget - (self.clock() - self.started)
+
+    def allows(self, estimate: float) -> bool:
+        """estimate초가 걸리는 작업을 지금 시작해도 예산 안에 끝나는지"""
+        return self.remaining() >= estimate + self.margin
+
+    def expired(self) -> bool:
+        return not self.allows(0)
+
+
+class NoticeJob(NamedTuple):
+    id: int
+    category: int
+    board_url: str
+    item: dict
+    stage: str
+    entry: Optional[dict]
+    notice: Optional[dict]
+    attempts: int
+    error: Optional[str]
+
+
+def dump_entry(entry: dict) -> str:
+    """save_notice 인자(notice_data, image_urls, files, ai_schedules)를 JSON으로 직렬화"""
+    notice_data = dict(entry['notice_data'])
+    if isinstance(notice_data.get('publish_date'), date):
+        notice_data['publish_date'] = notice_data['publish_date'].isoformat()
+
+    return json.dumps({
+        'notice_data': notice_data,
+        'image_urls': list(entry.get('image_urls') or []),
+        'files': [list(f) for f in entry.get('files') or []],
+        'ai_schedules': [s.model_dump() if hasattr(s, 'model_dump') else dict(s) for s in entry.get('ai_schedules') or []],
+    }, ensure_ascii=False)
+
+
+def load_entry(text: str) -> dict:
+    entry = json.loads(text)
+    if entry['notice_data'].get('publish_date'):
+        entry['notice_data']['publish_date'] = date.fromisoformat(entry['notice_data']['publish_date'])
+    entry['files'] = [Attachment(*f) for f in entry['files']]
+    return entry  # ai_schedules는 dict 그대로 (schedule_row가 dict도 받는다)
+
+
+def article_key(item: dict) -> str:
+    """목록 url의 article.offset은 새 글이 올라오면 바뀌므로 articleNo로 작업을 식별"""
+    article_no = article_no_from_url(item['url'])
+    return str(article_no) if article_no is not None else item['url']
+
+
+class JobQueue:
+    def __init__(self, path: str = JOB_QUEUE_PATH):
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                category INTEGER NOT NULL,
+                board_url TEXT NOT NULL,
+                article_key TEXT NOT NULL,
+                item TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                entry TEXT,
+                notice TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                updated_at REAL NOT NULL,
+                UNIQUE (category, article_key)
+            );
+            CREATE INDEX IF NOT EXISTS jobs_stage ON jobs (stage);
+            CREATE TABLE IF NOT EXISTS stage_timings (
+                stage TEXT PRIMARY KEY,
+                seconds REAL NOT NULL
+            );
+        """)
+        self.conn.commit()
+
+    def _row_to_job(self, row) -> NoticeJob:
+        id, category, board_url, item, stage, entry, notice, attempts, error = row
+        return NoticeJob(
+            id=id,
+            category=category,
+            board_url=board_url,
+            item=json.loads(item),
+            stage=stage,
+            entry=load_entry(entry) if entry else None,
+            notice=json.loads(notice) if notice else None,
+            attempts=attempts,
+            error=error,
+        )
+
+    _COLUMNS = "id, category, board_url, item, stage, entry, notice, attempts, error"
+
+    def get(self, job_id: int) -> NoticeJob:
+        with self._lock:
+            row = self.conn.execute(f"SELECT {self._COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row)
+
+    def enqueue(self, category: int, board_url: str, item: dict) -> NoticeJob:
+        """
+        새 글을 pending 작업으로 기록. 이미 있는 글이면 기존 작업을 반환한다.
+        failed 작업은 JOB_FAILED_RETRY_SECONDS가 지났으면 시도 횟수를 초기화해 다시 처리하고,
+        그 전이면 failed 그대로 반환해 이번 실행에서는 건너뛴다.
+        (분석 결과가 남아 있으면 analyzed부터 이어서 처리해 LLM을 다시 호출하지 않는다)
+        """
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO jobs (category, board_url, article_key, item, stage, updated_at) "
+                "VALUES (?, ?, ?, ?, 'pending', ?)",
+                (category, board_url, article_key(item), json.dumps(item, ensure_ascii=False), time.time()),
+            )
+            self.conn.execute(
+                "UPDATE jobs SET stage = CASE WHEN entry IS NOT NULL THEN 'analyzed' ELSE 'pending' END, "
+                "attempts = 0, error = NULL, updated_at = ? "
+                "WHERE category = ? AND article_key = ? AND stage = 'failed' AND updated_at < ?",
+                (time.time(), category, article_key(item), time.time() - JOB_FAILED_RETRY_SECONDS),
+            )
+            self.conn.commit()
+            row = self.conn.execute(
+                f"SELECT {self._COLUMNS} FROM jobs WHERE category = ? AND article_key = ?",
+                (category, article_key(item)),
+            ).fetchone()
+        return self._row_to_job(row)
+
+    def in_stages(self, stages: Iterable[str]) -> List[NoticeJob]:
+        stages = list(stages)
+        placeholders = ",".join("?" * len(stages))
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT {self._COLUMNS} FROM jobs WHERE stage IN ({placeholders}) ORDER BY id", stages
+            ).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def advance(self, job: NoticeJob, stage: str, entry: Optional[dict] = None,
+                notice: Optional[dict] = None) -> NoticeJob:
+        assert stage in STAGES
+        with self._lock:
+            self.conn.execute(
+                "UPDATE jobs SET stage = ?, entry = COALESCE(?, entry), notice = COALESCE(?, notice), "
+                "error = NULL, updated_at = ? WHERE id = ?",
+                (
+                    stage,
+                    dump_entry(entry) if entry is not None else None,
+                    json.dumps(notice, ensure_ascii=False, default=str) if notice is not None else None,
+                    time.time(),
+                    job.id,
+                ),
+            )
+            self.conn.commit()
+        return self.get(job.id)
+
+    def mark(self, jobs: Iterable[NoticeJob], stage: str):
+        assert stage in STAGES
+        with self._lock:
+            self.conn.executemany(
+                "UPDATE jobs SET stage = ?, updated_at = ? WHERE id = ?",
+                [(stage, time.time(), job.id) for job in jobs],
+            )
+            self.conn.commit()
+
+    def fail(self, job: NoticeJob, error: BaseException, max_attempts: int = JOB_MAX_ATTEMPTS) -> NoticeJob:
+        """실패 횟수를 기록하고, max_attempts에 도달하면 failed로 옮긴다."""
+        with self._lock:
+            self.conn.execute(
+                "UPDATE jobs SET attempts = attempts + 1, error = ?, updated_at = ?, "
+                "stage = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE stage END WHERE id = ?",
+                (str(error), time.time(), max_attempts, job.id),
+            )
+            self.conn.commit()
+        return self.get(job.id)
+
+    def purge(self, days: int = JOB_RETENTION_DAYS) -> int:
+        """끝난(notified/failed) 작업 중 오래된 것을 삭제"""
+        with self._lock:
+            deleted = self.conn.execute(
+                "DELETE FROM jobs WHERE stage IN ('notified', 'failed') AND updated_at < ?",
+                (time.time() - days * 86400,),
+            ).rowcount
+            self.conn.commit()
+        return deleted
+
+    def record_duration(self, stage: str, seconds: float, alpha: float = 0.3):
+        """단계별 소요 시간의 지수 이동 평균을 기록 (다음 실행의 예상 시간으로도 쓰인다)"""
+        with self._lock:
+            self.conn.execute("""
+                INSERT INTO stage_timings (stage, seconds) VALUES (?, ?)
+                ON CONFLICT(stage) DO UPDATE SET seconds = seconds * (1 - ?) + excluded.seconds * ?
+            """, (stage, seconds, alpha, alpha))
+            self.conn.commit()
+
+    def estimate(self, stage: str, default: float) -> float:
+        with self._lock:
+            row = self.conn.execute("SELECT seconds FROM stage_timings WHERE stage = ?", (stage,)).fetchone()
+        return row[0] if row else default
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,45 @@
+"""
+처음 사용할 때 만들어지는 클라이언트.
+
+    gpt = LazyClient("gpt", lambda: GPTClient())
+    gpt.analyze_notice(...)   # 이 시점에 GPTClient()가 만들어진다.
+
+crawler 모듈이 import 시점에 LangChain, Supabase 클라이언트를 만들지 않도록 하기 위해 쓴다.
+새 글이 없는 실행은 이 클라이언트들을 한 번도 만들지 않고 끝난다.
+"""
+import threading
+from typing import Callable, Generic, Optional, TypeVar
+
+from metrics import metrics
+
+T = TypeVar("T")
+
+
+class LazyClient(Generic[T]):
+    """속성에 처음 접근할 때 factory()로 객체를 만들고 이후 모든 속성 접근을 그 객체로 넘기는 프록시"""
+
+    def __init__(self, name: str, factory: Callable[[], T]):
+        self._name = name
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._value: Optional[T] = None
+
+    # 감싼 객체의 속성(session.get 등)을 가리지 않도록 프록시 자신의 속성은 모두 _로 시작한다.
+    def _loaded(self) -> bool:
+        return self._value is not None
+
+    def _resolve(self) -> T:
+        if self._value is None:
+            with self._lock:
+                if self._value is None:
+                    # 초기화 비용은 init.<name> span으로 실행 요약에 남는다.
+                    with metrics.span(f"init.{self._name}"):
+                        self._value = self._factory()
+        return self._value
+
+    def __getattr__(self, attr: str):
+        return getattr(self._resolve(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._loaded() else "not loaded"
+        return f"<LazyClient {self._name} ({state})>"
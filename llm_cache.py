@@ -0,0 +1,84 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".cache/llm_cache.sqlite3")
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+
+
+def make_cache_key(*parts: str) -> str:
+    """모델, 프롬프트 버전, 제목, 내용 등을 이어 붙여 sha256 키를 만든다."""
+    digest = hashlib.sha256()
+    for part in parts:
+        encoded = part.encode("utf-8")
+        # 경계를 명확히 하기 위해 길이를 함께 넣는다.
+        digest.update(len(encoded).to_bytes(8, "big"))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+class LLMCache:
+    """GPT 결과를 내용 해시로 저장하는 디스크(SQLite) 캐시. 전체 크기가 max_bytes를 넘으면 오래 안 쓴 항목부터 지운다."""
+
+    def __init__(self, path: str = LLM_CACHE_PATH, max_bytes: int = LLM_CACHE_MAX_BYTES):
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache (last_access);
+        """)
+        self.conn.commit()
+
+    def get(self, key: str) -> Optional[object]:
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self.conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+        return json.loads(row[0])
+
+    def set(self, key: str, value: object):
+        encoded = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, encoded, len(encoded.encode("utf-8")), time.time()),
+            )
+            self._evict()
+            self.conn.commit()
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+
+    def _evict(self):
+        """크기 제한을 넘으면 last_access가 오래된 순으로 삭제 (lock 안에서 호출)"""
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evict_keys = []
+        for key, size in self.conn.execute("SELECT key, size FROM llm_cache ORDER BY last_access"):
+            if total <= self.max_bytes:
+                break
+            evict_keys.append((key,))
+            total -= size
+        self.conn.executemany("DELETE FROM llm_cache WHERE key = ?", evict_keys)
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,208 @@
+"""
+실행(run) 단위 계측: 단계별 timing span, 이벤트 카운터, LLM 토큰 사용량.
+
+    from metrics import metrics
+
+    with metrics.span("fetch_detail", url=url):
+        ...
+    metrics.incr("saved")
+
+실행이 끝나면 write_run_summary()가 METRICS_JSON_PATH에 JSON 요약을,
+METRICS_PROM_PATH가 설정되어 있으면 node_exporter textfile collector 형식의 파일을 쓴다.
+"""
+import contextvars
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Optional
+
+METRICS_JSON_PATH = os.getenv("METRICS_JSON_PATH", ".cache/run_metrics.json")
+METRICS_PROM_PATH = os.getenv("METRICS_PROM_PATH")
+# JSON 요약에 남길 최대 span 수 (집계에는 모든 span이 반영된다)
+METRICS_MAX_TRACE_SPANS = int(os.getenv("METRICS_MAX_TRACE_SPANS", "2000"))
+
+PROM_PREFIX = "cse_carrier"
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+
+def percentile(sorted_values: list, q: float) -> float:
+    """nearest-rank 분위수"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Metrics:
+    """스레드/asyncio 어디서 기록해도 되는 실행 단위 계측 저장소"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # 프로세스 시작 비용은 실행(run)마다 reset되지 않는다.
+        self.startup: dict = {}
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = time.time()
+            self._started = time.perf_counter()
+            self.durations = defaultdict(list)
+            self.errors = Counter()
+            self.counters = Counter()
+            self.tokens = Counter()
+            self.trace: list = []
+            self._next_span_id = 1
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        """name 단계의 소요 시간을 기록. 중첩되면 바깥 span을 parent로 남긴다."""
+        with self._lock:
+            span_id = self._next_span_id
+            self._next_span_id += 1
+        parent = _current_span.get()
+        token = _current_span.set(span_id)
+        started = time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            duration = time.perf_counter() - started
+            _current_span.reset(token)
+            with self._lock:
+                self.durations[name].append(duration)
+                if error:
+                    self.errors[name] += 1
+                if len(self.trace) < METRICS_MAX_TRACE_SPANS:
+                    self.trace.append({
+                        "id": span_id,
+                        "parent": parent,
+                        "name": name,
+                        "start_ms": round((started - self._started) * 1000, 3),
+                        "duration_ms": round(duration * 1000, 3),
+                        **({"error": error} if error else {}),
+                        **attrs,
+                    })
+
+    def incr(self, name: str, n: int = 1):
+        with self._lock:
+            self.counters[name] += n
+
+    def set_startup(self, **seconds: float):
+        """import, 프로세스 CPU 시간 등 시작 비용(초)을 기록"""
+        with self._lock:
+            self.startup.update({name: round(value, 6) for name, value in seconds.items()})
+
+    def add_tokens(self, prompt_tokens: int = 0, completion_tokens: int = 0):
+        with self._lock:
+            self.tokens["prompt"] += prompt_tokens
+            self.tokens["completion"] += completion_tokens
+
+    def summary(self) -> dict:
+        with self._lock:
+            stages = {}
+            for name, values in self.durations.items():
+                values = sorted(values)
+                stages[name] = {
+                    "count": len(values),
+                    "errors": self.errors[name],
+                    "total_s": round(sum(values), 6),
+                    "p50_ms": round(percentile(values, 50) * 1000, 3),
+                    "p90_ms": round(percentile(values, 90) * 1000, 3),
+                    "p99_ms": round(percentile(values, 99) * 1000, 3),
+                    "max_ms": round(values[-1] * 1000, 3),
+                }
+            return {
+                "started_at": self.started_at,
+                "duration_s": round(time.perf_counter() - self._started, 6),
+                "counters": dict(self.counters),
+                "tokens": {**self.tokens, "total": sum(self.tokens.values())},
+                "startup": dict(self.startup),
+                "stages": stages,
+                "trace": list(self.trace),
+            }
+
+    def to_prometheus(self, summary: Optional[dict] = None) -> str:
+        summary = summary or self.summary()
+        lines = [
+            f"# HELP {PROM_PREFIX}_stage_seconds Time spent per crawler stage in the last run.",
+            f"# TYPE {PROM_PREFIX}_stage_seconds summary",
+        ]
+        for name, stage in sorted(summary["stages"].items()):
+            for quantile, key in (("0.5", "p50_ms"), ("0.9", "p90_ms"), ("0.99", "p99_ms")):
+                lines.append(f'{PROM_PREFIX}_stage_seconds{{stage="{name}",quantile="{quantile}"}} {stage[key] / 1000:.6f}')
+            lines.append(f'{PROM_PREFIX}_stage_seconds_sum{{stage="{name}"}} {stage["total_s"]:.6f}')
+            lines.append(f'{PROM_PREFIX}_stage_seconds_count{{stage="{name}"}} {stage["count"]}')
+
+        lines += [
+            f"# HELP {PROM_PREFIX}_stage_errors Spans that ended with an exception in the last run.",
+            f"# TYPE {PROM_PREFIX}_stage_errors gauge",
+        ]
+        lines += [f'{PROM_PREFIX}_stage_errors{{stage="{name}"}} {stage["errors"]}' for name, stage in sorted(summary["stages"].items())]
+
+        lines += [
+            f"# HELP {PROM_PREFIX}_events Notice events counted in the last run.",
+            f"# TYPE {PROM_PREFIX}_events gauge",
+        ]
+        lines += [f'{PROM_PREFIX}_events{{event="{name}"}} {value}' for name, value in sorted(summary["counters"].items())]
+
+        lines += [
+            f"# HELP {PROM_PREFIX}_llm_tokens LLM tokens used in the last run.",
+            f"# TYPE {PROM_PREFIX}_llm_tokens gauge",
+        ]
+        lines += [f'{PROM_PREFIX}_llm_tokens{{kind="{name}"}} {value}' for name, value in sorted(summary["tokens"].items())]
+
+        if summary.get("startup"):
+            lines += [
+                f"# HELP {PROM_PREFIX}_startup_seconds Process start-up cost (imports, CPU time before the run).",
+                f"# TYPE {PROM_PREFIX}_startup_seconds gauge",
+            ]
+            lines += [f'{PROM_PREFIX}_startup_seconds{{phase="{name}"}} {value:.6f}' for name, value in sorted(summary["startup"].items())]
+
+        lines += [
+            f"# TYPE {PROM_PREFIX}_run_duration_seconds gauge",
+            f"{PROM_PREFIX}_run_duration_seconds {summary['duration_s']:.6f}",
+            f"# TYPE {PROM_PREFIX}_last_run_timestamp_seconds gauge",
+            f"{PROM_PREFIX}_last_run_timestamp_seconds {summary['started_at']:.0f}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _write_atomic(path: str, text: str):
+    """읽는 쪽(textfile collector 등)이 쓰다 만 파일을 보지 않도록 임시 파일에 쓴 뒤 교체"""
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+metrics = Metrics()
+
+
+def write_run_summary(json_path: Optional[str] = METRICS_JSON_PATH,
+                      prom_path: Optional[str] = METRICS_PROM_PATH) -> dict:
+    """실행 요약을 JSON(및 Prometheus textfile)으로 저장하고 한 줄 요약을 출력"""
+    summary = metrics.summary()
+    if json_path:
+        _write_atomic(json_path, json.dumps(summary, ensure_ascii=False, indent=2))
+    if prom_path:
+        _write_atomic(prom_path, metrics.to_prometheus(summary))
+
+    counters = summary["counters"]
+    print(
+        f"📈 실행 요약: {summary['duration_s']:.1f}s, "
+        f"확인 {counters.get('seen', 0)} / 건너뜀 {counters.get('skipped', 0)} / 요약 {counters.get('summarized', 0)} / "
+        f"저장 {counters.get('saved', 0)} / 전송 {counters.get('delivered', 0)} / 실패 {counters.get('failed', 0)}, "
+        f"토큰 {summary['tokens']['total']}",
+        flush=True,
+    )
+    return summary
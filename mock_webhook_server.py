@@ -0,0 +1,135 @@
+"""
+부하 테스트용 로컬 Discord webhook 서버.
+
+    python mock_webhook_server.py --webhooks 2000 --notices 3
+
+/webhooks/<id> 로 들어오는 POST를 받아 기록하고, 설정에 따라 지연, 429(Retry-After), 404를 흉내낸다.
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Optional
+
+
+class _Server(ThreadingHTTPServer):
+    # 수천 개의 동시 연결을 받아도 connection reset이 나지 않도록 backlog를 늘린다.
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+class MockWebhookServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 rate_limit_every: int = 0, retry_after: float = 0.05, missing_ids: Optional[set] = None):
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.missing_ids = set(missing_ids or ())
+
+        self.received: dict = {}
+        self.request_count = 0
+        self._lock = threading.Lock()
+
+        self.httpd = _Server((host, port), self._make_handler())
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def webhook_url(self, webhook_id: int) -> str:
+        return f"{self.base_url}/webhooks/{webhook_id}"
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                webhook_id = int(self.path.rstrip("/").split("/")[-1])
+
+                with server._lock:
+                    server.request_count += 1
+                    count = server.request_count
+
+                if server.latency:
+                    time.sleep(server.latency)
+
+                if webhook_id in server.missing_ids:
+                    return self._reply(404, {"message": "Unknown Webhook", "code": 10015})
+
+                if server.rate_limit_every and count % server.rate_limit_every == 0:
+                    return self._reply(429, {"retry_after": server.retry_after, "global": False},
+                                       {"Retry-After": str(server.retry_after)})
+
+                with server._lock:
+                    server.received.setdefault(webhook_id, []).append(json.loads(body or b"{}"))
+                self.send_response(204)
+                self.end_headers()
+
+            def _reply(self, status: int, data: dict, extra_headers: Optional[dict] = None):
+                encoded = json.dumps(data).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(encoded)))
+                for key, value in (extra_headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def make_fake_webhooks(server: MockWebhookServer, count: int) -> list:
+    """get_active_webhooks()가 돌려주는 Webhook처럼 id, url을 가진 객체 목록"""
+    return [SimpleNamespace(id=i, url=server.webhook_url(i)) for i in range(1, count + 1)]
+
+
+def main():
+    from webhook_sender import WebhookSender
+
+    parser = argparse.ArgumentParser(description="WebhookSender 부하 테스트")
+    parser.add_argument("--webhooks", type=int, default=1000)
+    parser.add_argument("--notices", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--rate-limit-every", type=int, default=200)
+    parser.add_argument("--missing", type=int, default=10, help="404를 돌려줄 webhook 수")
+    args = parser.parse_args()
+
+    with MockWebhookServer(latency=args.latency, rate_limit_every=args.rate_limit_every,
+                           missing_ids=set(range(1, args.missing + 1))) as server:
+        webhooks = make_fake_webhooks(server, args.webhooks)
+        payloads = [{"content": f"notice {i}"} for i in range(args.notices)]
+
+        started = time.perf_counter()
+        report = WebhookSender(max_workers=args.workers).deliver(webhooks, payloads)
+        elapsed = time.perf_counter() - started
+
+    total = args.webhooks * args.notices
+    print(f"📊 {args.webhooks}개 webhook × {args.notices}개 공지 = {total}건, {elapsed:.2f}s ({total / elapsed:.0f} req/s)")
+    print(f"   sent={report.sent} failed={report.failed} rate_limited={report.rate_limited} deactivated={len(report.deactivated)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Board 파서 백엔드 간 결과 비교(parity)와 마이크로벤치마크.
+
+    python parser_bench.py            # parity 확인 후 벤치마크
+    python parser_bench.py --number 500
+
+fixtures/boards 의 list_*.html 은 parse_list_page, detail_*.html 은 Board로 파싱하여
+모든 백엔드가 필드 단위로 같은 결과를 내는지 확인한다. 다르면 종료 코드 1.
+조회수만 바뀐 페이지의 body hash(http_client.body_hash)가 그대로인지도 함께 확인한다.
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+import timeit
+
+from board import HAS_LXML, Board, parse_list_page
+from http_client import body_hash
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "boards")
+BASE_URL = "https://computer.cnu.ac.kr/computer/notice/bachelor.do"
+BOARD_FIELDS = ("title", "writer", "views", "date", "email", "detail_text", "images", "file_box")
+# 목록의 "조회수 1532", 상세의 "<th>조회수</th><td>1532</td>"에서 숫자 부분
+_VIEWS_RE = re.compile(r"(조회수\s*(?:</th>\s*<td[^>]*>)?\s*)(\d+)")
+
+
+def available_backends() -> list:
+    return ["bs4", "lxml"] if HAS_LXML else ["bs4"]
+
+
+def load_fixtures(prefix: str) -> dict:
+    fixtures = {}
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, f"{prefix}_*.html"))):
+        with open(path, encoding="utf-8") as f:
+            fixtures[os.path.basename(path)] = f.read()
+    return fixtures
+
+
+def parse_fields(name: str, html: str, backend: str):
+    if name.startswith("list_"):
+        return parse_list_page(html, backend=backend)
+    board = Board(boardHtml=html, baseUrl=BASE_URL, backend=backend)
+    return {field: getattr(board, field) for field in BOARD_FIELDS}
+
+
+def check_parity() -> bool:
+    backends = available_backends()
+    fixtures = {**load_fixtures("list"), **load_fixtures("detail")}
+    ok = True
+
+    for name, html in fixtures.items():
+        expected = parse_fields(name, html, "bs4")
+        for backend in backends[1:]:
+            actual = parse_fields(name, html, backend)
+            if actual != expected:
+                ok = False
+                print(f"❌ {name}: bs4와 {backend} 결과가 다릅니다.")
+                print(f"   bs4:     {expected}")
+                print(f"   {backend}: {actual}")
+
+    if ok:
+        print(f"✅ {len(fixtures)}개 fixture에서 {', '.join(backends)} 결과가 모두 같습니다.")
+    return ok
+
+
+def check_volatile() -> bool:
+    """fixture의 조회수를 바꿔도 body hash가 같은지 (조건부 재확인이 '변경 없음'을 낼 수 있는지)"""
+    fixtures = {**load_fixtures("list"), **load_fixtures("detail")}
+    ok = True
+
+    for name, html in fixtures.items():
+        bumped = _VIEWS_RE.sub(lambda m: m.group(1) + str(int(m.group(2)) + 1), html)
+        if bumped != html and body_hash(bumped) != body_hash(html):
+            ok = False
+            print(f"❌ {name}: 조회수만 바뀌었는데 body hash가 달라집니다.")
+
+    if ok:
+        print(f"✅ {len(fixtures)}개 fixture에서 조회수 변경이 body hash에 영향을 주지 않습니다.")
+    return ok
+
+
+def benchmark(number: int):
+    fixtures = {**load_fixtures("list"), **load_fixtures("detail")}
+    for name, html in fixtures.items():
+        timings = []
+        for backend in available_backends():
+            seconds = timeit.timeit(lambda: parse_fields(name, html, backend), number=number)
+            timings.append(f"{backend} {seconds / number * 1e6:8.1f}µs")
+        print(f"{name:32s} " + "  ".join(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Board 파서 parity 확인 및 벤치마크")
+    parser.add_argument("--number", type=int, default=200, help="fixture당 반복 횟수")
+    parser.add_argument("--parity-only", action="store_true")
+    args = parser.parse_args()
+
+    if not HAS_LXML:
+        print("ℹ️ lxml이 설치되어 있지 않아 bs4 백엔드만 확인합니다.")
+
+    ok = check_parity()
+    ok = check_volatile() and ok
+    if ok and not args.parity_only:
+        benchmark(args.number)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+단계별 생산자/소비자 파이프라인 크롤러.
+
+    CRAWLER_MODE=pipeline python crawler.py
+
+목록 → 상세 GET → Board 파싱 → LLM 분석 → 저장 → 알림 단계를 크기가 제한된 큐로 잇고,
+단계마다 별도의 worker를 둔다. (GET은 스레드, 파싱은 프로세스 풀, LLM은 asyncio)
+뒤 단계가 느리면 앞 단계의 put()이 대기하므로, 새 글이 몰려도 메모리에 올라가는
+공지 수는 큐 크기와 worker 수의 합으로 제한된다.
+"""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import crawler
+from board import Board, parse_list_page
+from http_client import PageFetch
+from metrics import metrics, write_run_summary
+
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "8"))
+PIPELINE_FETCH_WORKERS = int(os.getenv("PIPELINE_FETCH_WORKERS", "4"))
+PIPELINE_PARSE_PROCESSES = int(os.getenv("PIPELINE_PARSE_PROCESSES", "2"))  # 0이면 스레드에서 파싱
+# gpt_client(LangChain)를 import하지 않도록 LLM_CONCURRENCY를 직접 읽는다.
+PIPELINE_LLM_WORKERS = int(os.getenv("PIPELINE_LLM_WORKERS", os.getenv("LLM_CONCURRENCY", "4")))
+PIPELINE_SAVE_BATCH = int(os.getenv("PIPELINE_SAVE_BATCH", "5"))
+
+
+@dataclass
+class BoardRun:
+    """게시판 하나의 진행 상황. 모든 새 글이 저장되어야 목록 페이지 검증자를 저장한다."""
+    category: int
+    url: str
+    page_fetch: Optional[PageFetch] = None
+    pending: int = 0
+    discovered: bool = False
+    errors: List[str] = field(default_factory=list)
+
+
+@dataclass
+class Job:
+    board: BoardRun
+    item: dict
+    detail_html: Optional[str] = None
+    context: Optional[Board] = None
+    entry: Optional[dict] = None
+
+
+class Pipeline:
+    def __init__(self, boards: List[tuple],
+                 queue_size: int = PIPELINE_QUEUE_SIZE,
+                 fetch_workers: int = PIPELINE_FETCH_WORKERS,
+                 parse_processes: int = PIPELINE_PARSE_PROCESSES,
+                 llm_workers: int = PIPELINE_LLM_WORKERS,
+                 save_batch: int = PIPELINE_SAVE_BATCH,
+                 limiter: Optional[crawler.HostLimiter] = None):
+        """boards: (category, url) 목록"""
+        self.boards = [BoardRun(category, url) for category, url in boards]
+        self.queue_size = queue_size
+        self.fetch_workers = fetch_workers
+        self.parse_processes = parse_processes
+        self.llm_workers = llm_workers
+        self.save_batch = max(1, save_batch)
+        self.limiter = limiter or crawler.HostLimiter()
+        self.notices: List[dict] = []
+
+    # --- 단계 ---------------------------------------------------------------
+
+    async def discover(self, board: BoardRun):
+        """목록 페이지를 넘기며 새 글을 fetch 큐에 넣는다. 큐가 차면 다음 페이지를 가져오지 않고 기다린다."""
+        list_url = crawler.make_pagination_url(1, board.url)
+        async with self.limiter.get(list_url):
+            with metrics.span("fetch_list", url=board.url, page=1):
+                board.page_fetch = await asyncio.to_thread(crawler.list_fetcher.fetch, list_url)
+        if not board.page_fetch.changed:
+            print(f"ℹ️ [{board.url}] 목록 페이지 1에 변경이 없습니다.", flush=True)
+            return
+
+        with metrics.span("parse_list"):
+            items = parse_list_page(board.page_fetch.text)
+        for notice in await asyncio.to_thread(crawler.process_edited_items, items, board.url, board.category):
+            await self.notify_queue.put(notice)
+
+        fetched_items: list = []
+        new_items = crawler.iter_new_items(board.url, board.category, start_page=1, first_page_items=items,
+                                           fetched_items=fetched_items)
+        while (item := await asyncio.to_thread(next, new_items, None)) is not None:
+            board.pending += 1
+            await self.fetch_queue.put(Job(board, item))
+
+        # 다음 페이지들에서 목록 행 지문이 바뀐 기존 공지
+        for notice in await asyncio.to_thread(crawler.process_edited_items, fetched_items, board.url, board.category):
+            await self.notify_queue.put(notice)
+
+    async def fetch(self, job: Job):
+        job.detail_html = await crawler.fetch_text_async(job.board.url + job.item['url'], self.limiter)
+        await self.parse_queue.put(job)
+
+    async def parse(self, job: Job):
+        loop = asyncio.get_running_loop()
+        with metrics.span("parse_detail"):
+            job.context = await loop.run_in_executor(self.parse_pool, Board, job.detail_html, job.board.url)
+        job.detail_html = None
+        await self.llm_queue.put(job)
+
+    async def analyze(self, job: Job):
+        context = job.context
+        assert context is not None
+        print(job.board.url + job.item['url'] + " 로 접속하여 2차 크롤링을 진행합니다.", flush=True)
+
+        ai_response, ai_schedules = await crawler.gpt.aanalyze_notice(title=context.title, content=context.detail_text)
+        metrics.incr("summarized")
+        job.entry = crawler.make_save_entry(job.item, job.board.url, job.board.category, context, ai_response, ai_schedules)
+        job.context = None
+        await self.save_queue.put(job)
+
+    async def save(self, jobs: List[Job]):
+        """대기 중인 분석 결과를 최대 save_batch개씩 한 번의 RPC로 저장"""
+        with metrics.span("db_save", kind="batch", notices=len(jobs)):
+            notices = await asyncio.to_thread(crawler.db_manager.save_notices, [job.entry for job in jobs])
+        metrics.incr("saved", len(notices))
+        for job, notice in zip(jobs, notices):
+            crawler.mark_seen(notice, job.item, job.board.category)
+            await self.notify_queue.put(notice)
+            self._finish(job)
+
+    async def notify(self, notices: List[dict]):
+        self.notices.extend(notices)
+        await asyncio.to_thread(crawler.triggered_notice_exists, notices)
+
+    # --- 실행 ---------------------------------------------------------------
+
+    def _finish(self, job: Job, error: Optional[BaseException] = None):
+        board = job.board
+        board.pending -= 1
+        if error is not None:
+            board.errors.append(f"'{job.item.get('title')}': {error}")
+        self._maybe_commit(board)
+
+    def _maybe_commit(self, board: BoardRun):
+        # 실패한 글이 있으면 목록 페이지를 다음 실행에서 다시 가져오도록 검증자를 저장하지 않는다.
+        if board.discovered and board.pending == 0 and not board.errors and board.page_fetch is not None:
+            crawler.list_fetcher.commit(board.page_fetch)
+
+    async def _worker(self, name: str, inbox: asyncio.Queue, handle):
+        while True:
+            job = await inbox.get()
+            try:
+                await handle(job)
+            except Exception as e:
+                print(f"🔴 [{name}] '{job.item.get('title')}' 처리 중 오류 발생: {e}", flush=True)
+                metrics.incr("failed")
+                self._finish(job, e)
+            finally:
+                inbox.task_done()
+
+    async def _batch_worker(self, name: str, inbox: asyncio.Queue, handle, batch_size: int, on_error=None):
+        """큐에 쌓인 항목을 기다리지 않고 최대 batch_size개까지 모아 한 번에 처리"""
+        while True:
+            batch = [await inbox.get()]
+            while len(batch) < batch_size and not inbox.empty():
+                batch.append(inbox.get_nowait())
+            try:
+                await handle(batch)
+            except Exception as e:
+                print(f"🔴 [{name}] {len(batch)}건 처리 중 오류 발생: {e}", flush=True)
+                metrics.incr("failed", len(batch))
+                if on_error:
+                    on_error(batch, e)
+            finally:
+                for _ in batch:
+                    inbox.task_done()
+
+    async def _discover(self, board: BoardRun):
+        try:
+            await self.discover(board)
+        except Exception as e:
+            board.errors.append(str(e))
+            print(f"🔴 [{board.url}] 목록 처리 중 오류 발생: {e}", flush=True)
+        finally:
+            board.discovered = True
+            self._maybe_commit(board)
+
+    async def run(self) -> List[dict]:
+        self.fetch_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        self.parse_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        self.llm_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        self.save_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        self.notify_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        # 이벤트 루프, to_thread worker, 클라이언트 스레드가 이미 떠 있으므로 fork 대신 spawn으로 프로세스를 만든다.
+        self.parse_pool = (
+            ProcessPoolExecutor(self.parse_processes, mp_context=multiprocessing.get_context("spawn"))
+            if self.parse_processes > 0 else None
+        )
+
+        def save_failed(jobs: List[Job], error: BaseException):
+            for job in jobs:
+                self._finish(job, error)
+
+        workers = [
+            *(asyncio.create_task(self._worker("fetch", self.fetch_queue, self.fetch)) for _ in range(self.fetch_workers)),
+            *(asyncio.create_task(self._worker("parse", self.parse_queue, self.parse)) for _ in range(max(1, self.parse_processes))),
+            *(asyncio.create_task(self._worker("llm", self.llm_queue, self.analyze)) for _ in range(self.llm_workers)),
+            asyncio.create_task(self._batch_worker("save", self.save_queue, self.save, self.save_batch, save_failed)),
+            asyncio.create_task(self._batch_worker("notify", self.notify_queue, self.notify, batch_size=10)),
+        ]
+
+        try:
+            await asyncio.gather(*(self._discover(board) for board in self.boards))
+            # 앞 단계부터 차례로 비워야 뒤 단계에 들어올 항목이 더 없다.
+            for queue in (self.fetch_queue, self.parse_queue, self.llm_queue, self.save_queue, self.notify_queue):
+                await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            if self.parse_pool is not None:
+                self.parse_pool.shutdown()
+
+        for board in self.boards:
+            if board.errors:
+                crawler.discord_web_hook_admin(f"[{board.url}] " + "\n".join(board.errors[:5]))
+        return self.notices
+
+
+async def main_pipeline() -> List[dict]:
+    metrics.reset()
+    try:
+        crawler.prepare_seen_index()
+        crawler.reset_webhook_snapshot()
+
+        notices = await Pipeline(list(enumerate(crawler.CRAWLING_URL_LIST))).run()
+
+        if crawler.DISCORD_DIGEST:
+            crawler.discord_web_hook(notices, digest=True)
+        return notices
+    finally:
+        # 실행이 예외로 끝나도 실행 요약은 남긴다.
+        write_run_summary()
+
+
+if __name__ == "__main__":
+    asyncio.run(main_pipeline())
@@ -0,0 +1,86 @@
+"""
+sql/*.sql 함수들의 트랜잭션 동작을 실제 Postgres에서 확인하는 스크립트.
+
+    DATABASE_URL=postgresql://postgres@localhost:5432/cse_carrier_check python postgres_check.py
+
+빈 데이터베이스에 models의 테이블과 sql/*.sql 함수를 만들고 다음을 확인한다. 실패하면 종료 코드 1.
+- save_notice_atomic: notice와 일정/이미지/파일이 함께 저장된다.
+- save_notices_bulk: 항목 하나가 실패(중복 title_hash)하면 같은 호출의 다른 공지도 저장되지 않는다.
+- update_notice_atomic: 일정/이미지/파일이 새 값으로 교체된다.
+notice 관련 테이블의 행을 지우므로 운영 DB에 실행하지 않는다.
+"""
+import sys
+from datetime import date
+
+from sqlalchemy import text
+
+from board import Attachment
+from postgres_manager import PostgresManager
+
+TABLES = ("schedules", "notice_images", "notice_files", "notice")
+
+
+def make_entry(title: str, schedules: int = 1) -> dict:
+    return {
+        "notice_data": {
+            "title": title,
+            "content": f"{title} 본문",
+            "publish_date": date(2024, 9, 2),
+            "original_url": f"https://example.com/{title}",
+            "category": 0,
+        },
+        "image_urls": [f"https://example.com/{title}.png"],
+        "files": [Attachment(f"{title}.pdf", f"https://example.com/{title}.pdf", "pdf")],
+        "ai_schedules": [
+            {"title": f"{title} 일정 {i}", "description": None, "begin": "2024-09-02", "end": "2024-09-06"}
+            for i in range(schedules)
+        ],
+    }
+
+
+def count_rows(manager: PostgresManager) -> dict:
+    with manager.engine.connect() as conn:
+        return {table: conn.execute(text(f"select count(*) from {table}")).scalar_one() for table in TABLES}
+
+
+def check(name: str, ok: bool) -> bool:
+    print(f"{'✅' if ok else '❌'} {name}")
+    return ok
+
+
+def main():
+    manager = PostgresManager()
+    manager.install_schema()
+    with manager.engine.begin() as conn:
+        conn.execute(text(f"truncate {', '.join(TABLES)} restart identity cascade"))
+
+    results = []
+
+    saved = manager.save_notice(**make_entry("single", schedules=2))
+    results.append(check(
+        "save_notice_atomic가 일정/이미지/파일을 함께 저장",
+        len(saved["schedules"]) == 2 and len(saved["images"]) == 1 and len(saved["files"]) == 1,
+    ))
+
+    before = count_rows(manager)
+    try:
+        manager.save_notices([make_entry("bulk-1"), make_entry("single")])
+        rolled_back = False
+    except Exception:
+        rolled_back = True
+    results.append(check(
+        "save_notices_bulk는 항목 하나가 실패하면 전체를 롤백",
+        rolled_back and count_rows(manager) == before,
+    ))
+
+    updated = manager.update_notice(saved["id"], **make_entry("single", schedules=3))
+    results.append(check(
+        "update_notice_atomic가 일정/이미지/파일을 교체",
+        len(updated["schedules"]) == 3 and count_rows(manager)["schedules"] == 3,
+    ))
+
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
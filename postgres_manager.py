@@ -0,0 +1,106 @@
+"""
+로컬 Postgres에서 sql/*.sql 함수를 직접 실행하는 관리자 (postgres_check.py용).
+
+database.py가 sqlalchemy/models를 import하지 않도록 분리했다. 크롤러는 SupabaseManager만 쓴다.
+"""
+import json
+import os
+from typing import Dict, List, Optional
+
+from sqlalchemy import create_engine, text
+
+from board import Attachment
+from database import SQL_DIR, make_save_notice_params, schedule_row
+from models import Base
+from schemas import ScheduleItem
+from seen_index import get_title_hash
+
+
+class PostgresManager:
+    """
+    Supabase 없이 로컬 Postgres에서 save_notice_atomic / save_notices_bulk를 실행하기 위한 관리자.
+    DATABASE_URL(예: postgresql://postgres@localhost:5432/postgres)로 접속한다.
+    """
+    def __init__(self, db_url: str | None = None):
+        db_url = db_url or os.getenv('DATABASE_URL')
+        assert db_url is not None
+
+        self.engine = create_engine(db_url, echo=False)
+
+    def install_schema(self):
+        """models의 테이블과 sql/*.sql 함수들을 생성"""
+        Base.metadata.create_all(self.engine)
+
+        # 함수 본문의 '%rowtype'이 파라미터 치환되지 않도록 DBAPI 커서로 직접 실행
+        raw = self.engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            for name in sorted(os.listdir(SQL_DIR)):
+                if name.endswith('.sql'):
+                    with open(os.path.join(SQL_DIR, name), encoding='utf-8') as f:
+                        cursor.execute(f.read())
+            raw.commit()
+        finally:
+            raw.close()
+
+    def get_title_hash(self, title: str) -> str:
+        return get_title_hash(title)
+
+    def save_notice(self, notice_data: dict,
+                    image_urls: Optional[List[str]] = None,
+                    files: Optional[List[Attachment]] = None,
+                    ai_schedules: Optional[List[ScheduleItem]] = None) -> dict:
+        params = make_save_notice_params(notice_data, self.get_title_hash(notice_data['title']), image_urls, files, ai_schedules)
+        with self.engine.begin() as conn:
+            return conn.execute(
+                text("select save_notice_atomic(cast(:n as jsonb), cast(:s as jsonb), cast(:i as jsonb), cast(:f as jsonb))"),
+                {
+                    "n": json.dumps(params["p_notice"]),
+                    "s": json.dumps(params["p_schedules"]),
+                    "i": json.dumps(params["p_images"]),
+                    "f": json.dumps(params["p_files"]),
+                },
+            ).scalar_one()
+
+    def save_notices(self, entries: List[dict]) -> List[dict]:
+        items = []
+        for entry in entries:
+            params = make_save_notice_params(
+                entry['notice_data'], self.get_title_hash(entry['notice_data']['title']),
+                entry.get('image_urls'), entry.get('files'), entry.get('ai_schedules'),
+            )
+            items.append({"notice": params["p_notice"], "schedules": params["p_schedules"],
+                          "images": params["p_images"], "files": params["p_files"]})
+
+        with self.engine.begin() as conn:
+            return conn.execute(
+                text("select save_notices_bulk(cast(:items as jsonb))"), {"items": json.dumps(items)}
+            ).scalar_one()
+
+    def update_notice(self, notice_id: int, notice_data: dict,
+                      image_urls: Optional[List[str]] = None,
+                      files: Optional[List[Attachment]] = None,
+                      ai_schedules: Optional[List[ScheduleItem]] = None) -> dict:
+        params = make_save_notice_params(notice_data, self.get_title_hash(notice_data['title']), image_urls, files, ai_schedules)
+        with self.engine.begin() as conn:
+            return conn.execute(
+                text("select update_notice_atomic(:id, cast(:n as jsonb), cast(:s as jsonb), cast(:i as jsonb), cast(:f as jsonb))"),
+                {
+                    "id": notice_id,
+                    "n": json.dumps(params["p_notice"]),
+                    "s": json.dumps(params["p_schedules"]),
+                    "i": json.dumps(params["p_images"]),
+                    "f": json.dumps(params["p_files"]),
+                },
+            ).scalar_one()
+
+    def save_schedules_bulk(self, schedules_by_notice_id: Dict[int, list]) -> int:
+        """replace_schedules_bulk로 여러 공지의 일정을 한 트랜잭션에 교체"""
+        items = [
+            {"notice_id": notice_id, "schedules": [schedule_row(s) for s in schedules]}
+            for notice_id, schedules in schedules_by_notice_id.items()
+        ]
+        with self.engine.begin() as conn:
+            return conn.execute(
+                text("select replace_schedules_bulk(cast(:items as jsonb))"), {"items": json.dumps(items)}
+            ).scalar_one()
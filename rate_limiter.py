@@ -0,0 +1,67 @@
+import asyncio
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    분당 요청 수(RPM)와 분당 토큰 수(TPM)를 함께 제한하는 토큰 버킷.
+    두 버킷 모두 1분 동안 용량만큼 연속적으로 채워진다.
+    asyncio(acquire)와 스레드(acquire_blocking)가 같은 버킷을 나눠 쓸 수 있으며, 여유가 생길 때까지 대기한다.
+    토큰은 요청 전에 예상치만큼 예약하고, 응답 후 실제 사용량을 알면 settle()로 차이를 돌려받거나 더 차감한다.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float, clock=time.monotonic):
+        self.rpm = float(requests_per_minute)
+        self.tpm = float(tokens_per_minute)
+        self.clock = clock
+
+        self._requests = self.rpm
+        self._tokens = self.tpm
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+
+    def wait_time(self, tokens: int) -> float:
+        """지금 tokens만큼 요청하려면 기다려야 하는 시간(초). 0이면 바로 가능"""
+        self._refill()
+        tokens = min(tokens, self.tpm)  # 버킷보다 큰 요청은 가득 찰 때까지만 기다린다.
+
+        request_wait = max(0.0, (1 - self._requests) * 60 / self.rpm)
+        token_wait = max(0.0, (tokens - self._tokens) * 60 / self.tpm)
+        return max(request_wait, token_wait)
+
+    def _try_take(self, tokens: float) -> float:
+        """여유가 있으면 요청 1개와 tokens를 차감하고 0을, 없으면 기다려야 하는 시간을 반환"""
+        with self._lock:
+            wait = self.wait_time(tokens)
+            if wait <= 0:
+                self._requests -= 1
+                self._tokens -= tokens
+            return wait
+
+    async def acquire(self, tokens: int) -> float:
+        """tokens를 예약하고 실제로 예약한 양을 반환 (settle()에 넘긴다)"""
+        tokens = min(tokens, self.tpm)
+        while (wait := self._try_take(tokens)) > 0:
+            await asyncio.sleep(wait)
+        return tokens
+
+    def acquire_blocking(self, tokens: int) -> float:
+        """acquire의 동기 버전. 스레드에서 호출한다."""
+        tokens = min(tokens, self.tpm)
+        while (wait := self._try_take(tokens)) > 0:
+            time.sleep(wait)
+        return tokens
+
+    def settle(self, reserved: float, used: float):
+        """예약한 토큰과 실제 사용량의 차이를 정산. 더 썼으면 버킷이 음수가 되어 다음 요청이 그만큼 기다린다."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.tpm, self._tokens + reserved - used)
@@ -0,0 +1,219 @@
+"""
+기존 공지사항의 일정 재추출 작업.
+
+    python reextract.py --workers 4
+    python reextract.py --board 0 --limit 200
+    python reextract.py --force          # 저장된 해시를 무시하고 모두 다시 추출
+
+공지마다 본문(Board.detail_text)의 해시를 로컬 SQLite에 저장해 두고,
+상세 페이지가 바뀌지 않았거나(조건부 GET) 본문 해시가 같으면 LLM을 호출하지 않는다.
+해시가 없는 공지는 DB에 저장된 content의 해시와 비교한다.
+"""
+import argparse
+import os
+import sqlite3
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import crawler
+from board import Board
+from http_client import ConditionalFetcher, PageFetch, body_hash
+from seen_index import content_hash
+
+REEXTRACT_CONCURRENCY = int(os.getenv("REEXTRACT_CONCURRENCY", "4"))
+REEXTRACT_BATCH_SIZE = int(os.getenv("REEXTRACT_BATCH_SIZE", "50"))
+CONTENT_HASH_PATH = os.getenv("CONTENT_HASH_PATH", ".cache/content_hashes.sqlite3")
+
+
+class ContentHashIndex:
+    """notice_id별로 마지막으로 일정을 추출한 본문의 해시를 저장하는 로컬 SQLite 저장소"""
+
+    def __init__(self, path: str = CONTENT_HASH_PATH):
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS content_hashes (
+                notice_id INTEGER PRIMARY KEY,
+                content_hash TEXT NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def get_many(self, notice_ids: List[int]) -> Dict[int, str]:
+        if not notice_ids:
+            return {}
+        placeholders = ",".join("?" * len(notice_ids))
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT notice_id, content_hash FROM content_hashes WHERE notice_id IN ({placeholders})",
+                notice_ids,
+            )
+            return dict(rows.fetchall())
+
+    def set_many(self, hashes: Dict[int, str]):
+        if not hashes:
+            return
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO content_hashes (notice_id, content_hash) VALUES (?, ?)",
+                hashes.items(),
+            )
+            self.conn.commit()
+
+
+@dataclass
+class ReextractResult:
+    notice_id: int
+    status: str  # "skipped" | "updated"
+    content_hash: Optional[str]
+    page: PageFetch
+    schedules: list = field(default_factory=list)
+
+
+def board_base_url(row: dict) -> str:
+    category = row.get("category")
+    if isinstance(category, int) and 0 <= category < len(crawler.CRAWLING_URL_LIST):
+        return crawler.CRAWLING_URL_LIST[category]
+    return row["original_url"].split("?")[0]
+
+
+def fetch_detail(url: str, fetcher: ConditionalFetcher, force: bool) -> PageFetch:
+    if not force:
+        return fetcher.fetch(url)
+
+    # --force: 검증자 없이 새로 가져오되, 결과는 다음 실행을 위해 그대로 저장한다.
+    response = fetcher.session.get(url, timeout=fetcher.timeout)
+    response.raise_for_status()
+    return PageFetch(
+        url=url,
+        changed=True,
+        text=response.text,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+        body_hash=body_hash(response.text),
+    )
+
+
+def reextract_notice(row: dict, known_hash: Optional[str], fetcher: ConditionalFetcher,
+                     force: bool = False) -> ReextractResult:
+    """공지 하나의 상세 페이지를 확인하고, 본문이 바뀐 경우에만 일정을 다시 추출"""
+    page = fetch_detail(row["original_url"], fetcher, force)
+    if not page.changed:
+        return ReextractResult(row["id"], "skipped", known_hash, page)
+
+    context = Board(boardHtml=page.text, baseUrl=board_base_url(row))
+    new_hash = content_hash(context.detail_text)
+    if not force and new_hash == (known_hash or content_hash(row.get("content"))):
+        return ReextractResult(row["id"], "skipped", new_hash, page)
+
+    schedules = crawler.gpt.extract_schedule_from_notice(title=context.title, content=context.detail_text)
+    return ReextractResult(row["id"], "updated", new_hash, page, schedules)
+
+
+def reextract(categories: Optional[List[int]] = None, workers: int = REEXTRACT_CONCURRENCY,
+              limit: Optional[int] = None, force: bool = False,
+              hashes: Optional[ContentHashIndex] = None,
+              fetcher: Optional[ConditionalFetcher] = None) -> dict:
+    """
+    notice 테이블을 id 순으로 훑으며 본문이 바뀐 공지만 일정을 재추출한다.
+    동시에 대기열에 올리는 작업은 workers * 2개로 제한하고, 바뀐 일정은 REEXTRACT_BATCH_SIZE개씩
+    한 번에 교체한다. 해시와 페이지 검증자는 DB 반영이 끝난 뒤에 저장하므로 실패한 공지는 다음 실행에서 다시 확인한다.
+    """
+    hashes = hashes or ContentHashIndex()
+    fetcher = fetcher or ConditionalFetcher(crawler.session)
+    stats = {"skipped": 0, "updated": 0, "failed": 0}
+    pending: List[ReextractResult] = []
+
+    def persist(results: List[ReextractResult]):
+        hashes.set_many({r.notice_id: r.content_hash for r in results if r.content_hash})
+        for r in results:
+            fetcher.commit(r.page)
+
+    def flush():
+        if not pending:
+            return
+        batch = list(pending)
+        pending.clear()
+        try:
+            crawler.db_manager.replace_schedules({r.notice_id: r.schedules for r in batch})
+        except Exception as e:
+            stats["updated"] -= len(batch)
+            stats["failed"] += len(batch)
+            print(f"🔴 일정 {len(batch)}건 교체 실패: {e}", flush=True)
+            return
+        persist(batch)
+
+    def handle(future, row: dict):
+        try:
+            result = future.result()
+        except Exception as e:
+            stats["failed"] += 1
+            print(f"🔴 공지 {row['id']} 일정 재추출 실패: {e}", flush=True)
+            return
+
+        stats[result.status] += 1
+        if result.status == "skipped":
+            persist([result])
+            return
+
+        print(f"🔄 공지 {row['id']}의 일정 {len(result.schedules)}건을 다시 추출했습니다.", flush=True)
+        pending.append(result)
+        if len(pending) >= REEXTRACT_BATCH_SIZE:
+            flush()
+
+    def rows():
+        count = 0
+        for batch in crawler.db_manager.iter_notices("id,title,content,original_url,category"):
+            batch = [
+                row for row in batch
+                if row.get("original_url") and (categories is None or row.get("category") in categories)
+            ]
+            known = {} if force else hashes.get_many([row["id"] for row in batch])
+            for row in batch:
+                if limit is not None and count >= limit:
+                    return
+                count += 1
+                yield row, known.get(row["id"])
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        in_flight: dict = {}
+        for row, known_hash in rows():
+            if len(in_flight) >= workers * 2:
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    handle(future, in_flight.pop(future))
+
+            in_flight[executor.submit(reextract_notice, row, known_hash, fetcher, force)] = row
+
+        for future in list(in_flight):
+            handle(future, in_flight.pop(future))
+    flush()
+
+    print(f"✅ 일정 재추출 완료: {stats['updated']}건 갱신, {stats['skipped']}건 건너뜀, {stats['failed']}건 실패", flush=True)
+    return stats
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--workers", type=int, default=REEXTRACT_CONCURRENCY, help="동시에 처리할 공지 수")
+    parser.add_argument("--board", type=int, action="append", help="처리할 게시판 category (여러 번 지정 가능)")
+    parser.add_argument("--limit", type=int, help="처리할 최대 공지 수")
+    parser.add_argument("--force", action="store_true", help="저장된 해시를 무시하고 모두 재추출")
+
+
+def run(args: argparse.Namespace) -> dict:
+    return reextract(categories=args.board, workers=args.workers, limit=args.limit, force=args.force)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="본문이 바뀐 공지사항의 일정 재추출")
+    add_arguments(parser)
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+"""
+LLM 결과와 DB가 함께 쓰는 스키마.
+
+database 모듈이 ScheduleItem을 쓰려고 gpt_client(LangChain)를 import하지 않도록 pydantic만 사용한다.
+"""
+from pydantic import BaseModel, Field
+
+
+class ScheduleItem(BaseModel):
+    title: str = Field(..., description='일정의 제목 (예: "2024년 2학기 국가장학금 1차 신청")')
+    description: str = Field(..., description='일정에 대한 구체적인 설명')
+    begin: str = Field(..., description="일정(신청/제출 기간)이 시작하는 날짜와 시간 (KST, 'YYYY-MM-DDTHH:MM:SS+09:00' 형식)")
+    end: str = Field(..., description="일정(신청/제출 기간)이 끝나는 날짜와 시간 (KST, 'YYYY-MM-DDTHH:MM:SS+09:00' 형식)")
@@ -0,0 +1,210 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from urllib.parse import parse_qs, urlsplit
+
+SEEN_INDEX_PATH = os.getenv("SEEN_INDEX_PATH", ".cache/seen_index.sqlite3")
+
+
+def article_no_from_url(url: str) -> Optional[int]:
+    """게시글 url의 articleNo 쿼리 값을 정수로 반환 (없으면 None)"""
+    values = parse_qs(urlsplit(url).query).get("articleNo")
+    if not values:
+        return None
+    try:
+        return int(values[0])
+    except ValueError:
+        return None
+
+
+def get_title_hash(title: str) -> str:
+    """notice.title_hash와 같은 제목 해시. DB 클라이언트 없이 계산한다."""
+    return hashlib.sha256(title.encode('utf-8')).hexdigest()
+
+
+def content_hash(text: Optional[str]) -> str:
+    """공지 본문(Board.detail_text)의 해시"""
+    return hashlib.sha256((text or "").strip().encode("utf-8")).hexdigest()
+
+
+def list_row_fingerprint(item: dict) -> str:
+    """
+    목록 행의 날짜/작성자/제목/게시글 번호로 만든 지문.
+    목록 url의 article.offset은 새 글이 올라올 때마다 바뀌므로 articleNo만 사용한다.
+    """
+    article_no = article_no_from_url(item.get('url', ''))
+    parts = (
+        item.get('date', ''),
+        item.get('writer', ''),
+        item.get('title', ''),
+        str(article_no) if article_no is not None else item.get('url', ''),
+    )
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class RowFingerprint(NamedTuple):
+    fingerprint: str
+    title_hash: str
+    content_hash: Optional[str]
+
+
+class SeenIndex:
+    """이미 처리한 공지사항의 title_hash와 게시판별 high-water mark를 저장하는 로컬 SQLite 인덱스"""
+
+    def __init__(self, path: str = SEEN_INDEX_PATH):
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS seen (
+                title_hash TEXT PRIMARY KEY,
+                category INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS high_water (
+                category INTEGER PRIMARY KEY,
+                article_no INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                category INTEGER NOT NULL,
+                article_no INTEGER NOT NULL,
+                fingerprint TEXT NOT NULL,
+                title_hash TEXT NOT NULL,
+                content_hash TEXT,
+                PRIMARY KEY (category, article_no)
+            );
+        """)
+        self.conn.commit()
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self.conn.execute("SELECT 1 FROM seen LIMIT 1").fetchone() is None
+
+    def count(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def known(self, title_hashes: Iterable[str]) -> set:
+        """주어진 title_hash 중 인덱스에 있는 것들을 반환"""
+        title_hashes = list(set(title_hashes))
+        if not title_hashes:
+            return set()
+
+        found = set()
+        with self._lock:
+            # SQLite 변수 개수 제한을 피하기 위해 나누어 조회
+            for i in range(0, len(title_hashes), 500):
+                chunk = title_hashes[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self.conn.execute(f"SELECT title_hash FROM seen WHERE title_hash IN ({placeholders})", chunk)
+                found.update(row[0] for row in rows)
+        return found
+
+    def add(self, title_hashes: Iterable[str], category: Optional[int] = None):
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO seen (title_hash, category) VALUES (?, ?)",
+                [(h, category) for h in title_hashes],
+            )
+            self.conn.commit()
+
+    def get_high_water(self, category: int) -> Optional[int]:
+        with self._lock:
+            row = self.conn.execute("SELECT article_no FROM high_water WHERE category = ?", (category,)).fetchone()
+        return row[0] if row else None
+
+    def update_high_water(self, category: int, article_no: Optional[int]):
+        """기존 값보다 클 때만 high-water mark를 갱신"""
+        if article_no is None:
+            return
+        with self._lock:
+            self.conn.execute("""
+                INSERT INTO high_water (category, article_no) VALUES (?, ?)
+                ON CONFLICT(category) DO UPDATE SET article_no = MAX(article_no, excluded.article_no)
+            """, (category, article_no))
+            self.conn.commit()
+
+    def get_fingerprints(self, category: int, article_nos: Iterable[int]) -> Dict[int, RowFingerprint]:
+        """게시글 번호별로 마지막으로 본 목록 행 지문을 반환"""
+        article_nos = list(set(article_nos))
+        if not article_nos:
+            return {}
+
+        found = {}
+        with self._lock:
+            for i in range(0, len(article_nos), 500):
+                chunk = article_nos[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self.conn.execute(
+                    f"SELECT article_no, fingerprint, title_hash, content_hash FROM fingerprints "
+                    f"WHERE category = ? AND article_no IN ({placeholders})",
+                    [category, *chunk],
+                )
+                found.update((row[0], RowFingerprint(*row[1:])) for row in rows)
+        return found
+
+    def set_fingerprint(self, category: int, article_no: Optional[int], fingerprint: str,
+                        title_hash: str, content_hash: Optional[str] = None):
+        """목록 행 지문을 저장. content_hash가 None이면 기존 값을 유지한다."""
+        if article_no is None:
+            return
+        with self._lock:
+            self.conn.execute("""
+                INSERT INTO fingerprints (category, article_no, fingerprint, title_hash, content_hash)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(category, article_no) DO UPDATE SET
+                    fingerprint = excluded.fingerprint,
+                    title_hash = excluded.title_hash,
+                    content_hash = COALESCE(excluded.content_hash, fingerprints.content_hash)
+            """, (category, article_no, fingerprint, title_hash, content_hash))
+            self.conn.commit()
+
+    def _load_rows(self, rows: List[dict]):
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO seen (title_hash, category) VALUES (?, ?)",
+                [(row["title_hash"], row.get("category")) for row in rows],
+            )
+            self.conn.commit()
+
+    def cold_start(self, db_manager) -> int:
+        """notice 테이블 전체의 title_hash로 인덱스를 채운다."""
+        total = 0
+        for rows in db_manager.iter_notice_hashes():
+            self._load_rows(rows)
+            total += len(rows)
+        print(f"🗂️ 로컬 인덱스를 notice 테이블에서 {total}건으로 초기화했습니다.", flush=True)
+        return total
+
+    def reconcile(self, db_manager) -> tuple:
+        """DB 기준으로 인덱스를 맞춘다. (추가된 수, 삭제된 수)를 반환"""
+        with self._lock:
+            self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS remote (title_hash TEXT PRIMARY KEY, category INTEGER)")
+            self.conn.execute("DELETE FROM remote")
+
+        for rows in db_manager.iter_notice_hashes():
+            with self._lock:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO remote (title_hash, category) VALUES (?, ?)",
+                    [(row["title_hash"], row.get("category")) for row in rows],
+                )
+
+        with self._lock:
+            added = self.conn.execute(
+                "INSERT OR IGNORE INTO seen (title_hash, category) SELECT title_hash, category FROM remote"
+            ).rowcount
+            removed = self.conn.execute(
+                "DELETE FROM seen WHERE title_hash NOT IN (SELECT title_hash FROM remote)"
+            ).rowcount
+            self.conn.execute("DROP TABLE remote")
+            self.conn.commit()
+
+        print(f"🔄 로컬 인덱스 동기화 완료: {added}건 추가, {removed}건 삭제", flush=True)
+        return added, removed
+
+    def close(self):
+        self.conn.close()
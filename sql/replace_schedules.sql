@@ -0,0 +1,23 @@
+-- 공지사항의 일정을 한 트랜잭션으로 교체하는 함수들.
+-- (SupabaseManager.save_schedules / save_schedules_bulk 에서 RPC로 호출)
+
+-- p_items: [{"notice_id": 1, "schedules": [...]}, ...]
+create or replace function replace_schedules_bulk(p_items jsonb)
+returns integer
+language plpgsql
+as $$
+declare
+    v_total integer;
+begin
+    delete from schedules
+    where notice_id in (select (value ->> 'notice_id')::bigint from jsonb_array_elements(p_items));
+
+    insert into schedules (title, description, "begin", "end", notice_id, is_ignored)
+    select s.title, s.description, s."begin", s."end", (item ->> 'notice_id')::bigint, coalesce(s.is_ignored, false)
+    from jsonb_array_elements(p_items) as item,
+         jsonb_populate_recordset(null::schedules, coalesce(item -> 'schedules', '[]'::jsonb)) as s;
+
+    get diagnostics v_total = row_count;
+    return v_total;
+end;
+$$;
@@ -0,0 +1,68 @@
+-- 공지사항과 일정/이미지/파일을 한 트랜잭션, 한 번의 호출로 저장하는 함수들.
+-- Supabase SQL editor 또는 psql로 적용한다. (SupabaseManager.save_notice / save_notices 에서 RPC로 호출)
+
+create or replace function save_notice_atomic(
+    p_notice jsonb,
+    p_schedules jsonb default '[]'::jsonb,
+    p_images jsonb default '[]'::jsonb,
+    p_files jsonb default '[]'::jsonb
+) returns jsonb
+language plpgsql
+as $$
+declare
+    v_notice notice%rowtype;
+begin
+    insert into notice (
+        title, content, writer, writer_email, publish_date, is_notice,
+        ai_summary_title, ai_summary_content, markdown_content,
+        original_url, ignore_flag, title_hash, category
+    )
+    select
+        n.title, n.content, n.writer, n.writer_email, n.publish_date, coalesce(n.is_notice, false),
+        n.ai_summary_title, n.ai_summary_content, n.markdown_content,
+        n.original_url, coalesce(n.ignore_flag, false), n.title_hash, n.category
+    from jsonb_populate_record(null::notice, p_notice) as n
+    returning * into v_notice;
+
+    insert into schedules (title, description, "begin", "end", notice_id, is_ignored)
+    select s.title, s.description, s."begin", s."end", v_notice.id, coalesce(s.is_ignored, false)
+    from jsonb_populate_recordset(null::schedules, coalesce(p_schedules, '[]'::jsonb)) as s;
+
+    insert into notice_images (url, notice_id)
+    select i.url, v_notice.id
+    from jsonb_populate_recordset(null::notice_images, coalesce(p_images, '[]'::jsonb)) as i;
+
+    insert into notice_files (filename, url, notice_id)
+    select f.filename, f.url, v_notice.id
+    from jsonb_populate_recordset(null::notice_files, coalesce(p_files, '[]'::jsonb)) as f;
+
+    return to_jsonb(v_notice) || jsonb_build_object(
+        'schedules', (select coalesce(jsonb_agg(to_jsonb(s) order by s.id), '[]'::jsonb) from schedules s where s.notice_id = v_notice.id),
+        'images', (select coalesce(jsonb_agg(to_jsonb(i) order by i.id), '[]'::jsonb) from notice_images i where i.notice_id = v_notice.id),
+        'files', (select coalesce(jsonb_agg(to_jsonb(f) order by f.id), '[]'::jsonb) from notice_files f where f.notice_id = v_notice.id)
+    );
+end;
+$$;
+
+-- p_items: [{"notice": {...}, "schedules": [...], "images": [...], "files": [...]}, ...]
+-- 하나라도 실패하면 전체가 롤백된다.
+create or replace function save_notices_bulk(p_items jsonb)
+returns jsonb
+language plpgsql
+as $$
+declare
+    v_item jsonb;
+    v_results jsonb := '[]'::jsonb;
+begin
+    for v_item in select value from jsonb_array_elements(p_items)
+    loop
+        v_results := v_results || jsonb_build_array(save_notice_atomic(
+            v_item -> 'notice',
+            coalesce(v_item -> 'schedules', '[]'::jsonb),
+            coalesce(v_item -> 'images', '[]'::jsonb),
+            coalesce(v_item -> 'files', '[]'::jsonb)
+        ));
+    end loop;
+    return v_results;
+end;
+$$;
@@ -0,0 +1,58 @@
+-- 수정된 공지사항의 본문/요약과 일정/이미지/파일을 한 트랜잭션으로 교체하는 함수.
+-- (SupabaseManager.update_notice 에서 RPC로 호출)
+-- original_url, category, created_at은 처음 저장한 값을 유지한다.
+
+create or replace function update_notice_atomic(
+    p_notice_id bigint,
+    p_notice jsonb,
+    p_schedules jsonb default '[]'::jsonb,
+    p_images jsonb default '[]'::jsonb,
+    p_files jsonb default '[]'::jsonb
+) returns jsonb
+language plpgsql
+as $$
+declare
+    v_notice notice%rowtype;
+begin
+    update notice t set
+        title = n.title,
+        content = n.content,
+        writer = n.writer,
+        writer_email = n.writer_email,
+        publish_date = n.publish_date,
+        is_notice = coalesce(n.is_notice, false),
+        ai_summary_title = n.ai_summary_title,
+        ai_summary_content = n.ai_summary_content,
+        markdown_content = n.markdown_content,
+        title_hash = n.title_hash,
+        updated_at = now()
+    from jsonb_populate_record(null::notice, p_notice) as n
+    where t.id = p_notice_id
+    returning t.* into v_notice;
+
+    if not found then
+        raise exception 'notice % not found', p_notice_id;
+    end if;
+
+    delete from schedules where notice_id = p_notice_id;
+    insert into schedules (title, description, "begin", "end", notice_id, is_ignored)
+    select s.title, s.description, s."begin", s."end", p_notice_id, coalesce(s.is_ignored, false)
+    from jsonb_populate_recordset(null::schedules, coalesce(p_schedules, '[]'::jsonb)) as s;
+
+    delete from notice_images where notice_id = p_notice_id;
+    insert into notice_images (url, notice_id)
+    select i.url, p_notice_id
+    from jsonb_populate_recordset(null::notice_images, coalesce(p_images, '[]'::jsonb)) as i;
+
+    delete from notice_files where notice_id = p_notice_id;
+    insert into notice_files (filename, url, notice_id)
+    select f.filename, f.url, p_notice_id
+    from jsonb_populate_recordset(null::notice_files, coalesce(p_files, '[]'::jsonb)) as f;
+
+    return to_jsonb(v_notice) || jsonb_build_object(
+        'schedules', (select coalesce(jsonb_agg(to_jsonb(s) order by s.id), '[]'::jsonb) from schedules s where s.notice_id = p_notice_id),
+        'images', (select coalesce(jsonb_agg(to_jsonb(i) order by i.id), '[]'::jsonb) from notice_images i where i.notice_id = p_notice_id),
+        'files', (select coalesce(jsonb_agg(to_jsonb(f) order by f.id), '[]'::jsonb) from notice_files f where f.notice_id = p_notice_id)
+    );
+end;
+$$;
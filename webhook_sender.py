@@ -0,0 +1,159 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+import requests
+
+# Discord가 Retry-After를 주지 않았을 때 기본 대기 시간(초)
+DEFAULT_RETRY_AFTER = 1.0
+
+# Discord 메시지 제한
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_TOTAL_CHARS = 6000
+MAX_EMBED_TITLE_CHARS = 256
+MAX_EMBED_DESCRIPTION_CHARS = 4096
+
+
+def _truncate(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def make_embed(title: str, description: str, url: str = "") -> dict:
+    """Discord 제한에 맞게 잘라낸 embed 하나를 만든다."""
+    embed = {
+        "title": _truncate(title or "", MAX_EMBED_TITLE_CHARS),
+        "description": _truncate(description or "", MAX_EMBED_DESCRIPTION_CHARS),
+    }
+    if url:
+        embed["url"] = url
+    return embed
+
+
+def pack_embeds(embeds: List[dict]) -> List[dict]:
+    """
+    embed들을 Discord 제한(메시지당 10개, 전체 6000자) 안에서 가능한 적은 수의 payload로 묶는다.
+    순서는 유지한다.
+    """
+    payloads: List[dict] = []
+    current: List[dict] = []
+    current_chars = 0
+
+    for embed in embeds:
+        chars = len(embed.get("title", "")) + len(embed.get("description", ""))
+        if current and (len(current) >= MAX_EMBEDS_PER_MESSAGE or current_chars + chars > MAX_EMBED_TOTAL_CHARS):
+            payloads.append({"embeds": current})
+            current, current_chars = [], 0
+
+        if chars > MAX_EMBED_TOTAL_CHARS:
+            # 단독으로도 6000자를 넘으면 설명을 줄여서 보낸다.
+            embed = dict(embed, description=_truncate(embed["description"], MAX_EMBED_TOTAL_CHARS - len(embed["title"])))
+            chars = MAX_EMBED_TOTAL_CHARS
+
+        current.append(embed)
+        current_chars += chars
+
+    if current:
+        payloads.append({"embeds": current})
+    return payloads
+
+
+@dataclass
+class DeliveryReport:
+    """webhook 전송 결과 집계. sent_by_payload[i]는 i번째 payload를 받은 webhook 수"""
+    sent: int = 0
+    failed: int = 0
+    rate_limited: int = 0
+    deactivated: List[int] = field(default_factory=list)
+    sent_by_payload: Counter = field(default_factory=Counter)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, sent: int = 0, failed: int = 0, rate_limited: int = 0, deactivated: Optional[int] = None,
+            payload: Optional[int] = None):
+        with self._lock:
+            self.sent += sent
+            self.failed += failed
+            self.rate_limited += rate_limited
+            if deactivated is not None:
+                self.deactivated.append(deactivated)
+            if sent and payload is not None:
+                self.sent_by_payload[payload] += sent
+
+
+def _retry_after_seconds(response: requests.Response) -> float:
+    """429 응답의 Retry-After 헤더(초) 또는 JSON retry_after 값을 읽는다."""
+    header = response.headers.get("Retry-After")
+    if header:
+        try:
+            return float(header)
+        except ValueError:
+            pass
+    try:
+        return float(response.json().get("retry_after", DEFAULT_RETRY_AFTER))
+    except (ValueError, AttributeError):
+        return DEFAULT_RETRY_AFTER
+
+
+class WebhookSender:
+    """
+    여러 Discord webhook으로 병렬 전송하는 엔진.
+    webhook 하나당 작업 하나를 스레드 풀에 올리고, 각 webhook 안에서는 payload 순서를 유지한다.
+    """
+
+    def __init__(self, max_workers: int = 16, max_retries: int = 3, timeout: float = 10,
+                 headers: Optional[dict] = None, post: Callable = requests.post):
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.headers = headers or {}
+        self.post = post
+
+    def _post_with_retry(self, url: str, payload: dict, report: DeliveryReport) -> requests.Response:
+        for _ in range(self.max_retries + 1):
+            response = self.post(url, json=payload, headers=self.headers, timeout=self.timeout)
+            if response.status_code != 429:
+                # 버킷이 비었으면 다음 요청 전에 미리 대기
+                if response.headers.get("X-RateLimit-Remaining") == "0":
+                    time.sleep(float(response.headers.get("X-RateLimit-Reset-After", 0)))
+                return response
+
+            report.add(rate_limited=1)
+            time.sleep(_retry_after_seconds(response))
+        return response
+
+    def _deliver_one(self, webhook, payloads: List[dict], report: DeliveryReport,
+                     on_not_found: Optional[Callable[[int], None]]):
+        for index, payload in enumerate(payloads):
+            try:
+                response = self._post_with_retry(webhook.url, payload, report)
+                response.raise_for_status()
+                report.add(sent=1, payload=index)
+            except requests.exceptions.HTTPError as e:
+                if e.response is not None and e.response.status_code == 404:
+                    print(f"🔴 Webhook '{webhook.url[:50]}...'이 존재하지 않습니다. 비활성화합니다.")
+                    report.add(failed=1, deactivated=webhook.id)
+                    if on_not_found:
+                        on_not_found(webhook.id)
+                    return  # 없는 webhook에는 나머지 공지도 보내지 않음
+                status = e.response.status_code if e.response is not None else "?"
+                print(f"❌ Webhook '{webhook.url[:50]}...'에 전송 실패 (HTTP {status}): {e}")
+                report.add(failed=1)
+            except Exception as e:
+                print(f"❌ Webhook 전송 중 예외 발생: {e}")
+                report.add(failed=1)
+
+    def deliver(self, webhooks: list, payloads: List[dict],
+                on_not_found: Optional[Callable[[int], None]] = None,
+                report: Optional[DeliveryReport] = None) -> DeliveryReport:
+        """모든 webhook에 payloads를 순서대로 전송하고 결과를 집계하여 반환"""
+        report = report or DeliveryReport()
+        if not webhooks or not payloads:
+            return report
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._deliver_one, webhook, payloads, report, on_not_found) for webhook in webhooks]
+            for future in futures:
+                future.result()
+        return report